@@ -56,6 +56,9 @@ def iter_submodules(path, package_name):
 
 def iter_submodule_names(path, root=""):
     for _, module_name, is_package in pkgutil.iter_modules([str(path)]):
+        # Private modules are imported on demand by their package.
+        if module_name.startswith("_"):
+            continue
         if is_package:
             sub_path = path / module_name
             sub_root = root + module_name + "."
@@ -0,0 +1,77 @@
+"""Benchmark the Linux device discovery on a synthetic /dev/input tree.
+
+Builds a fake /dev/input (device nodes, by-id and by-path symlinks) and
+/sys/class/input (device names) with many entries in a temporary
+directory, then times a full DeviceManager discovery.
+
+Run it from the repository root:
+
+    python benchmarks/bench_discovery.py [count ...]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from thirdparties.inputs import DeviceManager  # noqa: E402
+
+DEVICE_TYPES = ('kbd', 'mouse', 'joystick', 'if01')
+
+
+def build_tree(root, count):
+    """Create count fake input devices under root."""
+    dev_input = os.path.join(root, 'dev', 'input')
+    sys_class = os.path.join(root, 'sys', 'class')
+    for directory in ('by-id', 'by-path'):
+        os.makedirs(os.path.join(dev_input, directory))
+    os.makedirs(os.path.join(sys_class, 'leds'))
+
+    for number in range(count):
+        char_name = 'event{}'.format(number)
+        open(os.path.join(dev_input, char_name), 'w').close()
+
+        device_type = DEVICE_TYPES[number % len(DEVICE_TYPES)]
+        target = os.path.join('..', char_name)
+        os.symlink(target, os.path.join(
+            dev_input, 'by-id',
+            'usb-Vendor_Device_{}-event-{}'.format(number, device_type)))
+        # by-path links to the same nodes, they must be de-duplicated.
+        os.symlink(target, os.path.join(
+            dev_input, 'by-path',
+            'pci-0000:00:14.0-usb-0:{}:1.0-event-{}'.format(number, device_type)))
+
+        device_dir = os.path.join(sys_class, 'input', char_name, 'device')
+        os.makedirs(device_dir)
+        with open(os.path.join(device_dir, 'name'), 'w') as name_file:
+            name_file.write('Virtual Device {}\n'.format(number))
+
+    return dev_input, sys_class
+
+
+def bench(count, repeat=3):
+    """Return the best discovery time and the number of gamepads found."""
+    with tempfile.TemporaryDirectory() as root:
+        dev_input, sys_class = build_tree(root, count)
+        best = None
+        for _ in range(repeat):
+            manager = DeviceManager(dev_input, sys_class)
+            start = time.perf_counter()
+            gamepads = manager.gamepads
+            elapsed = time.perf_counter() - start
+            manager.close()
+            best = elapsed if best is None else min(best, elapsed)
+        return best, len(gamepads)
+
+
+def main(counts):
+    print('{:>8} {:>12} {:>10}'.format('devices', 'discovery', 'gamepads'))
+    for count in counts:
+        elapsed, gamepads = bench(count)
+        print('{:>8} {:>10.1f}ms {:>10}'.format(count, elapsed * 1000, gamepads))
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [100, 1000, 4000])
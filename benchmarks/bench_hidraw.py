@@ -0,0 +1,153 @@
+"""Benchmark reading a DualShock 4 through hidraw against evdev.
+
+Replays input reports, recorded from a pad (e.g. with
+`cat /dev/hidraw0 > ds4.bin` while playing, USB reports of 64 bytes) or
+synthetic ones, through a socket pair standing in for the hidraw node,
+and reads them with HidrawReactor. The same state changes are then fed
+as evdev records through a pipe and read with DeviceReactor. Both report
+the time per pad report and the number of events handled.
+
+The reports are written a few at a time, like the ones queued between
+two polls of the reader thread. The decoded values are checked against
+the evdev ones by tests/test_hidraw.py.
+
+Run it from the repository root:
+
+    python benchmarks/bench_hidraw.py [recording]
+"""
+
+import math
+import os
+import socket
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from thirdparties.inputs import DeviceReactor, iter_unpack  # noqa: E402
+from thirdparties._inputs_hidraw import (  # noqa: E402
+    DUALSHOCK4, HidrawReactor, report_records, report_values)
+
+REPORT_SIZE = 64
+
+# Reports written between two polls.
+QUEUED = 4
+
+SYNTHETIC_REPORTS = 20000
+
+
+def synthetic_reports(count):
+    """Make USB reports of a pad being played: moving sticks, buttons
+    pressed now and then, noisy motion sensors."""
+    reports = []
+    for index in range(count):
+        phase = index / 250.0
+        fields = (
+            128 + int(100 * math.sin(phase)), 128 + int(100 * math.cos(phase)),
+            128, 128 + int(3 * math.sin(index)),
+            0x08 | (0x20 if index // 500 % 2 else 0), 0, index % 64 << 2,
+            0, int(127 + 127 * math.sin(phase / 3)),
+            index * 188 & 0xffff, 20,
+            int(50 * math.sin(index)), 0, -3, 120, 8190, -40,
+            1, 0x80, 0, 0, 0x80, 0, 0)
+        report = bytes((0x01,)) + DUALSHOCK4.struct.pack(*fields)
+        reports.append(report.ljust(REPORT_SIZE, b'\0'))
+    return reports
+
+
+def load_reports(path):
+    """Split a recording in reports."""
+    with open(path, 'rb') as recording:
+        data = recording.read()
+    return [data[start:start + REPORT_SIZE]
+            for start in range(0, len(data) - REPORT_SIZE + 1, REPORT_SIZE)]
+
+
+class ReplayDevice(object):  # pylint: disable=useless-object-inheritance
+    """Stands in for the gamepad, reading from a descriptor."""
+
+    name = 'Replayed pad'
+
+    def __init__(self, fd):
+        self.fd = fd
+
+    def open_nonblocking(self):
+        return os.dup(self.fd)
+
+
+class ReplayHidrawReactor(HidrawReactor):
+    """Reads the hidraw reports of ReplayDevices."""
+
+    @staticmethod
+    def _open(device):
+        return os.dup(device.fd), DUALSHOCK4
+
+
+def replay(reactor, device, writer, chunks):
+    """Write the chunks one at a time and read them, return the time
+    spent reading and handling the events, and the events handled."""
+    state = {}
+    events = [0]
+
+    def sink(_, view):
+        # Like XboxController, keep the last value of each input.
+        for _, _, ev_type, code, value in iter_unpack(view):
+            state[ev_type << 16 | code] = value
+            events[0] += 1
+
+    reactor.register(device)
+    elapsed = 0.0
+    for chunk in chunks:
+        for data in chunk:
+            os.write(writer, data)
+        start = time.perf_counter()
+        reactor.poll_into(sink, 1)
+        elapsed += time.perf_counter() - start
+    reactor.close()
+    return elapsed, events[0]
+
+
+def bench_hidraw(reports):
+    reader, writer = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+    reader.setblocking(False)
+    chunks = [reports[start:start + QUEUED] for start in range(0, len(reports), QUEUED)]
+    try:
+        return replay(ReplayHidrawReactor(), ReplayDevice(reader.fileno()),
+                      writer.fileno(), chunks)
+    finally:
+        reader.close()
+        writer.close()
+
+
+def bench_evdev(reports):
+    # The evdev records a pad driver would send for the same reports.
+    chunks = []
+    previous = None
+    for start in range(0, len(reports), QUEUED):
+        chunk = []
+        for report in reports[start:start + QUEUED]:
+            values = report_values(DUALSHOCK4.decode(report))
+            chunk.append(report_records(previous, values, 0))
+            previous = values
+        chunks.append(chunk)
+
+    reader, writer = os.pipe()
+    os.set_blocking(reader, False)
+    try:
+        return replay(DeviceReactor(), ReplayDevice(reader), writer, chunks)
+    finally:
+        os.close(reader)
+        os.close(writer)
+
+
+def main(path=None):
+    reports = load_reports(path) if path else synthetic_reports(SYNTHETIC_REPORTS)
+    print('{} reports'.format(len(reports)))
+    print('{:>8} {:>14} {:>10}'.format('reader', 'per report', 'events'))
+    for name, bench in (('hidraw', bench_hidraw), ('evdev', bench_evdev)):
+        elapsed, events = bench(reports)
+        print('{:>8} {:>12.2f}us {:>10}'.format(name, elapsed / len(reports) * 1e6, events))
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:2])
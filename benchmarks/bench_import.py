@@ -0,0 +1,125 @@
+"""Benchmark the import time of thirdparties/inputs.py and of
+gamepad/xbox_gamepad.py.
+
+Imports each module in fresh interpreters with `python -X importtime` and
+reports the median time spent in the module itself, the median time
+including everything it imports, the number of imported modules and
+whether NumPy was imported. The modules are compiled first, so the times
+do not include compiling. When a git revision is given, it is exported
+with git archive and measured too, to compare before and after a change.
+
+The modules are imported from a package wrapping the addon's code, as
+Blender does, without the addon's __init__.py which needs Blender.
+
+Run it from the repository root:
+
+    python benchmarks/bench_import.py [revision]
+"""
+
+import io
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PACKAGE = 'addon'
+
+MODULES = ('thirdparties.inputs', 'gamepad.xbox_gamepad')
+
+# What the modules import from the addon.
+PATHS = ('dev_mode.py', 'gamepad', 'thirdparties', 'utils')
+
+RUNS = 20
+
+
+def measure(root, module):
+    """Import the module once from root, return its self and cumulative
+    import times in microseconds, the number of imported modules and
+    whether NumPy was imported."""
+    name = PACKAGE + '.' + module
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import ' + name],
+        cwd=root, stderr=subprocess.PIPE, universal_newlines=True, check=True)
+    modules = 0
+    numpy = False
+    own = cumulative = None
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        modules += 1
+        self_us, cumulative_us, imported = line[len('import time:'):].split('|')
+        if imported.strip() == 'numpy':
+            numpy = True
+        if imported.strip() == name:
+            own, cumulative = int(self_us), int(cumulative_us)
+    return own, cumulative, modules, numpy
+
+
+def bench(root, module):
+    """Return the median self time, cumulative time and module count, and
+    whether NumPy was imported."""
+    runs = [measure(root, module) for _ in range(RUNS)]
+    return tuple(statistics.median(run[index] for run in runs)
+                 for index in range(3)) + (any(run[3] for run in runs),)
+
+
+def wrap(source, directory):
+    """Make the addon's code at source importable as PACKAGE from
+    directory, compiled."""
+    package = os.path.join(directory, PACKAGE)
+    os.makedirs(package)
+    open(os.path.join(package, '__init__.py'), 'w').close()
+    paths = [path for path in PATHS if os.path.exists(os.path.join(source, path))]
+    for path in paths:
+        os.symlink(os.path.join(source, path), os.path.join(package, path))
+    # Measure imports from bytecode, as Blender does after the first run.
+    # compileall does not follow the symlinks.
+    subprocess.run([sys.executable, '-m', 'compileall', '-q'] + paths,
+                   cwd=source, check=True)
+    subprocess.run([sys.executable, '-m', 'compileall', '-q', PACKAGE],
+                   cwd=directory, check=True)
+
+
+def export(revision, directory):
+    """Extract the addon's code of a git revision in directory."""
+    paths = subprocess.run(
+        ['git', 'ls-tree', '--name-only', revision] + list(PATHS),
+        cwd=ROOT, stdout=subprocess.PIPE, universal_newlines=True,
+        check=True).stdout.split()
+    archive = subprocess.run(
+        ['git', 'archive', '--format=tar', revision] + paths,
+        cwd=ROOT, stdout=subprocess.PIPE, check=True).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(directory)
+
+
+def main(revision=None):
+    print('{:>12} {:>22} {:>10} {:>12} {:>8} {:>6}'.format(
+        'tree', 'module', 'self', 'cumulative', 'modules', 'numpy'))
+    with tempfile.TemporaryDirectory() as directory:
+        trees = [('working', ROOT)]
+        if revision:
+            source = os.path.join(directory, 'revision')
+            export(revision, source)
+            trees.append((revision, source))
+        for index, (name, source) in enumerate(trees):
+            root = os.path.join(directory, 'wrapped-{}'.format(index))
+            wrap(source, root)
+            for module in MODULES:
+                try:
+                    own, cumulative, modules, numpy = bench(root, module)
+                except subprocess.CalledProcessError:
+                    # Not importable here, e.g. NumPy is missing.
+                    print('{:>12} {:>22} {:>10}'.format(name[:12], module, 'failed'))
+                    continue
+                print('{:>12} {:>22} {:>8.1f}ms {:>10.1f}ms {:>8.0f} {:>6}'.format(
+                    name[:12], module, own / 1000, cumulative / 1000, modules,
+                    'yes' if numpy else 'no'))
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:2])
@@ -0,0 +1,114 @@
+class AxisFilter():
+    """Suppress the jitter of an absolute axis, e.g. a resting stick.
+
+    A change is only let through when it moves the axis by more than the
+    threshold from the last value let through. Around the center, within
+    flat, the axis snaps to the center and has to move past flat plus the
+    threshold to leave it (hysteresis), so a stick resting near the edge
+    of the flat zone does not flicker in and out of it.
+
+    The threshold and flat usually come from the fuzz and flat the kernel
+    reports for the axis, see from_abs_info.
+    """
+
+    def __init__(self, threshold, flat=0, center=0):
+        self.threshold = threshold
+        self.flat = flat
+        self.center = center
+
+        # Last value let through, None before the first one.
+        self.value = None
+        self._resting = False
+
+    @classmethod
+    def from_abs_info(cls, abs_info, threshold_ratio=0.0):
+        """Create a filter for an axis from its kernel AbsInfo, with a
+        threshold of the given fraction of its range, at least its fuzz."""
+        center = int((abs_info.minimum + abs_info.maximum) / 2)
+        threshold = int(threshold_ratio * (abs_info.maximum - abs_info.minimum))
+        return cls(max(abs_info.fuzz, threshold), abs_info.flat, center)
+
+    def apply(self, value):
+        """Get the value to apply, or None when the change is jitter."""
+        offset = abs(value - self.center)
+
+        if self._resting:
+            if offset <= self.flat + self.threshold:
+                return None
+            self._resting = False
+        elif self.flat and offset <= self.flat:
+            # Snap to the center, even when closer than the threshold.
+            self._resting = True
+            if self.value == self.center:
+                return None
+            value = self.center
+        elif self.value is not None and abs(value - self.value) <= self.threshold:
+            return None
+
+        self.value = value
+        return value
+
+    def reset(self, value):
+        """Take a value read from the kernel as the last one let through."""
+        self._resting = bool(self.flat) and abs(value - self.center) <= self.flat
+        self.value = self.center if self._resting else value
+
+class RateLimiter():
+    """Let through at most one value per key and per window, e.g. per
+    device and axis, the latest value wins.
+
+    Values coming too soon after the last one let through are held and
+    released once the window has passed, see release(). Times are in
+    nanoseconds.
+    """
+
+    def __init__(self, max_rate):
+        self.max_rate = max_rate
+
+        # Time the last value of each key was let through.
+        self._passed = {}
+        self._held = {}
+
+    @property
+    def max_rate(self):
+        """Maximum number of values per second and per key, 0 for no limit."""
+        return self._max_rate
+
+    @max_rate.setter
+    def max_rate(self, max_rate):
+        self._max_rate = max_rate
+        self.interval = int(1e9 / max_rate) if max_rate else 0
+
+    def hold(self, key, value, timestamp):
+        """Hold the value when a value of the key was let through less than
+        a window ago, return whether it was held."""
+        last = self._passed.get(key)
+        if last is not None and timestamp - last < self.interval:
+            self._held[key] = value
+            return True
+
+        self._passed[key] = timestamp
+        self._held.pop(key, None)
+        return False
+
+    def release(self, timestamp):
+        """Get the (key, value) pairs held whose window has passed."""
+        released = [(key, value) for key, value in self._held.items()
+                    if timestamp - self._passed[key] >= self.interval]
+        for key, _ in released:
+            del self._held[key]
+            self._passed[key] = timestamp
+        return released
+
+    def next_release(self):
+        """Get the time at which the next held value can be released, None
+        when nothing is held."""
+        if not self._held:
+            return None
+        return min(self._passed[key] for key in self._held) + self.interval
+
+    def retain(self, predicate):
+        """Forget the keys for which predicate(key) is false, e.g. the
+        unplugged devices."""
+        self._passed = {key: last for key, last in self._passed.items() if predicate(key)}
+        self._held = {key: value for key, value in self._held.items() if predicate(key)}
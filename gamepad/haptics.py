@@ -0,0 +1,169 @@
+import heapq
+import itertools
+import threading
+import time
+
+from typing import NamedTuple
+
+from ..thirdparties.inputs import UnpluggedError
+
+class HapticStep(NamedTuple):
+    """The motors running at given speeds for a while."""
+
+    # Start of the step from the start of its pattern, in milliseconds.
+    offset: int
+    # Speed of the motors, between 0 (off) and 1 (full).
+    strong: float
+    weak: float
+    # In milliseconds.
+    duration: int
+
+# A pattern is a tuple of steps, see pulse, ramp and sequence.
+
+def pulse(strong, weak=None, duration=100):
+    """Run the motors once."""
+    if weak is None:
+        weak = strong
+    return (HapticStep(0, strong, weak, duration),)
+
+def ramp(start, end, duration=300, steps=6):
+    """Go from a speed to another, both motors together."""
+    step_duration = max(1, duration // steps)
+    pattern = []
+    for index in range(steps):
+        speed = start + (end - start) * index / max(1, steps - 1)
+        pattern.append(HapticStep(index * step_duration, speed, speed, step_duration))
+    return tuple(pattern)
+
+def sequence(*patterns, gap=50):
+    """Play patterns one after another, with a gap in milliseconds."""
+    result = []
+    start = 0
+    for pattern in patterns:
+        result.extend(step._replace(offset=start + step.offset) for step in pattern)
+        start = max(step.offset + step.duration for step in result) + gap
+    return tuple(result)
+
+def get_pattern_duration(pattern):
+    """Get the duration of a pattern in milliseconds."""
+    return max((step.offset + step.duration for step in pattern), default=0)
+
+# Played to stop the motors.
+_STOP = HapticStep(0, 0.0, 0.0, 0)
+
+class HapticsScheduler():
+    """Play haptic patterns on the gamepads from a worker thread.
+
+    play() only queues the steps of a pattern in a heap ordered by due
+    time and returns, the worker sleeps until the next step is due and
+    does the ioctls and writes. The caller, e.g. Blender's main thread,
+    never touches the device.
+    """
+
+    def __init__(self, get_devices):
+        # Gamepads to play on, called by the worker at each step.
+        self._get_devices = get_devices
+
+        self._condition = threading.Condition()
+        self._heap = []
+        self._counter = itertools.count()
+        self._pattern = None
+        self._pattern_end = 0.0
+        self._stopped = False
+        self._thread = None
+
+    def play(self, pattern, preempt=True):
+        """Queue a pattern and return immediately.
+
+        With preempt, the running pattern is stopped and the new one
+        starts right away. Otherwise the new pattern is coalesced: it is
+        dropped when the same pattern is already playing, and starts after
+        the running one ends otherwise.
+        """
+        with self._condition:
+            if self._stopped:
+                return
+
+            now = time.monotonic()
+            playing = now < self._pattern_end
+            if preempt:
+                self._heap = []
+                start = now
+                if playing:
+                    self._push(now, _STOP)
+            elif playing and pattern == self._pattern:
+                return
+            else:
+                start = max(now, self._pattern_end)
+
+            for step in pattern:
+                self._push(start + step.offset / 1000.0, step)
+            self._pattern = pattern
+            self._pattern_end = start + get_pattern_duration(pattern) / 1000.0
+
+            self._start()
+            self._condition.notify()
+
+    def cancel(self):
+        """Stop the running pattern and drop the queued ones."""
+        with self._condition:
+            self._heap = []
+            if time.monotonic() < self._pattern_end:
+                self._push(time.monotonic(), _STOP)
+                self._condition.notify()
+            self._pattern = None
+            self._pattern_end = 0.0
+
+    def stop(self):
+        """Stop the worker, it stops the motors before ending."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+
+    def _push(self, due, step):
+        heapq.heappush(self._heap, (due, next(self._counter), step))
+
+    def _start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run)
+            self._thread.daemon = True
+            self._thread.start()
+
+    def _next_step(self):
+        """Wait for the next due step, None when stopped."""
+        while not self._stopped:
+            if not self._heap:
+                self._condition.wait()
+                continue
+
+            delay = self._heap[0][0] - time.monotonic()
+            if delay > 0:
+                self._condition.wait(delay)
+                continue
+
+            return heapq.heappop(self._heap)[2]
+        return None
+
+    def _run(self):
+        while True:
+            with self._condition:
+                step = self._next_step()
+            if step is None:
+                break
+            self._play_step(step)
+
+        self._play_step(_STOP)
+
+    def _play_step(self, step):
+        """Run the motors of every gamepad, outside of the lock."""
+        for device in list(self._get_devices()):
+            try:
+                if step.strong <= 0 and step.weak <= 0:
+                    device.stop_vibration()
+                else:
+                    device.set_vibration(
+                        min(max(step.strong, 0.0), 1.0), min(max(step.weak, 0.0), 1.0), step.duration)
+            except (UnpluggedError, PermissionError, NotImplementedError, OSError, ValueError):
+                # No rumble for this one, the others still play. ValueError
+                # is raised by a file closed in between.
+                pass
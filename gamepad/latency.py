@@ -0,0 +1,50 @@
+class LatencyHistogram():
+    """Latencies counted in power of two buckets of nanoseconds.
+
+    Bucket i counts the latencies in [2^(i-1), 2^i) ns, bucket 0 the
+    null ones. Adding a latency is a single increment, so it can be done
+    for every event.
+    """
+
+    BUCKETS = 64
+
+    def __init__(self):
+        self.counts = [0] * self.BUCKETS
+        self.total = 0
+
+    def add(self, latency_ns):
+        """Count a latency, in nanoseconds."""
+        bucket = min(max(int(latency_ns), 0).bit_length(), self.BUCKETS - 1)
+        self.counts[bucket] += 1
+        self.total += 1
+
+    def reset(self):
+        self.counts = [0] * self.BUCKETS
+        self.total = 0
+
+    def percentile(self, fraction):
+        """Get an upper bound in nanoseconds of the latency under which
+        the given fraction of the counted latencies are."""
+        if self.total == 0:
+            return 0
+
+        threshold = fraction * self.total
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= threshold:
+                return 1 << bucket
+        return 1 << (self.BUCKETS - 1)
+
+    def __str__(self):
+        if self.total == 0:
+            return "No latency measured"
+
+        lines = ["{} events, p50 < {:.2f} ms, p99 < {:.2f} ms".format(
+            self.total, self.percentile(0.5) / 1e6, self.percentile(0.99) / 1e6)]
+        largest = max(self.counts)
+        for bucket, count in enumerate(self.counts):
+            if count:
+                lines.append("< {:>10.3f} ms {:>8} {}".format(
+                    (1 << bucket) / 1e6, count, '#' * max(1, 40 * count // largest)))
+        return "\n".join(lines)
@@ -0,0 +1,248 @@
+import math
+import threading
+
+from typing import NamedTuple
+
+from ..thirdparties.inputs import EventBatch, EVENT_SIZE, EV_SYN, EV_ABS, SYN_REPORT
+
+# Axes of a motion sensor node: the accelerometer on ABS_X, ABS_Y and
+# ABS_Z, the gyroscope on ABS_RX, ABS_RY and ABS_RZ.
+MOTION_AXES = 6
+
+class Orientation(NamedTuple):
+    """Angles of the gamepad in radians.
+
+    Pitch turns around the X axis (right), yaw around the Y axis (up)
+    and roll around the Z axis (toward the player), in the frame of the
+    motion sensor.
+    """
+
+    pitch: float
+    yaw: float
+    roll: float
+
+def decode_samples(batch, previous):
+    """Get the samples of the complete reports of an EventBatch read from
+    a motion sensor node.
+
+    The kernel only sends the axes that changed, the others keep their
+    value from the previous report, starting with previous (the raw
+    values of the six axes).
+
+    Returns the report timestamps in nanoseconds, the raw samples as a
+    (reports, 6) array and the number of records used, the ones after
+    are part of an unfinished report.
+    """
+    import numpy  # pylint: disable=import-outside-toplevel
+    records = batch.records
+    is_report = (records['type'] == EV_SYN) & (records['code'] == SYN_REPORT)
+    ends = numpy.flatnonzero(is_report)
+    if len(ends) == 0:
+        return numpy.empty(0, numpy.int64), numpy.empty((0, MOTION_AXES)), 0
+
+    used = ends[-1] + 1
+    records = records[:used]
+    is_report = is_report[:used]
+
+    # Report of each record, the first row holds the previous values.
+    rows = numpy.full((len(ends) + 1, MOTION_AXES), numpy.nan)
+    rows[0] = previous
+    report = numpy.cumsum(is_report) - is_report + 1
+    axes = (records['type'] == EV_ABS) & (records['code'] < MOTION_AXES)
+    rows[report[axes], records['code'][axes]] = records['value'][axes]
+
+    # Carry the last known value of each axis forward.
+    known = numpy.where(numpy.isnan(rows), 0, numpy.arange(len(rows))[:, None])
+    numpy.maximum.accumulate(known, axis=0, out=known)
+    rows = rows[known, numpy.arange(MOTION_AXES)]
+
+    return batch[:used].timestamps_ns()[ends], rows[1:], used
+
+class ImuRing():
+    """The last samples of a motion sensor, in preallocated arrays.
+
+    Samples are added and read by batches. Each sample has a timestamp
+    in nanoseconds on the monotonic clock, the acceleration in g and the
+    angular velocity in radians per second, both (x, y, z).
+    """
+
+    def __init__(self, capacity=4096):
+        import numpy  # pylint: disable=import-outside-toplevel
+        self.capacity = capacity
+        self._timestamps = numpy.zeros(capacity, numpy.int64)
+        self._samples = numpy.zeros((capacity, MOTION_AXES))
+        # Samples ever added, the next one goes at _added % capacity.
+        self._added = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return min(self._added, self.capacity)
+
+    def extend(self, timestamps, samples):
+        """Add a batch of samples, the oldest ones are overwritten."""
+        with self._lock:
+            skipped = len(timestamps) - self.capacity
+            if skipped > 0:
+                # Only the last ones fit, as if the others were overwritten.
+                timestamps = timestamps[skipped:]
+                samples = samples[skipped:]
+                self._added += skipped
+
+            start = self._added % self.capacity
+            first = min(len(timestamps), self.capacity - start)
+            self._timestamps[start:start + first] = timestamps[:first]
+            self._samples[start:start + first] = samples[:first]
+            rest = len(timestamps) - first
+            self._timestamps[:rest] = timestamps[first:]
+            self._samples[:rest] = samples[first:]
+            self._added += len(timestamps)
+
+    def latest(self, count=None):
+        """Get copies of the timestamps and samples of the last count
+        samples (all of them by default), oldest first."""
+        import numpy  # pylint: disable=import-outside-toplevel
+        with self._lock:
+            available = len(self)
+            count = available if count is None else min(count, available)
+            end = self._added % self.capacity
+            indices = numpy.arange(end - count, end) % self.capacity
+            return self._timestamps[indices], self._samples[indices]
+
+    def since(self, timestamp):
+        """Get the samples more recent than a timestamp, oldest first."""
+        import numpy  # pylint: disable=import-outside-toplevel
+        timestamps, samples = self.latest()
+        start = numpy.searchsorted(timestamps, timestamp, side='right')
+        return timestamps[start:], samples[start:]
+
+def _blend(angle, deltas, measures, alphas):
+    """Run a complementary filter over a batch, return the last angle.
+
+    Each step is angle = alpha * (angle + delta) + (1 - alpha) * measure,
+    a linear recurrence, so the result is computed at once from the
+    products of the alphas.
+    """
+    import numpy  # pylint: disable=import-outside-toplevel
+    inputs = alphas * deltas + (1.0 - alphas) * measures
+    # Product of the alphas after each step, in the log domain so the
+    # weights stay between 0 and 1.
+    log_products = numpy.cumsum(numpy.log(alphas))
+    weights = numpy.exp(log_products[-1] - log_products)
+    return float(math.exp(log_products[-1]) * angle + numpy.dot(weights, inputs))
+
+class OrientationFilter():
+    """Estimate the Orientation of a gamepad from its motion samples.
+
+    The gyroscope is integrated, and pitch and roll are pulled toward the
+    direction of gravity measured by the accelerometer (complementary
+    filter) to cancel the drift. Nothing measures the yaw, it drifts
+    slowly. Whole batches are filtered at once with NumPy.
+
+    The gamepad is assumed held about level: gravity along +Y.
+    """
+
+    def __init__(self, time_constant=0.5):
+        # Seconds over which the accelerometer corrects the gyroscope.
+        self.time_constant = time_constant
+        # A single attribute, read by the main thread.
+        self.orientation = Orientation(0.0, 0.0, 0.0)
+        self._timestamp = None
+
+    def update(self, timestamps, samples):
+        """Filter a batch of ImuRing samples, in order."""
+        if len(timestamps) == 0:
+            return
+
+        import numpy  # pylint: disable=import-outside-toplevel
+        accel = samples[:, :3]
+        gyro = samples[:, 3:]
+        pitch_measures = numpy.arctan2(accel[:, 2], accel[:, 1])
+        roll_measures = numpy.arctan2(-accel[:, 0], accel[:, 1])
+
+        pitch, yaw, roll = self.orientation
+        if self._timestamp is None:
+            # Start from the measured attitude.
+            self._timestamp = int(timestamps[0])
+            pitch = float(pitch_measures[0])
+            roll = float(roll_measures[0])
+
+        # Time steps in seconds, bounded when samples were missed.
+        steps = numpy.diff(timestamps, prepend=self._timestamp) / 1e9
+        numpy.clip(steps, 0.0, 0.1, out=steps)
+        alphas = self.time_constant / (self.time_constant + steps)
+
+        self.orientation = Orientation(
+            _blend(pitch, gyro[:, 0] * steps, pitch_measures, alphas),
+            yaw + float(numpy.dot(gyro[:, 1], steps)),
+            _blend(roll, gyro[:, 2] * steps, roll_measures, alphas))
+        self._timestamp = int(timestamps[-1])
+
+    def reset(self):
+        self.orientation = Orientation(0.0, 0.0, 0.0)
+        self._timestamp = None
+
+class MotionTracker():
+    """The motion samples and orientation of a gamepad.
+
+    Fed by the reader thread with the raw events of the motion sensor
+    node, see add_data. Each chunk of events is decoded, scaled, stored
+    and filtered as a whole.
+
+    NumPy is only imported, and the samples only allocated, once a motion
+    sensor is configured, samples is None until then.
+    """
+
+    def __init__(self, capacity=4096):
+        self.capacity = capacity
+        self.samples = None
+        self.filter = OrientationFilter()
+        # Raw units per g and per radian per second, and last raw values.
+        self._scales = None
+        self._state = None
+        # Records of an unfinished report.
+        self._tail = b''
+
+    def configure(self, abs_infos):
+        """Start over for a motion sensor node, from the AbsInfo of each of
+        its axes (0 to 5): current values and resolutions.
+
+        The kernel gives the resolution of the accelerometer in units per
+        g and the one of the gyroscope in units per degree per second.
+        """
+        import numpy  # pylint: disable=import-outside-toplevel
+        if self.samples is None:
+            self.samples = ImuRing(self.capacity)
+        scales = numpy.ones(MOTION_AXES)
+        state = numpy.zeros(MOTION_AXES)
+        for code, abs_info in abs_infos.items():
+            state[code] = abs_info.value
+            if abs_info.resolution:
+                scales[code] = abs_info.resolution
+        scales[3:] *= 180.0 / math.pi
+        self._scales = scales
+        self._state = state
+        self._tail = b''
+        self.filter.reset()
+
+    def add_data(self, data, clock_offset=0):
+        """Add the raw events read from the motion sensor node.
+
+        clock_offset is subtracted from the event times to get times on
+        the monotonic clock.
+        """
+        if self._tail:
+            data = self._tail + bytes(data)
+        timestamps, rows, used = decode_samples(EventBatch(data), self._state)
+        self._tail = bytes(data[used * EVENT_SIZE:])
+        if len(timestamps) == 0:
+            return
+
+        self._state = rows[-1]
+        timestamps -= clock_offset
+        samples = rows / self._scales
+        self.samples.extend(timestamps, samples)
+        self.filter.update(timestamps, samples)
+
+    def get_orientation(self):
+        """Get the last estimated Orientation."""
+        return self.filter.orientation
@@ -0,0 +1,187 @@
+import array
+import math
+import threading
+
+from typing import NamedTuple
+
+from ..thirdparties.inputs import EV_SYN, EV_ABS, SYN_REPORT, SYN_DROPPED, iter_unpack
+from ..thirdparties.inputs import ABS_MT_SLOT, ABS_MT_POSITION_X, ABS_MT_POSITION_Y, ABS_MT_TRACKING_ID
+from ..thirdparties.inputs import event_key
+
+# Events of a touchpad node read by ContactTable.
+TOUCH_KEYS = tuple(event_key(EV_ABS, code) for code in (
+    ABS_MT_SLOT, ABS_MT_POSITION_X, ABS_MT_POSITION_Y, ABS_MT_TRACKING_ID))
+
+# Multi-touch axes read again from the kernel after dropped events.
+TOUCH_AXES = (ABS_MT_TRACKING_ID, ABS_MT_POSITION_X, ABS_MT_POSITION_Y)
+
+# Tracking id of a free slot.
+NO_CONTACT = -1
+
+class TouchGestures(NamedTuple):
+    """Gestures made since they were last taken, see ContactTable.
+
+    Distances are in touchpad widths and heights.
+    """
+
+    # Move of the middle of two fingers.
+    drag_x: float
+    drag_y: float
+    # Change of the distance between two fingers, positive when spreading.
+    pinch: float
+
+NO_GESTURES = TouchGestures(0.0, 0.0, 0.0)
+
+class ContactTable():
+    """The contacts on a touchpad, by slot (multi-touch protocol B).
+
+    The tracking id and position of each slot are kept in preallocated
+    arrays, updated in place: the events of a frame go to the next state,
+    copied to the current one at the end of the frame (SYN_REPORT), so
+    there is no object per contact or per event.
+
+    Two finger drags and pinches are accumulated at each frame, the main
+    thread takes them with take_gestures.
+
+    After a SYN_DROPPED, the events are skipped until the end of the
+    report, then the contacts are read again with the query given to
+    configure, or forgotten without one.
+    """
+
+    def __init__(self, slots=10):
+        self.slots = slots
+        self.tracking_ids = array.array('i', [NO_CONTACT] * slots)
+        self.x = array.array('i', [0] * slots)
+        self.y = array.array('i', [0] * slots)
+        self._next_ids = array.array('i', self.tracking_ids)
+        self._next_x = array.array('i', self.x)
+        self._next_y = array.array('i', self.y)
+        self._slot = 0
+        # Events were lost, skipping them until the end of the report.
+        self._dropped = False
+        self._query = None
+
+        # Size of the surface, to normalize the gestures.
+        self._width = 1.0
+        self._height = 1.0
+
+        # Tracking ids, middle and spread of the last two finger frame.
+        self._pair = None
+        self._lock = threading.Lock()
+        self._gestures = NO_GESTURES
+
+    def configure(self, width, height, query=None):
+        """Start over for a touchpad of the given size, in its units.
+
+        query(codes, slots) reads the touchpad's current slot and values
+        of the ABS_MT_* codes in its slots, see DeviceReactor.get_mt_slots.
+        """
+        self._width = float(width) or 1.0
+        self._height = float(height) or 1.0
+        self._query = query
+        self.reset()
+
+    def reset(self):
+        """Forget the contacts, e.g. when events were lost."""
+        for slot in range(self.slots):
+            self._next_ids[slot] = NO_CONTACT
+            self.tracking_ids[slot] = NO_CONTACT
+        self._slot = 0
+        self._dropped = False
+        self._pair = None
+
+    def add_data(self, data):
+        """Apply the raw events read from the touchpad node."""
+        for _, _, ev_type, code, value in iter_unpack(data):
+            if self._dropped:
+                # The report is incomplete, the kernel has its end state.
+                if ev_type == EV_SYN and code == SYN_REPORT:
+                    self._resync()
+                    self._end_frame()
+                continue
+            if ev_type == EV_ABS:
+                if code == ABS_MT_SLOT:
+                    self._slot = value
+                elif 0 <= self._slot < self.slots:
+                    if code == ABS_MT_TRACKING_ID:
+                        self._next_ids[self._slot] = value
+                    elif code == ABS_MT_POSITION_X:
+                        self._next_x[self._slot] = value
+                    elif code == ABS_MT_POSITION_Y:
+                        self._next_y[self._slot] = value
+            elif ev_type == EV_SYN:
+                if code == SYN_REPORT:
+                    self._end_frame()
+                elif code == SYN_DROPPED:
+                    self._dropped = True
+
+    def _resync(self):
+        """Read the contacts again, or forget them when they can not be."""
+        state = self._query(TOUCH_AXES, self.slots) if self._query is not None else None
+        if state is None:
+            self.reset()
+            return
+        self._dropped = False
+        self._slot, values = state
+        for code, next_values in ((ABS_MT_TRACKING_ID, self._next_ids),
+                                  (ABS_MT_POSITION_X, self._next_x),
+                                  (ABS_MT_POSITION_Y, self._next_y)):
+            slot_values = values[code]
+            for slot in range(self.slots):
+                if slot < len(slot_values):
+                    next_values[slot] = slot_values[slot]
+                elif next_values is self._next_ids:
+                    # Not a slot of this touchpad.
+                    next_values[slot] = NO_CONTACT
+
+    def _end_frame(self):
+        self.tracking_ids[:] = self._next_ids
+        self.x[:] = self._next_x
+        self.y[:] = self._next_y
+
+        # The two first contacts, if there are exactly two.
+        first = second = None
+        for slot in range(self.slots):
+            if self.tracking_ids[slot] != NO_CONTACT:
+                if first is None:
+                    first = slot
+                elif second is None:
+                    second = slot
+                else:
+                    second = None
+                    break
+
+        if second is None:
+            self._pair = None
+            return
+
+        x_first, y_first = self.x[first] / self._width, self.y[first] / self._height
+        x_second, y_second = self.x[second] / self._width, self.y[second] / self._height
+        pair = (
+            self.tracking_ids[first], self.tracking_ids[second],
+            (x_first + x_second) / 2, (y_first + y_second) / 2,
+            math.hypot(x_second - x_first, y_second - y_first))
+
+        previous = self._pair
+        self._pair = pair
+        if previous is None or previous[:2] != pair[:2]:
+            # New fingers, nothing to compare with.
+            return
+
+        with self._lock:
+            drag_x, drag_y, pinch = self._gestures
+            self._gestures = TouchGestures(
+                drag_x + pair[2] - previous[2], drag_y + pair[3] - previous[3],
+                pinch + pair[4] - previous[4])
+
+    def get_contacts(self):
+        """Get the (tracking id, x, y) of the current contacts."""
+        return [(self.tracking_ids[slot], self.x[slot], self.y[slot])
+                for slot in range(self.slots) if self.tracking_ids[slot] != NO_CONTACT]
+
+    def take_gestures(self):
+        """Get the TouchGestures made since the previous call."""
+        with self._lock:
+            gestures = self._gestures
+            self._gestures = NO_GESTURES
+        return gestures
@@ -6,12 +6,38 @@ import array
 
 from typing import NamedTuple
 
-from ..thirdparties.inputs import get_gamepad, devices, UnpluggedError
+from ..thirdparties.inputs import get_gamepad, devices, DeviceReactor, JoystickReactor
+from ..thirdparties.inputs import EventBatch, EVENT_SIZE, READ_BATCH, EV_SYN, EV_KEY, EV_ABS, SYN_REPORT, SYN_DROPPED, iter_unpack
+from ..thirdparties.inputs import query_abs_info, timeval_ns, ABS_MT_POSITION_X, ABS_MT_POSITION_Y
+from .filters import AxisFilter, RateLimiter
+from .latency import LatencyHistogram
+from .haptics import HapticsScheduler
+from .motion import MotionTracker, MOTION_AXES
+from .touch import ContactTable, TOUCH_KEYS
 from ..dev_mode import is_dev_mode
 from ..utils.math import map_float
 
 import math
 import threading
+import time
+
+class StateFrame(NamedTuple):
+    """The state of all the inputs after a complete report of the gamepad.
+
+    Frames are immutable, the reader thread publishes a new one at each
+    report.
+    """
+
+    # Increased by each published frame.
+    version: int
+    # Time of the report, in nanoseconds on the monotonic clock.
+    timestamp: int
+    # Last state of each input slot.
+    values: tuple
+    # Version of the frame in which each slot last changed.
+    slot_versions: tuple
+    # Time of the report in which each slot last changed.
+    slot_timestamps: tuple
 
 class XYTuple():
     """Simple class containing a 2D coordinate."""
@@ -205,7 +231,21 @@ class GamepadArrows():
 
 class XboxController(object):
 
-    def __init__(self):
+    # Ways to read the gamepads: evdev nodes (/dev/input/eventN), the
+    # lighter joystick API nodes (/dev/input/jsN), see JoystickReactor, or
+    # the raw HID reports of Sony pads (/dev/hidrawN), see HidrawReactor.
+    BACKENDS = ('evdev', 'joystick', 'hidraw')
+
+    # First and longest delays in seconds before opening again the devices
+    # the reader could not open.
+    RETRY_DELAY = 0.5
+    RETRY_DELAY_MAX = 30.0
+
+    def __init__(self, backend='evdev'):
+
+        if backend not in self.BACKENDS:
+            raise ValueError("Unknown backend {}, expected one of {}".format(backend, self.BACKENDS))
+        self.backend = backend
 
         # Joysticks inputs
         self.left_joystick = GamepadJoystick(-32768, 32767)
@@ -230,6 +270,91 @@ class XboxController(object):
         # Arrows (4 buttons)
         self.arrows = GamepadArrows()
 
+        # Event code updating each input slot.
+        slots = (
+            # Joysticks.
+            ('ABS_X', self.left_joystick.update_x_state),
+            ('ABS_Y', self.left_joystick.update_y_state),
+            ('ABS_RX', self.right_joystick.update_x_state),
+            ('ABS_RY', self.right_joystick.update_y_state),
+            # Triggers.
+            ('ABS_Z', self.left_trigger.update_state),
+            ('ABS_RZ', self.right_trigger.update_state),
+            # Buttons.
+            ('BTN_TL', self.left_bumper.update_state),
+            ('BTN_TR', self.right_bumper.update_state),
+            ('BTN_SOUTH', self.a.update_state),
+            ('BTN_EAST', self.b.update_state),
+            ('BTN_WEST', self.x.update_state),
+            ('BTN_NORTH', self.y.update_state),
+            ('BTN_THUMBL', self.left_joystick_thumb.update_state),
+            ('BTN_THUMBR', self.right_joystick_thumb.update_state),
+            ('BTN_SELECT', self.start.update_state),
+            ('BTN_START', self.back.update_state),
+            # Arrows.
+            ('ABS_HAT0X', self.arrows.update_x_state),
+            ('ABS_HAT0Y', self.arrows.update_y_state),
+            ('BTN_TRIGGER_HAPPY1', self.arrows.update_left_state),
+            ('BTN_TRIGGER_HAPPY2', self.arrows.update_right_state),
+            ('BTN_TRIGGER_HAPPY3', self.arrows.update_up_state),
+            ('BTN_TRIGGER_HAPPY4', self.arrows.update_down_state),
+        )
+
+        # Events are dispatched with a single lookup of their integer key
+        # (see event_key) instead of comparing their string codes.
+        self._slot_handlers = tuple(handler for _, handler in slots)
+        self._slots = {devices.get_event_key(code): slot for slot, (code, _) in enumerate(slots)}
+
+        # Resting sticks keep sending changes of a few units, they are
+        # dropped by the reader thread (see filters.AxisFilter) so they
+        # neither publish a frame nor wake up tick(). The threshold is a
+        # fraction of the range of the axis, 64 units on an Xbox stick,
+        # the kernel fuzz of the axis is used when larger. Without the
+        # range, the threshold is in raw units.
+        self.jitter_threshold_ratio = 64 / 65535
+        self.jitter_threshold = 64
+        self._filtered_slots = frozenset(
+            self._slots[devices.get_event_key(code)] for code in ('ABS_X', 'ABS_Y', 'ABS_RX', 'ABS_RY'))
+        # AxisFilter of each (device, slot), made on the first event.
+        self._axis_filters = {}
+
+        # Pads polled at up to 8 kHz report much faster than Blender
+        # ticks, the sticks and triggers of each device are published at
+        # most max_rate times per second (the latest value wins). Buttons
+        # and arrows are never held back.
+        self.rate_limiter = RateLimiter(max_rate=240)
+        self._throttled_slots = self._filtered_slots | frozenset(
+            self._slots[devices.get_event_key(code)] for code in ('ABS_Z', 'ABS_RZ'))
+
+        # Changes are buffered by the reader thread until the end of the
+        # report, then published at once in a new frame. The main thread
+        # never sees a half-applied report, e.g. a new X with an old Y.
+        # Each device has its own changes, its reports end independently.
+        self._pending = {}
+        self._frame = StateFrame(0, 0, (0,) * len(slots), (0,) * len(slots), (0,) * len(slots))
+        self._applied_version = 0
+
+        # Time between the kernel stamping an event and its input being
+        # updated by tick().
+        self.latency = LatencyHistogram()
+
+        # Rumble patterns are played by a worker, see rumble().
+        self.haptics = HapticsScheduler(lambda: devices.gamepads)
+
+        # Devices whose events were dropped by the kernel, ignored until
+        # their next report and then read again from the kernel.
+        self._dropped = set()
+        self._reactor = None
+
+        # Accelerometer and gyroscope of the first gamepad having them, a
+        # node of their own read with the gamepads (evdev backend only).
+        self.motion = MotionTracker()
+        self._motion_sensor = None
+
+        # Touchpad of the first gamepad having one, read the same way.
+        self.touch = ContactTable()
+        self._touchpad = None
+
         # Input detection will be done in another thread to keep 
         # the main thread running smoothly.
         # The pill to kill is used to stop that new thread.        
@@ -248,8 +373,12 @@ class XboxController(object):
 
         But there is additional states (button up, hold, down) that needs to 
         be computed on a frame basis.
+
+        All the reports received since the previous tick are applied at once.
         """
 
+        self._apply_frame(self._frame)
+
         self.arrows.tick()
         self.left_bumper.tick()
         self.right_bumper.tick()
@@ -262,74 +391,369 @@ class XboxController(object):
 
     def stop(self):
         self._pill_to_kill.set()
+        self.haptics.stop()
+
+    def rumble(self, pattern, preempt=True):
+        """Play a haptic pattern (see haptics.pulse, ramp and sequence).
+
+        Returns immediately, the gamepads are only touched by the haptics
+        worker.
+        """
+        self.haptics.play(pattern, preempt)
+
+    def get_frame(self):
+        """Get the last published StateFrame."""
+        return self._frame
+
+    def _apply_frame(self, frame):
+        """Update the inputs changed since the last applied frame."""
+
+        if frame.version == self._applied_version:
+            return
+
+        # Apply in the order of the reports, the arrows are updated by
+        # both the hat and the trigger happy buttons.
+        changed = sorted(
+            (version, slot) for slot, version in enumerate(frame.slot_versions)
+            if version > self._applied_version)
+        now = time.monotonic_ns()
+        for _, slot in changed:
+            self._slot_handlers[slot](frame.values[slot])
+            self.latency.add(now - frame.slot_timestamps[slot])
+
+        self._applied_version = frame.version
+
+    def _publish_frame(self, timestamp, changes):
+        """Publish the changes of a complete report, a {slot: state} dict,
+        in a new frame."""
+
+        if not changes:
+            return
+
+        frame = self._frame
+        version = frame.version + 1
+        values = list(frame.values)
+        slot_versions = list(frame.slot_versions)
+        slot_timestamps = list(frame.slot_timestamps)
+        for slot, state in changes.items():
+            values[slot] = state
+            slot_versions[slot] = version
+            slot_timestamps[slot] = timestamp
+
+        # A single assignment, atomic for the main thread.
+        self._frame = StateFrame(
+            version, timestamp, tuple(values), tuple(slot_versions), tuple(slot_timestamps))
 
     def _monitor_controller(self, pill_to_kill):
-        while not pill_to_kill.is_set():
+        # All the gamepads are watched at once, the reactor wakes up
+        # only when at least one of them has queued events.
+        # Only the events updating an input are read, except in dev mode
+        # where all of them are printed.
+        if self.backend == 'joystick':
+            reactor = JoystickReactor()
+        elif self.backend == 'hidraw':
+            # Only loaded when used.
+            from ..thirdparties.inputs import HidrawReactor
+            reactor = HidrawReactor()
+        else:
+            reactor = DeviceReactor(event_keys=None if is_dev_mode else tuple(self._slots) + TOUCH_KEYS)
+        self._reactor = reactor
+
+        # Also wake up when a gamepad is plugged or unplugged.
+        hotplug_fd = devices.hotplug_fileno()
+        if hotplug_fd is not None:
+            reactor.add_watch(hotplug_fd, devices.refresh)
+
+        # Generation of the devices registry the reactor was synced with,
+        # and the devices it should watch.
+        generation = None
+        watched = ()
+        sensor = touchpad = None
+
+        # Devices that could not be opened (e.g. permissions not set yet by
+        # udev, or no node for the backend) are retried after a delay
+        # doubled at each failure, until the registry changes.
+        retry_at = None
+        retry_delay = self.RETRY_DELAY
+
+        try:
+            while not pill_to_kill.is_set():
+                # The registry is an immutable snapshot, no lock needed.
+                registry = devices.registry
+                retry = retry_at is not None and time.monotonic() >= retry_at
+                if registry.generation != generation or retry:
+                    if registry.generation != generation:
+                        # Gamepads came or went.
+                        sensor = self._find_companion(registry.gamepads, devices.get_motion_sensor)
+                        touchpad = self._find_companion(registry.gamepads, devices.get_touchpad)
+                        watched = registry.gamepads + tuple(
+                            device for device in (sensor, touchpad) if device is not None)
+                        generation = registry.generation
+                        retry_delay = self.RETRY_DELAY
+                    reactor.sync(watched)
+                    if len(reactor) != len(watched):
+                        retry_at = time.monotonic() + retry_delay
+                        retry_delay = min(retry_delay * 2, self.RETRY_DELAY_MAX)
+                    else:
+                        retry_at = None
+                    self._sync_motion_sensor(reactor, sensor)
+                    self._sync_touchpad(reactor, touchpad)
+                    self._axis_filters = {
+                        key: axis_filter for key, axis_filter in self._axis_filters.items()
+                        if key[0] in reactor}
+                    self.rate_limiter.retain(lambda key: key[0] in reactor)
+                    self._pending = {
+                        device: changes for device, changes in self._pending.items() if device in reactor}
+
+                if len(reactor) == 0 and hotplug_fd is None:
+                    # Wait for a gamepad without burning a core.
+                    pill_to_kill.wait(0.5)
+                    continue
+
+                # Use a timeout to check the pill to kill regularly, and
+                # wake up in time to publish the values held back by the
+                # rate limiter when no report comes.
+                timeout = 0.1
+                release = self.rate_limiter.next_release()
+                if release is not None:
+                    timeout = min(timeout, max(0, release - time.monotonic_ns()) / 1e9)
+
+                reactor.poll_into(self._handle_data, timeout)
+
+                if release is not None:
+                    self._release_held(time.monotonic_ns(), {})
+        finally:
+            self._reactor = None
+            reactor.close()
+
+    def _find_companion(self, gamepads, find):
+        """Get the node of the first gamepad having one, e.g. its motion
+        sensor with find=devices.get_motion_sensor."""
+
+        if self.backend != 'evdev':
+            return None
+
+        for gamepad in gamepads:
+            device = find(gamepad)
+            if device is not None:
+                return device
+        return None
+
+    def _sync_motion_sensor(self, reactor, sensor):
+        """Start tracking the motion of another sensor node once opened."""
+
+        if sensor not in reactor:
+            sensor = None
+        if sensor is self._motion_sensor:
+            return
+
+        self._motion_sensor = sensor
+        if sensor is None:
+            return
+
+        abs_infos = {}
+        try:
+            for code in range(MOTION_AXES):
+                abs_infos[code] = query_abs_info(reactor.fileno(sensor), code)
+        except OSError:
+            # Raw units then.
+            pass
+        self.motion.configure(abs_infos)
+
+    def _sync_touchpad(self, reactor, touchpad):
+        """Start tracking the contacts of another touchpad once opened."""
+
+        if touchpad not in reactor:
+            touchpad = None
+        if touchpad is self._touchpad:
+            return
+
+        self._touchpad = touchpad
+        if touchpad is None:
+            return
+
+        # Reads the contacts again after dropped events.
+        def query(codes, slots):
+            return reactor.get_mt_slots(touchpad, codes, slots)
+
+        try:
+            fd = reactor.fileno(touchpad)
+            x_info = query_abs_info(fd, ABS_MT_POSITION_X)
+            y_info = query_abs_info(fd, ABS_MT_POSITION_Y)
+        except OSError:
+            self.touch.configure(1, 1, query)
+        else:
+            self.touch.configure(x_info.maximum - x_info.minimum, y_info.maximum - y_info.minimum, query)
+
+    def _handle_data(self, device, data):
+        """Handle a chunk of raw events read from a gamepad."""
+
+        if device is self._motion_sensor:
+            # Hundreds of reports per second, handled by whole chunks.
+            self.motion.add_data(data, self._clock_offset(device))
+            return
 
-            if len(devices.gamepads) == 0:
-                continue
+        if device is self._touchpad:
+            self.touch.add_data(data)
+            return
 
-            try:
-                events = get_gamepad()
-            except UnpluggedError as e:
-                continue
+        if len(data) == EVENT_SIZE * READ_BATCH:
+            # A full read means the queue is flooded (Blender stalled
+            # for a while), only the final state matters.
+            self.apply_batch(EventBatch(data, device))
+            return
 
-            for event in events:
-                self._handle_event(event)
+        self._handle_records(device, iter_unpack(data))
+
+    def _clock_offset(self, device):
+        """Get what to subtract from the event times of a device to get
+        times on the monotonic clock."""
+
+        reactor = self._reactor
+        if reactor is not None and device in reactor and reactor.is_monotonic(device):
+            return 0
+
+        # Stamped with the realtime clock.
+        return time.time_ns() - time.monotonic_ns()
+
+    def _handle_records(self, device, records):
+        """Handle (tv_sec, tv_usec, type, code, value) event records."""
+
+        offset = self._clock_offset(device)
+        for tv_sec, tv_usec, ev_type, code, state in records:
+            if ev_type == EV_SYN:
+                self._handle_sync(device, code, timeval_ns(tv_sec, tv_usec) - offset)
+            elif device not in self._dropped:
+                self._handle_key((ev_type << 16) | code, state, device)
+
+    def _handle_sync(self, device, code, timestamp):
+        """Handle the end of a report, or the loss of events.
+
+        The timestamp is in nanoseconds on the monotonic clock.
+        """
+
+        if code == SYN_DROPPED:
+            # The kernel buffer overflowed (Blender stalled): the report
+            # being read is incomplete and the next one may be too. The
+            # reports of the other devices are not affected.
+            self._pending.pop(device, None)
+            self._dropped.add(device)
+        elif code == SYN_REPORT:
+            if device in self._dropped:
+                self._dropped.discard(device)
+                self._resync(device)
+            self._end_report(device, timestamp)
+
+    def _end_report(self, device, timestamp):
+        """Publish the changes of a report of a device, but the axes
+        updated too recently."""
+
+        changes = self._pending.pop(device, {})
+        for slot in self._throttled_slots.intersection(changes):
+            if self.rate_limiter.hold((device, slot), changes[slot], timestamp):
+                del changes[slot]
+
+        self._release_held(timestamp, changes)
+
+    def _release_held(self, timestamp, changes):
+        """Publish changes along with the values held back by the rate
+        limiter whose window has passed."""
+
+        for (_, slot), state in self.rate_limiter.release(timestamp):
+            changes.setdefault(slot, state)
+        self._publish_frame(timestamp, changes)
+
+    def _resync(self, device):
+        """Read the whole state of the inputs of a device from the kernel,
+        after some of its events were dropped.
+
+        The state replaces the pending changes of that device only, the
+        reports of the other devices stay in progress.
+        """
+
+        reactor = self._reactor
+        if reactor is None or device not in reactor:
+            return
+
+        state = reactor.get_state(device, self._slots)
+        if state is None:
+            # Unplugged, the reactor forgets it on the next read, or not
+            # queried by the backend.
+            return
+
+        changes = {}
+        for key, value in state.items():
+            slot = self._slots[key]
+            changes[slot] = value
+            if (device, slot) in self._axis_filters:
+                self._axis_filters[device, slot].reset(value)
+        self._pending[device] = changes
+
+    def apply_batch(self, batch):
+        """Update the inputs from a whole EventBatch at once.
+
+        The complete reports of the batch are published as a single frame
+        holding the last value of each input, like several reports received
+        between two ticks. The events of an unfinished report are kept
+        pending.
+        """
+
+        if batch.device in self._dropped or batch.mask(EV_SYN, [SYN_DROPPED]).any():
+            # Events were lost, the batch can not be summed up.
+            self._handle_records(batch.device, batch.records.tolist())
+            return
+
+        end = batch.report_end()
+        complete = batch[:end]
+        for ev_type in (EV_KEY, EV_ABS):
+            for code, state in complete.last_values(ev_type).items():
+                self._handle_key((ev_type << 16) | code, state, batch.device)
+        if end:
+            self._end_report(batch.device, int(complete.timestamps_ns()[-1]) - self._clock_offset(batch.device))
+
+        self._handle_records(batch.device, batch[end:].records.tolist())
 
     def _handle_event(self, event):
+        if event.type_code == EV_SYN:
+            self._handle_sync(
+                event.device, event.raw_code, event.timestamp_ns - self._clock_offset(event.device))
+        elif event.device not in self._dropped:
+            self._handle_key(event.key, event.state, event.device)
+
+    def _handle_key(self, key, state, device=None):
+        """Buffer the change of the input matching an event key, until
+        the end of the report."""
+
         # Debug the event.
         if is_dev_mode:
-            print("Event [{}] = [{}]".format(event.code, event.state))
-
-        # Joystics.
-        if event.code == 'ABS_Y':
-            self.left_joystick.update_y_state(event.state)
-        elif event.code == 'ABS_X':
-            self.left_joystick.update_x_state(event.state)
-        elif event.code == 'ABS_RY':
-            self.right_joystick.update_y_state(event.state)
-        elif event.code == 'ABS_RX':
-            self.right_joystick.update_x_state(event.state)
-        # Triggers.
-        elif event.code == 'ABS_Z':
-            self.left_trigger.update_state(event.state)
-        elif event.code == 'ABS_RZ':
-            self.right_trigger.update_state(event.state)
-        # Buttons.
-        elif event.code == 'BTN_TL':
-            self.left_bumper.update_state(event.state)
-        elif event.code == 'BTN_TR':
-            self.right_bumper.update_state(event.state)
-        elif event.code == 'BTN_SOUTH':
-            self.a.update_state(event.state)
-        elif event.code == 'BTN_EAST':
-            self.b.update_state(event.state)
-        elif event.code == 'BTN_WEST':
-            self.x.update_state(event.state)
-        elif event.code == 'BTN_NORTH':
-            self.y.update_state(event.state)
-        elif event.code == 'BTN_THUMBL':
-            self.left_joystick_thumb.update_state(event.state)
-        elif event.code == 'BTN_THUMBR':
-            self.right_joystick_thumb.update_state(event.state)
-        elif event.code == 'BTN_SELECT':
-            self.start.update_state(event.state)
-        elif event.code == 'BTN_START':
-            self.back.update_state(event.state)
-        # Arrows.
-        elif event.code == 'ABS_HAT0X':
-            self.arrows.update_x_state(event.state)
-        elif event.code == 'ABS_HAT0Y':
-            self.arrows.update_y_state(event.state)
-        elif event.code == 'BTN_TRIGGER_HAPPY1':
-            self.arrows.update_left_state(event.state)
-        elif event.code == 'BTN_TRIGGER_HAPPY2':
-            self.arrows.update_right_state(event.state)
-        elif event.code == 'BTN_TRIGGER_HAPPY3':
-            self.arrows.update_up_state(event.state)
-        elif event.code == 'BTN_TRIGGER_HAPPY4':
-            self.arrows.update_down_state(event.state)
+            print("Event [{}] = [{}]".format(devices.get_event_name(key), state))
+
+        slot = self._slots.get(key)
+        if slot is None:
+            return
+
+        if slot in self._filtered_slots:
+            axis_filter = self._axis_filters.get((device, slot))
+            if axis_filter is None:
+                axis_filter = self._axis_filters[device, slot] = self._make_axis_filter(device, key)
+            state = axis_filter.apply(state)
+            if state is None:
+                # Jitter.
+                return
+
+        self._pending.setdefault(device, {})[slot] = state
+
+    def _make_axis_filter(self, device, key):
+        """Make the jitter filter of an axis, from its kernel fuzz and flat
+        when the device is open."""
+
+        reactor = self._reactor
+        if reactor is not None and device in reactor:
+            abs_info = reactor.get_abs_info(device, key & 0xffff)
+            if abs_info is not None:
+                return AxisFilter.from_abs_info(abs_info, self.jitter_threshold_ratio)
+
+        return AxisFilter(self.jitter_threshold)
 
 # Debug purpose
 # Run this script from the terminal.
@@ -5,7 +5,7 @@ import bgl
 from threading import Thread, Event
 from functools import partial
 
-from datetime import datetime
+import time
 
 from . diagnostict import XBOXDiagnostic
 
@@ -56,10 +56,12 @@ class ControlCamera(bpy.types.Operator):
         # We use a timer to compute the time delta between two events.
         # The time delta is then used in input handling to keep the time consistent.
         # https://docs.unity3d.com/ScriptReference/Time-deltaTime.html
-        self.time_now = datetime.now()
+        # The monotonic clock is the one of the gamepad events.
+        self.time_now = time.monotonic_ns()
 
         # Start a recording session for the gamepad.
         self.real_controller = XboxController()
+        self.orientation = self.real_controller.motion.get_orientation()
 
         # Register a drawing overlay.
         self._handle = bpy.types.SpaceView3D.draw_handler_add(self.draw_operator, args, "WINDOW", "POST_PIXEL")
@@ -76,8 +78,8 @@ class ControlCamera(bpy.types.Operator):
             return self.finish()
 
         time_then = self.time_now
-        self.time_now = datetime.now() 
-        self.delta_time = (self.time_now - time_then).total_seconds()
+        self.time_now = time.monotonic_ns()
+        self.delta_time = (self.time_now - time_then) / 1e9
 
         # Extend the timeline.
         scene = bpy.data.scenes['Scene']
@@ -104,6 +106,11 @@ class ControlCamera(bpy.types.Operator):
         self._handle = None
 
         self.real_controller.stop()
+
+        # Latency from the kernel to the inputs handling.
+        if is_dev_mode:
+            print(self.real_controller.latency)
+
         del self.real_controller
 
         # Come back to the begining of the animation.
@@ -128,6 +135,16 @@ class ControlCamera(bpy.types.Operator):
 
         self.real_controller.tick()
 
+        # How much the gamepad turned since the previous frame.
+        orientation = self.real_controller.motion.get_orientation()
+        pitch_delta = orientation.pitch - self.orientation.pitch
+        yaw_delta = orientation.yaw - self.orientation.yaw
+        self.orientation = orientation
+
+        # Touchpad gestures since the previous frame, taken on every frame
+        # so they do not pile up while they are not used.
+        gestures = self.real_controller.touch.take_gestures()
+
         # Start: toggle camera as active view.
         # fixme: crash when toggling back.
         if self.real_controller.start.is_down():
@@ -192,3 +209,23 @@ class ControlCamera(bpy.types.Operator):
         if trigger_right_y:
             camera.rotation_euler[0] += right_y * self.delta_time * (2.0)
             camera.keyframe_insert('rotation_euler')
+
+        # Touchpad: dolly with a two finger drag, zoom with a pinch.
+        if gestures.drag_y:
+            vec = Vector((0.0, 0.0, gestures.drag_y * (10.0)))
+            inv = camera.matrix_world.copy()
+            inv.invert()
+            vec_rot = vec @ inv
+            camera.location = camera.location + vec_rot
+            camera.keyframe_insert('location')
+
+        if gestures.pinch:
+            camera_data.angle = clamp(camera_data.angle - gestures.pinch, 0.00640536, 3.01675)
+            camera_data.keyframe_insert('lens')
+
+        # Motion: tilt and pan with the gamepad while holding the right bumper.
+        right_bumper = self.real_controller.right_bumper
+        if (right_bumper.is_down() or right_bumper.is_hold()) and (pitch_delta or yaw_delta):
+            camera.rotation_euler[0] += pitch_delta
+            camera.rotation_euler[2] += yaw_delta
+            camera.keyframe_insert('rotation_euler')
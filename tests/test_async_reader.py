@@ -0,0 +1,177 @@
+"""Check read_events_async and DeviceReactor against pipes standing in
+for evdev nodes.
+
+Run them from the repository root:
+
+    python -m unittest discover tests
+"""
+
+import asyncio
+import os
+import struct
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from thirdparties.inputs import (  # noqa: E402
+    EV_ABS, EV_KEY, EV_SYN, EVENT_FORMAT, SYN_REPORT, DeviceReactor,
+    UnpluggedError, read_events_async)
+
+EVENT = struct.Struct(EVENT_FORMAT)
+
+
+def report(*changes):
+    """Pack (ev_type, code, value) changes and their SYN_REPORT."""
+    return b''.join(EVENT.pack(1, 0, ev_type, code, value)
+                    for ev_type, code, value in changes + ((EV_SYN, SYN_REPORT, 0),))
+
+
+def is_open(fd):
+    try:
+        os.fstat(fd)
+    except OSError:
+        return False
+    return True
+
+
+class PipeDevice(object):  # pylint: disable=useless-object-inheritance
+    """Stands in for an InputDevice, reading from a pipe."""
+
+    def __init__(self, fd):
+        self.fd = fd
+
+    def open_nonblocking(self):
+        return os.dup(self.fd)
+
+    def _make_event(self, *event):
+        return event
+
+
+class ReadEventsAsyncTest(unittest.TestCase):
+
+    def setUp(self):
+        self.reader, self.writer = os.pipe()
+        os.set_blocking(self.reader, False)
+
+    def tearDown(self):
+        for fd in (self.reader, self.writer):
+            if is_open(fd):
+                os.close(fd)
+
+    def test_batch(self):
+        """Everything queued before a wakeup comes in one batch."""
+        async def read():
+            events = read_events_async(self.reader, batch=True)
+            os.write(self.writer, report((EV_ABS, 0, 100), (EV_KEY, 0x130, 1)) +
+                     report((EV_ABS, 1, -5)))
+            batch = await events.__anext__()
+            await events.aclose()
+            return batch
+
+        batch = asyncio.run(read())
+        self.assertEqual([event[2:] for event in batch], [
+            (EV_ABS, 0, 100), (EV_KEY, 0x130, 1), (EV_SYN, SYN_REPORT, 0),
+            (EV_ABS, 1, -5), (EV_SYN, SYN_REPORT, 0)])
+
+    def test_make_event(self):
+        """Events are built with make_event, one at a time without batch."""
+        async def read():
+            events = read_events_async(
+                self.reader, lambda *event: ('event',) + event[2:])
+            os.write(self.writer, report((EV_ABS, 0, 7)))
+            first = await events.__anext__()
+            second = await events.__anext__()
+            await events.aclose()
+            return first, second
+
+        self.assertEqual(asyncio.run(read()), (
+            ('event', EV_ABS, 0, 7), ('event', EV_SYN, SYN_REPORT, 0)))
+
+    def test_cancel(self):
+        """Cancelling a waiting reader closes the descriptor when asked."""
+        async def read():
+            async def consume():
+                async for _ in read_events_async(self.reader, close=True):
+                    pass
+            task = asyncio.ensure_future(consume())
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(read())
+        self.assertFalse(is_open(self.reader))
+
+    def test_end_of_file(self):
+        """The queued events are read, then the closed pipe raises
+        UnpluggedError, and the descriptor is left open without close."""
+        async def read():
+            received = []
+            os.write(self.writer, report((EV_ABS, 0, 1)))
+            os.close(self.writer)
+            with self.assertRaises(UnpluggedError):
+                async for event in read_events_async(self.reader):
+                    received.append(event[2:])
+            return received
+
+        self.assertEqual(asyncio.run(read()), [
+            (EV_ABS, 0, 1), (EV_SYN, SYN_REPORT, 0)])
+        self.assertTrue(is_open(self.reader))
+
+
+class DeviceReactorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.reader, self.writer = os.pipe()
+        os.set_blocking(self.reader, False)
+        self.device = PipeDevice(self.reader)
+        self.reactor = DeviceReactor([self.device])
+
+    def tearDown(self):
+        self.reactor.close()
+        os.close(self.reader)
+        if is_open(self.writer):
+            os.close(self.writer)
+
+    def test_poll_raw(self):
+        """The reports queued between two polls are read at once."""
+        os.write(self.writer, report((EV_ABS, 0, 100)) + report((EV_ABS, 0, 110)))
+        ready = self.reactor.poll_raw(1)
+        self.assertEqual(len(ready), 1)
+        device, data = ready[0]
+        self.assertIs(device, self.device)
+        self.assertEqual([event[2:] for event in EVENT.iter_unpack(data)], [
+            (EV_ABS, 0, 100), (EV_SYN, SYN_REPORT, 0),
+            (EV_ABS, 0, 110), (EV_SYN, SYN_REPORT, 0)])
+
+    def test_filtered(self):
+        """Without EVIOCSMASK on a pipe, unwanted events are filtered
+        after each read."""
+        reactor = DeviceReactor([self.device], event_keys=[EV_ABS << 16 | 1])
+        try:
+            self.assertFalse(reactor.is_masked(self.device))
+            os.write(self.writer, report((EV_ABS, 0, 3), (EV_ABS, 1, 4)))
+            data = b''.join(data for _, data in reactor.poll_raw(1))
+        finally:
+            reactor.close()
+        self.assertEqual([event[2:] for event in EVENT.iter_unpack(data)], [
+            (EV_ABS, 1, 4), (EV_SYN, SYN_REPORT, 0)])
+
+    def test_timeout(self):
+        self.assertEqual(self.reactor.poll(0), [])
+
+    def test_end_of_file(self):
+        """The events queued before the pipe is closed are read, then the
+        device is unregistered."""
+        os.write(self.writer, report((EV_ABS, 0, 1)))
+        os.close(self.writer)
+        events = self.reactor.poll(1)
+        self.assertEqual(events, [(1, 0, EV_ABS, 0, 1), (1, 0, EV_SYN, SYN_REPORT, 0)])
+        self.assertEqual(self.reactor.poll(0), [])
+        self.assertNotIn(self.device, self.reactor)
+        self.assertEqual(len(self.reactor), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+"""Check the Linux device discovery on a fake /dev/input tree.
+
+Run them from the repository root:
+
+    python -m unittest discover tests
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from thirdparties.inputs import (  # noqa: E402
+    ABS_MT_POSITION_X, ABS_MT_POSITION_Y, ABS_MT_SLOT, EV_ABS, EV_KEY,
+    Capabilities, DeviceManager, UnpluggedError)
+
+GAMEPAD = Capabilities(1 << EV_KEY | 1 << EV_ABS, 1 << 0x130, 0b11, 0)
+KEYBOARD = Capabilities(1 << EV_KEY, 1 << 30, 0, 0)
+TOUCHPAD = Capabilities(1 << EV_ABS, 0, 1 << ABS_MT_SLOT | 1 << ABS_MT_POSITION_X |
+                        1 << ABS_MT_POSITION_Y, 0)
+
+
+class FakeManager(DeviceManager):
+    """Reads the capabilities of the fake nodes from a dict, the files
+    can not answer the ioctls."""
+
+    def __init__(self, root, capabilities):
+        super(FakeManager, self).__init__(
+            os.path.join(root, 'dev', 'input'), os.path.join(root, 'sys', 'class'))
+        self.fake_capabilities = capabilities
+
+    def get_capabilities(self, char_path):
+        return self.fake_capabilities.get(os.path.basename(char_path))
+
+
+class DiscoveryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.dev_input = os.path.join(self.root, 'dev', 'input')
+        os.makedirs(os.path.join(self.dev_input, 'by-id'))
+        os.makedirs(os.path.join(self.root, 'sys', 'class', 'leds'))
+        self.capabilities = {}
+        self.manager = FakeManager(self.root, self.capabilities)
+
+    def tearDown(self):
+        self.manager.close()
+        shutil.rmtree(self.root)
+
+    def add_node(self, number, capabilities, link=None, physical=None):
+        char_name = 'event{}'.format(number)
+        device_dir = os.path.join(
+            self.root, 'sys', 'class', 'input', char_name, 'device')
+        os.makedirs(device_dir)
+        if physical:
+            # The HID device, with the input devices of its nodes.
+            os.makedirs(os.path.join(physical, 'input', 'input{}'.format(number), char_name))
+            os.symlink(physical, os.path.join(device_dir, 'device'))
+        with open(os.path.join(device_dir, 'name'), 'w') as name_file:
+            name_file.write('Fake device {}\n'.format(number))
+        self.capabilities[char_name] = capabilities
+        open(os.path.join(self.dev_input, char_name), 'w').close()
+        if link:
+            os.symlink(os.path.join('..', char_name),
+                       os.path.join(self.dev_input, 'by-id', link))
+        return os.path.join(self.dev_input, char_name)
+
+    def char_paths(self):
+        return [gamepad.get_char_device_path() for gamepad in self.manager.gamepads]
+
+    def test_rescan(self):
+        linked = self.add_node(0, GAMEPAD, 'usb-Pad-event-joystick')
+        unlinked = self.add_node(1, GAMEPAD)
+        self.add_node(2, KEYBOARD)
+        self.assertEqual(sorted(self.char_paths()), [linked, unlinked])
+
+    def test_joystick_path(self):
+        """The joystick API node is in the manager's tree."""
+        open(os.path.join(self.dev_input, 'js3'), 'w').close()
+        os.symlink(os.path.join('..', 'js3'),
+                   os.path.join(self.dev_input, 'by-id', 'usb-Pad-joystick'))
+        self.add_node(0, GAMEPAD, 'usb-Pad-event-joystick')
+        self.assertEqual(self.manager.gamepads[0].get_joystick_path(),
+                         os.path.join(self.dev_input, 'js3'))
+
+    def test_refresh(self):
+        """Gamepads without a symlink are found when hot-plugged too."""
+        self.assertEqual(self.char_paths(), [])
+        if self.manager.hotplug_fileno() is None:
+            self.skipTest('no inotify')
+        generation = self.manager.generation
+        linked = self.add_node(0, GAMEPAD, 'usb-Pad-event-joystick')
+        unlinked = self.add_node(1, GAMEPAD)
+        self.add_node(2, KEYBOARD)
+        self.manager.refresh()
+        self.assertEqual(sorted(self.char_paths()), [linked, unlinked])
+        self.assertEqual(self.manager.generation, generation + 1)
+        # The one with a symlink is known by its symlink, the other one
+        # by its node.
+        paths = {gamepad.get_char_device_path(): gamepad for gamepad in self.manager.gamepads}
+        self.assertIn('by-id', repr(paths[linked]))
+        self.assertFalse(paths[linked].by_capabilities)
+        self.assertIn('"{}"'.format(unlinked), repr(paths[unlinked]))
+        self.assertTrue(paths[unlinked].by_capabilities)
+
+        # Found once udev makes a node without a symlink readable.
+        unreadable = self.add_node(3, None)
+        self.manager.refresh()
+        self.assertEqual(sorted(self.char_paths()), [linked, unlinked])
+        self.capabilities['event3'] = GAMEPAD
+        os.chmod(unreadable, 0o660)
+        self.manager.refresh()
+        self.assertEqual(sorted(self.char_paths()), [linked, unlinked, unreadable])
+        self.assertEqual(self.manager.generation, generation + 3)
+        # Nothing is published for the nodes already added.
+        os.chmod(unreadable, 0o600)
+        self.manager.refresh()
+        self.assertEqual(self.manager.generation, generation + 3)
+
+        unplugged = [gamepad for gamepad in self.manager.gamepads
+                     if gamepad.get_char_device_path() == unlinked][0]
+        os.remove(unlinked)
+        self.manager.refresh()
+        self.assertEqual(sorted(self.char_paths()), [linked, unreadable])
+
+        # An unplugged gamepad is not opened again to rumble.
+        self.assertTrue(unplugged.stale)
+        with self.assertRaises(UnpluggedError):
+            unplugged.set_vibration(1, 1, 100)
+        with self.assertRaises(UnpluggedError):
+            unplugged.stop_vibration()
+
+    def test_touchpad(self):
+        """The touchpad next to a gamepad is opened by its node, and
+        closed when the gamepad is unplugged."""
+        physical = os.path.join(self.root, 'sys', 'devices', 'pad')
+        gamepad_path = self.add_node(0, GAMEPAD, physical=physical)
+        touchpad_path = self.add_node(1, TOUCHPAD, physical=physical)
+        gamepad = self.manager.gamepads[0]
+        touchpad = self.manager.get_touchpad(gamepad)
+        self.assertEqual(touchpad.get_char_device_path(), touchpad_path)
+        self.assertIn('"{}"'.format(touchpad_path), repr(touchpad))
+        self.assertIs(self.manager.get_touchpad(gamepad), touchpad)
+
+        if self.manager.hotplug_fileno() is None:
+            self.skipTest('no inotify')
+        os.remove(gamepad_path)
+        self.manager.refresh()
+        self.assertTrue(touchpad.stale)
+        self.assertIsNone(self.manager.get_touchpad(gamepad))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+"""Check the jitter filter of the axes.
+
+The addon's modules are imported from a package standing in for the
+addon, without its __init__.py which needs Blender.
+
+Run them from the repository root:
+
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import types
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+if 'addon' not in sys.modules:
+    sys.modules['addon'] = types.ModuleType('addon')
+    sys.modules['addon'].__path__ = [ROOT]
+
+from addon.gamepad.filters import AxisFilter  # noqa: E402
+from addon.thirdparties.inputs import AbsInfo  # noqa: E402
+
+RATIO = 64 / 65535
+
+
+class AxisFilterTest(unittest.TestCase):
+
+    def test_threshold_ratio(self):
+        """The threshold follows the range of the axis."""
+        stick = AxisFilter.from_abs_info(AbsInfo(0, -32768, 32767, 16, 128, 0), RATIO)
+        self.assertEqual(stick.threshold, 64)
+        self.assertEqual(stick.flat, 128)
+
+        # An 8-bit trigger lets every unit through.
+        trigger = AxisFilter.from_abs_info(AbsInfo(0, 0, 255, 0, 0, 0), RATIO)
+        self.assertEqual(trigger.threshold, 0)
+        self.assertEqual([trigger.apply(value) for value in (10, 11, 11, 12)],
+                         [10, 11, None, 12])
+
+    def test_fuzz(self):
+        """The kernel fuzz is the floor."""
+        axis = AxisFilter.from_abs_info(AbsInfo(0, 0, 255, 4, 0, 0), RATIO)
+        self.assertEqual(axis.threshold, 4)
+        self.assertEqual([axis.apply(value) for value in (100, 104, 105)], [100, None, 105])
+
+
+if __name__ == '__main__':
+    unittest.main()
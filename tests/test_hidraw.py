@@ -0,0 +1,272 @@
+"""Check the hidraw backend against the evdev one, on replayed reports.
+
+The reports of a DualShock 4 and a DualSense are written at the offsets
+of the kernel's hid-playstation structures, along with the evdev events
+that driver sends for the same input. The reports go through a socket
+pair standing in for the hidraw node and are read with HidrawReactor,
+the events through a pipe read with DeviceReactor, and both must leave
+the same state.
+
+Run them from the repository root:
+
+    python -m unittest discover tests
+"""
+
+import os
+import shutil
+import socket
+import struct
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from thirdparties.inputs import (  # noqa: E402
+    EV_ABS, EV_KEY, EV_SYN, EVENT_FORMAT, SYN_REPORT, DeviceManager, DeviceReactor, iter_unpack)
+from thirdparties._inputs_hidraw import (  # noqa: E402
+    DUALSENSE, DUALSHOCK4, HidrawReactor, find_hidraw)
+
+EVENT = struct.Struct(EVENT_FORMAT)
+
+REPORT_SIZE = 64
+
+# hid-playstation's d-pad values, from up clockwise, then released.
+DPAD = {(0, -1): 0, (1, -1): 1, (1, 0): 2, (1, 1): 3, (0, 1): 4,
+        (-1, 1): 5, (-1, 0): 6, (-1, -1): 7, (0, 0): 8}
+
+# hid-playstation's buttons: (byte, bit) of each evdev code.
+BUTTONS = {
+    0x134: (0, 4), 0x130: (0, 5), 0x131: (0, 6), 0x133: (0, 7),  # square, cross, circle, triangle
+    0x136: (1, 0), 0x137: (1, 1), 0x138: (1, 2), 0x139: (1, 3),  # L1, R1, L2, R2
+    0x13a: (1, 4), 0x13b: (1, 5), 0x13d: (1, 6), 0x13e: (1, 7),  # share, options, L3, R3
+    0x13c: (2, 0),  # PS
+}
+
+# Offsets in the USB input report 0x01, see struct
+# dualshock4_input_report_usb and struct dualsense_input_report.
+DS4_OFFSETS = {'sticks': 1, 'buttons': 5, 'triggers': 8, 'gyro': 13, 'accel': 19,
+               'touch_count': 33, 'touch': 35}
+DUALSENSE_OFFSETS = {'sticks': 1, 'triggers': 5, 'buttons': 8, 'gyro': 16, 'accel': 22,
+                     'touch': 33}
+
+
+class Frame(object):  # pylint: disable=useless-object-inheritance
+    """The input of a pad at a given time."""
+
+    def __init__(self, sticks=(128, 128, 128, 128), triggers=(0, 0), dpad=(0, 0),
+                 buttons=(), gyro=(0, 0, 0), accel=(0, 8192, 0), touches=()):
+        self.sticks = sticks
+        self.triggers = triggers
+        self.dpad = dpad
+        self.buttons = frozenset(buttons)
+        self.gyro = gyro
+        self.accel = accel
+        # (id, x, y) of the fingers.
+        self.touches = touches
+
+    def report(self, offsets):
+        """Pack the raw USB input report."""
+        report = bytearray(REPORT_SIZE)
+        report[0] = 0x01
+        struct.pack_into('4B', report, offsets['sticks'], *self.sticks)
+        struct.pack_into('2B', report, offsets['triggers'], *self.triggers)
+        buttons = [DPAD[self.dpad], 0, 0]
+        for code in self.buttons:
+            byte, bit = BUTTONS[code]
+            buttons[byte] |= 1 << bit
+        struct.pack_into('3B', report, offsets['buttons'], *buttons)
+        struct.pack_into('<3h', report, offsets['gyro'], *self.gyro)
+        struct.pack_into('<3h', report, offsets['accel'], *self.accel)
+        if 'touch_count' in offsets:
+            report[offsets['touch_count']] = 1
+        for index in range(2):
+            offset = offsets['touch'] + 4 * index
+            if index < len(self.touches):
+                finger, x, y = self.touches[index]
+                report[offset:offset + 4] = bytes((
+                    finger, x & 0xff, x >> 8 | (y & 0x0f) << 4, y >> 4))
+            else:
+                # Lifted.
+                report[offset] = 0x80
+        return bytes(report)
+
+    def events(self):
+        """Get the state hid-playstation sends on the gamepad node, as
+        {(type, code): value}."""
+        state = {(EV_ABS, code): value for code, value in zip(
+            (0x00, 0x01, 0x03, 0x04, 0x02, 0x05), self.sticks + self.triggers)}
+        state[EV_ABS, 0x10], state[EV_ABS, 0x11] = self.dpad
+        for code in BUTTONS:
+            state[EV_KEY, code] = int(code in self.buttons)
+        return state
+
+
+FRAMES = (
+    Frame(),
+    Frame(sticks=(0, 255, 140, 120), triggers=(10, 0), buttons=(0x130,)),
+    Frame(sticks=(0, 255, 140, 120), triggers=(255, 128), dpad=(1, -1),
+          buttons=(0x130, 0x136, 0x13c), gyro=(-12, 300, 7), accel=(100, 8000, -40),
+          touches=((3, 1919, 941),)),
+    Frame(sticks=(64, 200, 128, 128), dpad=(-1, 0),
+          buttons=(0x133, 0x13a, 0x13b, 0x13e), gyro=(5, -5, 32767),
+          touches=((3, 1000, 500), (4, 0, 0))),
+    Frame(dpad=(0, 1), buttons=(0x134, 0x131, 0x137, 0x138, 0x139, 0x13d)),
+)
+
+
+def xbox_range(key, value):
+    """Convert an evdev value of a Sony pad to the range of an Xbox pad
+    used by the hidraw backend: sticks from -32768 to 32767."""
+    if key in ((EV_ABS, 0x00), (EV_ABS, 0x01), (EV_ABS, 0x03), (EV_ABS, 0x04)):
+        return (value << 8) - 32768
+    return value
+
+
+class ReplayDevice(object):  # pylint: disable=useless-object-inheritance
+    """Stands in for the gamepad, reading from a descriptor."""
+
+    name = 'Replayed pad'
+
+    def __init__(self, fd, layout=None):
+        self.fd = fd
+        self.layout = layout
+
+    def open_nonblocking(self):
+        return os.dup(self.fd)
+
+
+class ReplayHidrawReactor(HidrawReactor):
+    """Reads the hidraw reports of ReplayDevices."""
+
+    @staticmethod
+    def _open(device):
+        return os.dup(device.fd), device.layout
+
+
+def collect(state):
+    """Get a sink keeping the last value of each (type, code)."""
+    def sink(_, view):
+        for _, _, ev_type, code, value in iter_unpack(view):
+            if ev_type != EV_SYN:
+                state[ev_type, code] = value
+    return sink
+
+
+class HidrawReplayTest(unittest.TestCase):
+
+    def replay(self, layout, offsets):
+        hidraw_reader, hidraw_writer = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        hidraw_reader.setblocking(False)
+        evdev_reader, evdev_writer = os.pipe()
+        os.set_blocking(evdev_reader, False)
+        hidraw_device = ReplayDevice(hidraw_reader.fileno(), layout)
+        evdev_device = ReplayDevice(evdev_reader)
+        hidraw = ReplayHidrawReactor([hidraw_device])
+        evdev = DeviceReactor([evdev_device])
+        try:
+            hidraw_state = {}
+            evdev_state = {}
+            previous = {}
+            for index, frame in enumerate(FRAMES):
+                hidraw_writer.send(frame.report(offsets))
+                hidraw.poll_into(collect(hidraw_state), 1)
+
+                # The kernel only sends the values that changed.
+                events = frame.events()
+                os.write(evdev_writer, b''.join(
+                    EVENT.pack(0, 0, ev_type, code, value)
+                    for (ev_type, code), value in sorted(events.items())
+                    if previous.get((ev_type, code)) != value) +
+                    EVENT.pack(0, 0, EV_SYN, SYN_REPORT, 0))
+                previous = events
+                evdev.poll_into(collect(evdev_state), 1)
+
+                self.assertEqual(hidraw_state, {
+                    key: xbox_range(key, value) for key, value in evdev_state.items()},
+                    'frame {}'.format(index))
+
+                # The motion and touch fields are kept raw, like the
+                # motion node's values with an identity calibration.
+                report = hidraw.report(hidraw_device)
+                self.assertEqual((report.gyro_x, report.gyro_y, report.gyro_z), frame.gyro)
+                self.assertEqual((report.accel_x, report.accel_y, report.accel_z), frame.accel)
+                self.assertEqual(report.touches(), list(frame.touches))
+        finally:
+            hidraw.close()
+            evdev.close()
+            hidraw_reader.close()
+            hidraw_writer.close()
+            os.close(evdev_reader)
+            os.close(evdev_writer)
+
+    def test_dualshock4(self):
+        self.replay(DUALSHOCK4, DS4_OFFSETS)
+
+    def test_dualsense(self):
+        self.replay(DUALSENSE, DUALSENSE_OFFSETS)
+
+    def test_queued_reports(self):
+        """Only the last of the reports queued between two polls is
+        decoded, with the changes since the previous poll."""
+        reader, writer = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        reader.setblocking(False)
+        device = ReplayDevice(reader.fileno(), DUALSHOCK4)
+        reactor = ReplayHidrawReactor([device])
+        try:
+            state = {}
+            for frame in FRAMES:
+                writer.send(frame.report(DS4_OFFSETS))
+            reactor.poll_into(collect(state), 1)
+        finally:
+            reactor.close()
+            reader.close()
+            writer.close()
+        self.assertEqual(state, {
+            key: xbox_range(key, value) for key, value in FRAMES[-1].events().items()})
+
+    def test_no_ioctl(self):
+        """No evdev ioctl is sent to the hidraw nodes."""
+        reader, writer = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        device = ReplayDevice(reader.fileno(), DUALSHOCK4)
+        reactor = ReplayHidrawReactor([device])
+        try:
+            with mock.patch('thirdparties.inputs.ioctl', side_effect=AssertionError('ioctl')):
+                self.assertIsNone(reactor.get_abs_info(device, 0x00))
+                self.assertIsNone(reactor.get_state(device, [EV_KEY << 16 | 0x130]))
+                self.assertIsNone(reactor.get_mt_slots(device, [0x39], 2))
+        finally:
+            reactor.close()
+            reader.close()
+            writer.close()
+
+
+class FindHidrawTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_fake_tree(self):
+        """The hidraw node is found under the manager's sysfs and /dev."""
+        manager = DeviceManager(os.path.join(self.root, 'dev', 'input'),
+                                os.path.join(self.root, 'sys', 'class'))
+        device_dir = os.path.join(manager.sys_input_dir, 'event5', 'device')
+        os.makedirs(os.path.join(device_dir, 'id'))
+        os.makedirs(os.path.join(device_dir, 'device', 'hidraw', 'hidraw2'))
+        for name, value in (('vendor', '054c'), ('product', '0ce6')):
+            with open(os.path.join(device_dir, 'id', name), 'w') as id_file:
+                id_file.write(value + '\n')
+
+        self.assertEqual(
+            find_hidraw('/dev/input/event5', manager.sys_input_dir,
+                        os.path.dirname(manager.dev_input_dir)),
+            (os.path.join(self.root, 'dev', 'hidraw2'), DUALSENSE))
+        self.assertEqual(find_hidraw('/dev/input/event6', manager.sys_input_dir), (None, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
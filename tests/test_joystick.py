@@ -0,0 +1,86 @@
+"""Check the joystick API backend against joydev's numbering and
+correction of the evdev events.
+
+Run them from the repository root:
+
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from thirdparties.inputs import (  # noqa: E402
+    EV_ABS, EV_KEY, EV_SYN, JS_AXIS_MAX, JS_EVENT, JS_EVENT_AXIS, JS_EVENT_BUTTON,
+    JS_EVENT_INIT, SYN_REPORT, AbsInfo, Capabilities, convert_js_events, iter_unpack,
+    joystick_map, _uncorrect_axis)
+
+BTN_0 = 0x100
+BTN_SOUTH = 0x130
+BTN_EAST = 0x131
+KEY_A = 30
+
+# A stick and a trigger.
+ABS_INFOS = {0x00: AbsInfo(0, -32768, 32767, 16, 128, 0),
+             0x02: AbsInfo(0, 0, 255, 0, 0, 0)}
+
+PAD = Capabilities(1 << EV_KEY | 1 << EV_ABS,
+                   1 << KEY_A | 1 << BTN_0 | 1 << BTN_SOUTH | 1 << BTN_EAST,
+                   1 << 0x00 | 1 << 0x02, 0)
+
+
+def joydev_correct(value, correction):
+    """What joydev_correct does with a JS_CORR_BROKEN correction."""
+    _, low, high, _, coefficient = correction
+    if value > low:
+        value = 0 if value < high else (coefficient * (value - high)) >> 14
+    else:
+        value = (coefficient * (value - low)) >> 14
+    return min(max(value, -JS_AXIS_MAX), JS_AXIS_MAX)
+
+
+class JoystickMapTest(unittest.TestCase):
+
+    def setUp(self):
+        self.mapping = joystick_map(PAD, ABS_INFOS)
+
+    def test_buttons(self):
+        """The buttons are numbered from BTN_JOYSTICK up, then from
+        BTN_MISC, the keyboard keys have no number."""
+        buttons = {number: code for (js_type, number), (_, code, _) in self.mapping.items()
+                   if js_type == JS_EVENT_BUTTON}
+        self.assertEqual(buttons, {0: BTN_SOUTH, 1: BTN_EAST, 2: BTN_0})
+
+    def test_axes(self):
+        """The joydev correction of the axes is undone, but within the
+        flat zone and at the clamped ends."""
+        for number, code in enumerate(sorted(ABS_INFOS)):
+            ev_type, mapped, correction = self.mapping[JS_EVENT_AXIS, number]
+            self.assertEqual((ev_type, mapped), (EV_ABS, code))
+            abs_info = ABS_INFOS[code]
+            for value in range(abs_info.minimum, abs_info.maximum + 1, 7):
+                corrected = joydev_correct(value, correction)
+                if correction[1] <= value <= correction[2] or abs(corrected) == JS_AXIS_MAX:
+                    # Lost in the flat zone or clamped.
+                    continue
+                self.assertLessEqual(
+                    abs(_uncorrect_axis(corrected, correction) - value),
+                    1, 'axis {} value {}'.format(code, value))
+            self.assertEqual(_uncorrect_axis(JS_AXIS_MAX, correction), abs_info.maximum)
+            self.assertEqual(_uncorrect_axis(-JS_AXIS_MAX, correction), abs_info.minimum)
+
+    def test_convert(self):
+        data = b''.join((JS_EVENT.pack(0, 1, JS_EVENT_BUTTON | JS_EVENT_INIT, 2),
+                         JS_EVENT.pack(0, 1, JS_EVENT_BUTTON, 0),
+                         JS_EVENT.pack(0, JS_AXIS_MAX, JS_EVENT_AXIS, 1),
+                         JS_EVENT.pack(0, 1, JS_EVENT_BUTTON, 3)))
+        self.assertEqual(
+            [record[2:] for record in iter_unpack(convert_js_events(data, self.mapping, 0))],
+            [(EV_KEY, BTN_0, 1), (EV_KEY, BTN_SOUTH, 1), (EV_ABS, 0x02, 255),
+             (EV_SYN, SYN_REPORT, 0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
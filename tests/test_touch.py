@@ -0,0 +1,92 @@
+"""Check the touchpad contacts of ContactTable across dropped events.
+
+The addon's modules are imported from a package standing in for the
+addon, without its __init__.py which needs Blender.
+
+Run them from the repository root:
+
+    python -m unittest discover tests
+"""
+
+import os
+import struct
+import sys
+import types
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+if 'addon' not in sys.modules:
+    sys.modules['addon'] = types.ModuleType('addon')
+    sys.modules['addon'].__path__ = [ROOT]
+
+from addon.gamepad.touch import ContactTable, NO_CONTACT, TOUCH_AXES  # noqa: E402
+from addon.thirdparties.inputs import (  # noqa: E402
+    ABS_MT_POSITION_X, ABS_MT_POSITION_Y, ABS_MT_SLOT, ABS_MT_TRACKING_ID,
+    EV_ABS, EV_SYN, EVENT_FORMAT, SYN_DROPPED, SYN_REPORT)
+
+EVENT = struct.Struct(EVENT_FORMAT)
+
+
+def events(*records):
+    """Pack (type, code, value) records."""
+    return b''.join(EVENT.pack(0, 0, ev_type, code, value)
+                    for ev_type, code, value in records)
+
+
+def touch(slot, tracking_id, x, y):
+    return ((EV_ABS, ABS_MT_SLOT, slot), (EV_ABS, ABS_MT_TRACKING_ID, tracking_id),
+            (EV_ABS, ABS_MT_POSITION_X, x), (EV_ABS, ABS_MT_POSITION_Y, y))
+
+
+REPORT = ((EV_SYN, SYN_REPORT, 0),)
+DROPPED = ((EV_SYN, SYN_DROPPED, 0),)
+
+
+class ContactTableTest(unittest.TestCase):
+
+    def setUp(self):
+        # What the kernel would answer to EVIOCGMTSLOTS, two slots.
+        self.kernel = None
+        self.queries = []
+        self.table = ContactTable()
+        self.table.configure(100, 100, self.query)
+
+    def query(self, codes, slots):
+        self.queries.append((codes, slots))
+        return self.kernel
+
+    def test_frames(self):
+        self.table.add_data(events(*touch(0, 7, 10, 20) + REPORT))
+        self.assertEqual(self.table.get_contacts(), [(7, 10, 20)])
+
+    def test_dropped(self):
+        """The events of the report after a SYN_DROPPED are skipped, the
+        contacts are read from the kernel at its end."""
+        self.table.add_data(events(*touch(0, 7, 10, 20) + REPORT))
+        self.kernel = (1, {ABS_MT_TRACKING_ID: (7, 8),
+                           ABS_MT_POSITION_X: (30, 50),
+                           ABS_MT_POSITION_Y: (40, 60)})
+        self.table.add_data(events(*DROPPED + touch(3, 9, 1, 1) + touch(0, 7, 90, 90)))
+        self.assertEqual(self.table.get_contacts(), [(7, 10, 20)])
+        self.assertEqual(self.queries, [])
+
+        self.table.add_data(events(*REPORT + ((EV_ABS, ABS_MT_POSITION_X, 55),) + REPORT))
+        self.assertEqual(self.queries, [(TOUCH_AXES, self.table.slots)])
+        # The slots the touchpad does not have are free, the slot of the
+        # events after the report is the kernel's one.
+        self.assertEqual(self.table.get_contacts(), [(7, 30, 40), (8, 55, 60)])
+        self.assertEqual(list(self.table.tracking_ids[2:]), [NO_CONTACT] * (self.table.slots - 2))
+
+    def test_dropped_unreadable(self):
+        """The contacts are forgotten when they can not be read."""
+        self.table.add_data(events(*touch(0, 7, 10, 20) + REPORT))
+        self.table.add_data(events(*DROPPED + touch(0, 7, 90, 90) + REPORT))
+        self.assertEqual(self.table.get_contacts(), [])
+        self.table.add_data(events(*touch(1, 8, 5, 5) + REPORT))
+        self.assertEqual(self.table.get_contacts(), [(8, 5, 5)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,298 @@
+"""Linux hidraw backend of inputs: raw HID reports of Sony gamepads.
+
+Split from inputs.py so that it is only imported when needed. Same
+licence as inputs.py.
+"""
+
+from __future__ import print_function
+from __future__ import division
+
+import errno
+import os
+import select
+import struct
+import time
+from collections import namedtuple
+from operator import itemgetter
+
+from .inputs import (
+    DeviceReactor, UnpluggedError, _open_nonblocking, EVENT_FORMAT, EV_SYN,
+    EV_KEY, EV_ABS, SYN_REPORT)
+
+SONY_VENDOR_ID = 0x054c
+
+# Large enough for the USB and Bluetooth input reports.
+HID_REPORT_MAX = 128
+
+
+class PadReport(namedtuple('PadReport', (
+        'left_x', 'left_y', 'right_x', 'right_y',
+        'left_trigger', 'right_trigger',
+        'buttons0', 'buttons1', 'buttons2',
+        'gyro_x', 'gyro_y', 'gyro_z', 'accel_x', 'accel_y', 'accel_z',
+        'sensor_time',
+        'touch0_contact', 'touch0_xy', 'touch0_y',
+        'touch1_contact', 'touch1_xy', 'touch1_y'))):
+    """The decoded input report of a DualShock 4 or DualSense.
+
+    Sticks and triggers go from 0 to 255, the sticks are centered on 128
+    with up and left at 0. The low nibble of buttons0 is the d-pad
+    direction, see HAT_DIRECTIONS. The motion fields are the raw sensor
+    values, the touch fields are packed, see touches().
+    """
+    __slots__ = ()
+
+    def touches(self):
+        """Get the (id, x, y) of the fingers on the touchpad."""
+        touches = []
+        for contact, x_y, y_high in ((self.touch0_contact, self.touch0_xy, self.touch0_y),
+                                     (self.touch1_contact, self.touch1_xy, self.touch1_y)):
+            # The high bit is set when the finger is lifted.
+            if not contact & 0x80:
+                touches.append((contact & 0x7f, x_y & 0xfff, x_y >> 12 | y_high << 4))
+        return touches
+
+
+class HidLayout(object):  # pylint: disable=useless-object-inheritance
+    """Where the fields of the input reports of a pad model are.
+
+    fmt describes the report from its first field, offsets maps the ids of
+    the reports carrying it (USB and Bluetooth) to where the fields start.
+    order picks the PadReport fields out of the unpacked ones.
+    """
+
+    def __init__(self, name, fmt, offsets, order):
+        self.name = name
+        self.struct = struct.Struct(fmt)
+        self.offsets = offsets
+        self._order = itemgetter(*order)
+
+    def accepts(self, report, size):
+        """Whether a raw report of size bytes is an input report with the
+        full state."""
+        offset = self.offsets.get(report[0]) if size else None
+        return offset is not None and offset + self.struct.size <= size
+
+    def decode(self, report):
+        """Get the PadReport of an accepted raw report."""
+        return PadReport(*self._order(
+            self.struct.unpack_from(report, self.offsets[report[0]])))
+
+
+# See struct dualshock4_input_report_common and the touch reports in the
+# kernel's hid-playstation driver: sticks, buttons, triggers, sensor time
+# and temperature, gyro, accelerometer, battery, touch report count and
+# time, then two touch points.
+DUALSHOCK4 = HidLayout(
+    'DualShock 4', '<4B3B2BHb3h3h8xBxBHBBHB', {0x01: 1, 0x11: 3},
+    (0, 1, 2, 3, 7, 8, 4, 5, 6, 11, 12, 13, 14, 15, 16, 9,
+     18, 19, 20, 21, 22, 23))
+
+# See struct dualsense_input_report: sticks, triggers, sequence number,
+# buttons, gyro, accelerometer, sensor time, then two touch points.
+DUALSENSE = HidLayout(
+    'DualSense', '<6BB4B4x3h3hIxBHBBHB', {0x01: 1, 0x31: 2},
+    (0, 1, 2, 3, 4, 5, 7, 8, 9, 11, 12, 13, 14, 15, 16, 17,
+     18, 19, 20, 21, 22, 23))
+
+HID_LAYOUTS = {
+    (SONY_VENDOR_ID, 0x05c4): DUALSHOCK4,
+    (SONY_VENDOR_ID, 0x09cc): DUALSHOCK4,
+    (SONY_VENDOR_ID, 0x0ba0): DUALSHOCK4,  # Wireless adapter.
+    (SONY_VENDOR_ID, 0x0ce6): DUALSENSE,
+    (SONY_VENDOR_ID, 0x0df2): DUALSENSE,  # DualSense Edge.
+}
+
+# (x, y) of the d-pad directions, from up clockwise, then released.
+HAT_DIRECTIONS = (
+    (0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1),
+) + ((0, 0),) * 8
+
+# Event keys of report_values, in order. The buttons are the ones of
+# buttons0 high nibble, buttons1 and the PS button of buttons2, mapped
+# like hid-playstation does.
+REPORT_KEYS = tuple((EV_ABS, code) for code in (
+    0x00, 0x01, 0x03, 0x04,  # ABS_X, ABS_Y, ABS_RX, ABS_RY
+    0x02, 0x05,  # ABS_Z, ABS_RZ
+    0x10, 0x11,  # ABS_HAT0X, ABS_HAT0Y
+)) + tuple((EV_KEY, code) for code in (
+    0x134, 0x130, 0x131, 0x133,  # BTN_WEST, BTN_SOUTH, BTN_EAST, BTN_NORTH
+    0x136, 0x137, 0x138, 0x139,  # BTN_TL, BTN_TR, BTN_TL2, BTN_TR2
+    0x13a, 0x13b, 0x13d, 0x13e,  # BTN_SELECT, BTN_START, BTN_THUMBL, BTN_THUMBR
+    0x13c,  # BTN_MODE
+))
+
+# Bits of each possible button byte, lowest first.
+_BITS = tuple(tuple(byte >> index & 1 for index in range(8)) for byte in range(256))
+
+
+def report_values(report):
+    """Get the values of the REPORT_KEYS of a PadReport, in the ranges of
+    an Xbox pad's evdev node: sticks from -32768 to 32767, triggers from 0
+    to 255."""
+    return (
+        (report.left_x << 8) - 32768, (report.left_y << 8) - 32768,
+        (report.right_x << 8) - 32768, (report.right_y << 8) - 32768,
+        report.left_trigger, report.right_trigger,
+    ) + HAT_DIRECTIONS[report.buttons0 & 0x0f] + _BITS[report.buttons0][4:] + (
+        _BITS[report.buttons1] + _BITS[report.buttons2][:1])
+
+
+_EVENT_STRUCT = struct.Struct(EVENT_FORMAT)
+
+
+def report_records(previous, values, timestamp_ns):
+    """Get the evdev records of the values that changed since the previous
+    ones (all of them when previous is None), ending with a SYN_REPORT.
+    Returns b'' when nothing changed."""
+    if values == previous:
+        return b''
+    tv_sec, tv_usec = divmod(timestamp_ns // 1000, 1000000)
+    pack = _EVENT_STRUCT.pack
+    if previous is None:
+        previous = (None,) * len(values)
+    records = [pack(tv_sec, tv_usec, ev_type, code, value)
+               for (ev_type, code), value, old in zip(REPORT_KEYS, values, previous)
+               if value != old]
+    records.append(pack(tv_sec, tv_usec, EV_SYN, SYN_REPORT, 0))
+    return b''.join(records)
+
+
+def _read_sysfs(path):
+    with open(path) as sysfs_file:
+        return sysfs_file.read().strip()
+
+
+def find_hidraw(char_path, sys_input_dir='/sys/class/input', dev_dir='/dev'):
+    """Get the hidraw node and the HidLayout of the HID device an evdev
+    node belongs to, (None, None) when it is not a known pad.
+
+    sys_input_dir is the DeviceManager's one and dev_dir the parent of
+    its dev_input_dir, so a fake tree can stand in for sysfs and /dev.
+    """
+    input_dir = os.path.join(
+        sys_input_dir, os.path.basename(char_path), 'device')
+    try:
+        model = (int(_read_sysfs(os.path.join(input_dir, 'id', 'vendor')), 16),
+                 int(_read_sysfs(os.path.join(input_dir, 'id', 'product')), 16))
+    except (IOError, OSError, ValueError):
+        return None, None
+    layout = HID_LAYOUTS.get(model)
+    if layout is None:
+        return None, None
+    try:
+        nodes = sorted(os.listdir(os.path.join(input_dir, 'device', 'hidraw')))
+    except OSError:
+        return None, None
+    if not nodes:
+        return None, None
+    return os.path.join(dev_dir, nodes[0]), layout
+
+
+class HidrawReactor(DeviceReactor):
+    """DeviceReactor reading Sony gamepads from their hidraw nodes,
+    Linux-only.
+
+    One input report holds the whole state of the pad, it is decoded with
+    a single unpack, see HidLayout. When several reports are queued, only
+    the last one is decoded. The changes since the previous report are
+    handed to the sink as evdev records, like an Xbox pad's evdev node
+    would send them, stamped with time.monotonic_ns() when read. The first
+    report gives the whole state.
+
+    The last PadReport of each device, with the touchpad and motion
+    fields, is kept, see report().
+
+    No evdev ioctl is sent to the hidraw nodes: the ranges of the values
+    are the ones of the report layout, and each report carries the whole
+    state, so get_abs_info, get_state and get_mt_slots return None.
+
+    The hidraw nodes are only readable by root unless a udev rule allows
+    it, register raises PermissionError otherwise.
+    """
+
+    def __init__(self, input_devices=None):
+        self._layouts = {}
+        self._reports = {}
+        self._values = {}
+        self._buffer = bytearray(HID_REPORT_MAX)
+        super(HidrawReactor, self).__init__(input_devices)
+
+    def register(self, device):
+        """Start watching a gamepad."""
+        if device in self._fds:
+            return
+        fd, layout = self._open(device)
+        self._epoll.register(fd, select.EPOLLIN)
+        self._layouts[fd] = layout
+        self._devices[fd] = device
+        self._fds[device] = fd
+
+    def unregister(self, device):
+        """Stop watching a gamepad and close its descriptor."""
+        fd = self._fds.get(device)
+        self._layouts.pop(fd, None)
+        self._reports.pop(fd, None)
+        self._values.pop(fd, None)
+        super(HidrawReactor, self).unregister(device)
+
+    @staticmethod
+    def _open(device):
+        """Open the hidraw node of a gamepad, return the descriptor and
+        the HidLayout of its reports."""
+        manager = device.manager
+        path, layout = find_hidraw(
+            device.get_char_device_path(), manager.sys_input_dir,
+            os.path.dirname(manager.dev_input_dir))
+        if path is None:
+            raise UnpluggedError("%s has no known hidraw node" % device.name)
+        return _open_nonblocking(path), layout
+
+    def get_abs_info(self, device, code):
+        """The ranges are the report layout's ones. Always None."""
+        return None
+
+    def get_state(self, device, keys):
+        """The next report gives the whole state. Always None."""
+        return None
+
+    def get_mt_slots(self, device, codes, slots):
+        """The touch points are in the reports, see report(). Always
+        None."""
+        return None
+
+    def report(self, device):
+        """Get the last PadReport read from a device, None before the
+        first one."""
+        return self._reports.get(self._fds[device])
+
+    def _read_report(self, fd):
+        """Read every queued report, return the last full state one."""
+        layout = self._layouts[fd]
+        buffer = self._buffer
+        last = None
+        while True:
+            try:
+                size = os.readv(fd, [buffer])
+            except OSError as err:
+                if err.errno == errno.EAGAIN:
+                    return last
+                if err.errno in (errno.ENODEV, errno.EIO):
+                    raise UnpluggedError("The device was unplugged.")
+                raise
+            if not size:
+                raise UnpluggedError("The device was closed.")
+            if layout.accepts(buffer, size):
+                last = bytes(buffer[:size])
+
+    def _read(self, fd):
+        raw = self._read_report(fd)
+        if raw is None:
+            return
+        report = self._layouts[fd].decode(raw)
+        self._reports[fd] = report
+        values = report_values(report)
+        records = report_records(self._values.get(fd), values, time.monotonic_ns())
+        self._values[fd] = values
+        if records:
+            yield records
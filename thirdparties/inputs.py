@@ -45,38 +45,24 @@ from __future__ import division
 import os
 import sys
 import io
-import glob
+import errno
+import select
 import struct
-import platform
 import math
 import time
-import codecs
+import threading
 from warnings import warn
-from itertools import count
+from collections import namedtuple, OrderedDict
+from itertools import chain, count
 from operator import itemgetter
-from multiprocessing import Process, Pipe
 import ctypes
 
 __version__ = "0.5"
 
-WIN = True if platform.system() == 'Windows' else False
-MAC = True if platform.system() == 'Darwin' else False
-NIX = True if platform.system() == 'Linux' else False
-
-if WIN:
-    # pylint: disable=wrong-import-position
-    import ctypes.wintypes
-    DWORD = ctypes.wintypes.DWORD
-    HANDLE = ctypes.wintypes.HANDLE
-    WPARAM = ctypes.wintypes.WPARAM
-    LPARAM = ctypes.wintypes.WPARAM
-    MSG = ctypes.wintypes.MSG
-else:
-    DWORD = ctypes.c_ulong
-    HANDLE = ctypes.c_void_p
-    WPARAM = ctypes.c_ulonglong
-    LPARAM = ctypes.c_ulonglong
-    MSG = ctypes.Structure
+# sys.platform instead of platform.system(), importing platform is slow.
+WIN = sys.platform == 'win32'
+MAC = sys.platform == 'darwin'
+NIX = sys.platform.startswith('linux')
 
 if NIX:
     from fcntl import ioctl
@@ -95,6 +81,53 @@ EVENT_FORMAT = str('llHHi')
 
 EVENT_SIZE = struct.calcsize(EVENT_FORMAT)
 
+# How many events the reactor asks for in each read call.
+READ_BATCH = 64
+
+# Threads reading sysfs files during the device discovery.
+DISCOVERY_WORKERS = 4
+
+# Event types the readers deal with directly.
+EV_SYN = 0x00
+EV_KEY = 0x01
+EV_ABS = 0x03
+EV_MSC = 0x04
+EV_FF = 0x15
+
+# Codes of the EV_SYN events.
+SYN_REPORT = 0x00
+SYN_DROPPED = 0x03
+
+
+# struct ff_effect of a rumble effect: type, id, direction and trigger,
+# replay length and delay, strong and weak magnitudes.
+FF_RUMBLE_EFFECT = struct.Struct('2h6x2h2x2H28x')
+
+# Effects a device is assumed to hold when it does not tell, like the
+# ones emulated by ff-memless.
+FF_DEFAULT_EFFECTS = 16
+
+
+def _open_nonblocking(path):
+    """Open a character device for non-blocking reads."""
+    try:
+        return os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+    except OSError as err:
+        if err.errno in (errno.EACCES, errno.EPERM):
+            raise PermissionError(PERMISSIONS_ERROR_TEXT)
+        if err.errno in (errno.ENOENT, errno.ENODEV):
+            raise UnpluggedError("%s is not connected" % path)
+        raise
+
+
+def event_key(ev_type, code):
+    """Pack an event type and code into one integer.
+
+    Used as the key of the flat event tables, see
+    DeviceManager.get_event_name.
+    """
+    return (ev_type << 16) | code
+
 
 def chunks(raw):
     """Yield successive EVENT_SIZE sized chunks from raw."""
@@ -112,1212 +145,110 @@ else:
         return struct.iter_unpack(EVENT_FORMAT, raw)
 
 
-def convert_timeval(seconds_since_epoch):
-    """Convert time into C style timeval."""
-    frac, whole = math.modf(seconds_since_epoch)
-    microseconds = math.floor(frac * 1000000)
-    seconds = math.floor(whole)
-    return seconds, microseconds
-
-
-SPECIAL_DEVICES = (
-    ("Raspberry Pi Sense HAT Joystick",
-     "/dev/input/by-id/gpio-Raspberry_Pi_Sense_HAT_Joystick-event-kbd"),
-    ("Nintendo Wii Remote",
-     "/dev/input/by-id/bluetooth-Nintendo_Wii_Remote-event-joystick"),
-    ("FT5406 memory based driver",
-     "/dev/input/by-id/gpio-Raspberry_Pi_Touchscreen_Display-event-mouse"),
-)
-
-XINPUT_MAPPING = (
-    (1, 0x11),
-    (2, 0x11),
-    (3, 0x10),
-    (4, 0x10),
-    (5, 0x13a),
-    (6, 0x13b),
-    (7, 0x13d),
-    (8, 0x13e),
-    (9, 0x136),
-    (10, 0x137),
-    (13, 0x130),
-    (14, 0x131),
-    (15, 0x134),
-    (16, 0x133),
-    (17, 0x11),
-    ('l_thumb_x', 0x00),
-    ('l_thumb_y', 0x01),
-    ('left_trigger', 0x02),
-    ('r_thumb_x', 0x03),
-    ('r_thumb_y', 0x04),
-    ('right_trigger', 0x05),
-)
-
-XINPUT_DLL_NAMES = (
-    "XInput1_4.dll",
-    "XInput9_1_0.dll",
-    "XInput1_3.dll",
-    "XInput1_2.dll",
-    "XInput1_1.dll"
-)
-
-XINPUT_ERROR_DEVICE_NOT_CONNECTED = 1167
-XINPUT_ERROR_SUCCESS = 0
-
-XBOX_STYLE_LED_CONTROL = {
-    0: 'off',
-    1: 'all blink, then previous setting',
-    2: '1/top-left blink, then on',
-    3: '2/top-right blink, then on',
-    4: '3/bottom-left blink, then on',
-    5: '4/bottom-right blink, then on',
-    6: '1/top-left on',
-    7: '2/top-right on',
-    8: '3/bottom-left on',
-    9: '4/bottom-right on',
-    10: 'rotate',
-    11: 'blink, based on previous setting',
-    12: 'slow blink, based on previous setting',
-    13: 'rotate with two lights',
-    14: 'persistent slow all blink',
-    15: 'blink once, then previous setting'
-}
+# Names of the fields of an event record, in EVENT_FORMAT order.
+EVENT_FIELDS = ('tv_sec', 'tv_usec', 'type', 'code', 'value')
 
-DEVICE_PROPERTIES = (
-    (0x00, "INPUT_PROP_POINTER"),  # needs a pointer
-    (0x01, "INPUT_PROP_DIRECT"),  # direct input devices
-    (0x02, "INPUT_PROP_BUTTONPAD"),  # has button(s) under pad
-    (0x03, "INPUT_PROP_SEMI_MT"),  # touch rectangle only
-    (0x04, "INPUT_PROP_TOPBUTTONPAD"),  # softbuttons at top of pad
-    (0x05, "INPUT_PROP_POINTING_STICK"),  # is a pointing stick
-    (0x06, "INPUT_PROP_ACCELEROMETER"),  # has accelerometer
-    (0x1f, "INPUT_PROP_MAX"),
-    (0x1f + 1, "INPUT_PROP_CNT"))
-
-EVENT_TYPES = (
-    (0x00, "Sync"),
-    (0x01, "Key"),
-    (0x02, "Relative"),
-    (0x03, "Absolute"),
-    (0x04, "Misc"),
-    (0x05, "Switch"),
-    (0x11, "LED"),
-    (0x12, "Sound"),
-    (0x14, "Repeat"),
-    (0x15, "ForceFeedback"),
-    (0x16, "Power"),
-    (0x17, "ForceFeedbackStatus"),
-    (0x1f, "Max"),
-    (0x1f+1, "Current"))
-
-SYNCHRONIZATION_EVENTS = (
-    (0, "SYN_REPORT"),
-    (1, "SYN_CONFIG"),
-    (2, "SYN_MT_REPORT"),
-    (3, "SYN_DROPPED"),
-    (0xf, "SYN_MAX"),
-    (0xf+1, "SYN_CNT"))
-
-KEYS_AND_BUTTONS = (
-    (0, "KEY_RESERVED"),
-    (1, "KEY_ESC"),
-    (2, "KEY_1"),
-    (3, "KEY_2"),
-    (4, "KEY_3"),
-    (5, "KEY_4"),
-    (6, "KEY_5"),
-    (7, "KEY_6"),
-    (8, "KEY_7"),
-    (9, "KEY_8"),
-    (10, "KEY_9"),
-    (11, "KEY_0"),
-    (12, "KEY_MINUS"),
-    (13, "KEY_EQUAL"),
-    (14, "KEY_BACKSPACE"),
-    (15, "KEY_TAB"),
-    (16, "KEY_Q"),
-    (17, "KEY_W"),
-    (18, "KEY_E"),
-    (19, "KEY_R"),
-    (20, "KEY_T"),
-    (21, "KEY_Y"),
-    (22, "KEY_U"),
-    (23, "KEY_I"),
-    (24, "KEY_O"),
-    (25, "KEY_P"),
-    (26, "KEY_LEFTBRACE"),
-    (27, "KEY_RIGHTBRACE"),
-    (28, "KEY_ENTER"),
-    (29, "KEY_LEFTCTRL"),
-    (30, "KEY_A"),
-    (31, "KEY_S"),
-    (32, "KEY_D"),
-    (33, "KEY_F"),
-    (34, "KEY_G"),
-    (35, "KEY_H"),
-    (36, "KEY_J"),
-    (37, "KEY_K"),
-    (38, "KEY_L"),
-    (39, "KEY_SEMICOLON"),
-    (40, "KEY_APOSTROPHE"),
-    (41, "KEY_GRAVE"),
-    (42, "KEY_LEFTSHIFT"),
-    (43, "KEY_BACKSLASH"),
-    (44, "KEY_Z"),
-    (45, "KEY_X"),
-    (46, "KEY_C"),
-    (47, "KEY_V"),
-    (48, "KEY_B"),
-    (49, "KEY_N"),
-    (50, "KEY_M"),
-    (51, "KEY_COMMA"),
-    (52, "KEY_DOT"),
-    (53, "KEY_SLASH"),
-    (54, "KEY_RIGHTSHIFT"),
-    (55, "KEY_KPASTERISK"),
-    (56, "KEY_LEFTALT"),
-    (57, "KEY_SPACE"),
-    (58, "KEY_CAPSLOCK"),
-    (59, "KEY_F1"),
-    (60, "KEY_F2"),
-    (61, "KEY_F3"),
-    (62, "KEY_F4"),
-    (63, "KEY_F5"),
-    (64, "KEY_F6"),
-    (65, "KEY_F7"),
-    (66, "KEY_F8"),
-    (67, "KEY_F9"),
-    (68, "KEY_F10"),
-    (69, "KEY_NUMLOCK"),
-    (70, "KEY_SCROLLLOCK"),
-    (71, "KEY_KP7"),
-    (72, "KEY_KP8"),
-    (73, "KEY_KP9"),
-    (74, "KEY_KPMINUS"),
-    (75, "KEY_KP4"),
-    (76, "KEY_KP5"),
-    (77, "KEY_KP6"),
-    (78, "KEY_KPPLUS"),
-    (79, "KEY_KP1"),
-    (80, "KEY_KP2"),
-    (81, "KEY_KP3"),
-    (82, "KEY_KP0"),
-    (83, "KEY_KPDOT"),
-    (85, "KEY_ZENKAKUHANKAKU"),
-    (86, "KEY_102ND"),
-    (87, "KEY_F11"),
-    (88, "KEY_F12"),
-    (89, "KEY_RO"),
-    (90, "KEY_KATAKANA"),
-    (91, "KEY_HIRAGANA"),
-    (92, "KEY_HENKAN"),
-    (93, "KEY_KATAKANAHIRAGANA"),
-    (94, "KEY_MUHENKAN"),
-    (95, "KEY_KPJPCOMMA"),
-    (96, "KEY_KPENTER"),
-    (97, "KEY_RIGHTCTRL"),
-    (98, "KEY_KPSLASH"),
-    (99, "KEY_SYSRQ"),
-    (100, "KEY_RIGHTALT"),
-    (101, "KEY_LINEFEED"),
-    (102, "KEY_HOME"),
-    (103, "KEY_UP"),
-    (104, "KEY_PAGEUP"),
-    (105, "KEY_LEFT"),
-    (106, "KEY_RIGHT"),
-    (107, "KEY_END"),
-    (108, "KEY_DOWN"),
-    (109, "KEY_PAGEDOWN"),
-    (110, "KEY_INSERT"),
-    (111, "KEY_DELETE"),
-    (112, "KEY_MACRO"),
-    (113, "KEY_MUTE"),
-    (114, "KEY_VOLUMEDOWN"),
-    (115, "KEY_VOLUMEUP"),
-    (116, "KEY_POWER"),  # SC System Power Down
-    (117, "KEY_KPEQUAL"),
-    (118, "KEY_KPPLUSMINUS"),
-    (119, "KEY_PAUSE"),
-    (120, "KEY_SCALE"),  # AL Compiz Scale (Expose)
-    (121, "KEY_KPCOMMA"),
-    (122, "KEY_HANGEUL"),
-    (123, "KEY_HANJA"),
-    (124, "KEY_YEN"),
-    (125, "KEY_LEFTMETA"),
-    (126, "KEY_RIGHTMETA"),
-    (127, "KEY_COMPOSE"),
-    (128, "KEY_STOP"),  # AC Stop
-    (129, "KEY_AGAIN"),
-    (130, "KEY_PROPS"),  # AC Properties
-    (131, "KEY_UNDO"),  # AC Undo
-    (132, "KEY_FRONT"),
-    (133, "KEY_COPY"),  # AC Copy
-    (134, "KEY_OPEN"),  # AC Open
-    (135, "KEY_PASTE"),  # AC Paste
-    (136, "KEY_FIND"),  # AC Search
-    (137, "KEY_CUT"),  # AC Cut
-    (138, "KEY_HELP"),  # AL Integrated Help Center
-    (139, "KEY_MENU"),  # Menu (show menu)
-    (140, "KEY_CALC"),  # AL Calculator
-    (141, "KEY_SETUP"),
-    (142, "KEY_SLEEP"),  # SC System Sleep
-    (143, "KEY_WAKEUP"),  # System Wake Up
-    (144, "KEY_FILE"),  # AL Local Machine Browser
-    (145, "KEY_SENDFILE"),
-    (146, "KEY_DELETEFILE"),
-    (147, "KEY_XFER"),
-    (148, "KEY_PROG1"),
-    (149, "KEY_PROG2"),
-    (150, "KEY_WWW"),  # AL Internet Browser
-    (151, "KEY_MSDOS"),
-    (152, "KEY_COFFEE"),  # AL Terminal Lock/Screensaver
-    (153, "KEY_ROTATE_DISPLAY"),  # Display orientation for e.g. tablets
-    (154, "KEY_CYCLEWINDOWS"),
-    (155, "KEY_MAIL"),
-    (156, "KEY_BOOKMARKS"),  # AC Bookmarks
-    (157, "KEY_COMPUTER"),
-    (158, "KEY_BACK"),  # AC Back
-    (159, "KEY_FORWARD"),  # AC Forward
-    (160, "KEY_CLOSECD"),
-    (161, "KEY_EJECTCD"),
-    (162, "KEY_EJECTCLOSECD"),
-    (163, "KEY_NEXTSONG"),
-    (164, "KEY_PLAYPAUSE"),
-    (165, "KEY_PREVIOUSSONG"),
-    (166, "KEY_STOPCD"),
-    (167, "KEY_RECORD"),
-    (168, "KEY_REWIND"),
-    (169, "KEY_PHONE"),  # Media Select Telephone
-    (170, "KEY_ISO"),
-    (171, "KEY_CONFIG"),  # AL Consumer Control Configuration
-    (172, "KEY_HOMEPAGE"),  # AC Home
-    (173, "KEY_REFRESH"),  # AC Refresh
-    (174, "KEY_EXIT"),  # AC Exit
-    (175, "KEY_MOVE"),
-    (176, "KEY_EDIT"),
-    (177, "KEY_SCROLLUP"),
-    (178, "KEY_SCROLLDOWN"),
-    (179, "KEY_KPLEFTPAREN"),
-    (180, "KEY_KPRIGHTPAREN"),
-    (181, "KEY_NEW"),  # AC New
-    (182, "KEY_REDO"),  # AC Redo/Repeat
-    (183, "KEY_F13"),
-    (184, "KEY_F14"),
-    (185, "KEY_F15"),
-    (186, "KEY_F16"),
-    (187, "KEY_F17"),
-    (188, "KEY_F18"),
-    (189, "KEY_F19"),
-    (190, "KEY_F20"),
-    (191, "KEY_F21"),
-    (192, "KEY_F22"),
-    (193, "KEY_F23"),
-    (194, "KEY_F24"),
-    (200, "KEY_PLAYCD"),
-    (201, "KEY_PAUSECD"),
-    (202, "KEY_PROG3"),
-    (203, "KEY_PROG4"),
-    (204, "KEY_DASHBOARD"),  # AL Dashboard
-    (205, "KEY_SUSPEND"),
-    (206, "KEY_CLOSE"),  # AC Close
-    (207, "KEY_PLAY"),
-    (208, "KEY_FASTFORWARD"),
-    (209, "KEY_BASSBOOST"),
-    (210, "KEY_PRINT"),  # AC Print
-    (211, "KEY_HP"),
-    (212, "KEY_CAMERA"),
-    (213, "KEY_SOUND"),
-    (214, "KEY_QUESTION"),
-    (215, "KEY_EMAIL"),
-    (216, "KEY_CHAT"),
-    (217, "KEY_SEARCH"),
-    (218, "KEY_CONNECT"),
-    (219, "KEY_FINANCE"),  # AL Checkbook/Finance
-    (220, "KEY_SPORT"),
-    (221, "KEY_SHOP"),
-    (222, "KEY_ALTERASE"),
-    (223, "KEY_CANCEL"),  # AC Cancel
-    (224, "KEY_BRIGHTNESSDOWN"),
-    (225, "KEY_BRIGHTNESSUP"),
-    (226, "KEY_MEDIA"),
-    (227, "KEY_SWITCHVIDEOMODE"),  # Cycle between available video
-    (228, "KEY_KBDILLUMTOGGLE"),
-    (229, "KEY_KBDILLUMDOWN"),
-    (230, "KEY_KBDILLUMUP"),
-    (231, "KEY_SEND"),  # AC Send
-    (232, "KEY_REPLY"),  # AC Reply
-    (233, "KEY_FORWARDMAIL"),  # AC Forward Msg
-    (234, "KEY_SAVE"),  # AC Save
-    (235, "KEY_DOCUMENTS"),
-    (236, "KEY_BATTERY"),
-    (237, "KEY_BLUETOOTH"),
-    (238, "KEY_WLAN"),
-    (239, "KEY_UWB"),
-    (240, "KEY_UNKNOWN"),
-    (241, "KEY_VIDEO_NEXT"),  # drive next video source
-    (242, "KEY_VIDEO_PREV"),  # drive previous video source
-    (243, "KEY_BRIGHTNESS_CYCLE"),  # brightness up, after max is min
-    (244, "KEY_BRIGHTNESS_AUTO"),  # Set Auto Brightness: manual
-    (245, "KEY_DISPLAY_OFF"),  # display device to off state
-    (246, "KEY_WWAN"),  # Wireless WAN (LTE, UMTS, GSM, etc.)
-    (247, "KEY_RFKILL"),  # Key that controls all radios
-    (248, "KEY_MICMUTE"),  # Mute / unmute the microphone
-    (0x100, "BTN_MISC"),
-    (0x100, "BTN_0"),
-    (0x101, "BTN_1"),
-    (0x102, "BTN_2"),
-    (0x103, "BTN_3"),
-    (0x104, "BTN_4"),
-    (0x105, "BTN_5"),
-    (0x106, "BTN_6"),
-    (0x107, "BTN_7"),
-    (0x108, "BTN_8"),
-    (0x109, "BTN_9"),
-    (0x110, "BTN_MOUSE"),
-    (0x110, "BTN_LEFT"),
-    (0x111, "BTN_RIGHT"),
-    (0x112, "BTN_MIDDLE"),
-    (0x113, "BTN_SIDE"),
-    (0x114, "BTN_EXTRA"),
-    (0x115, "BTN_FORWARD"),
-    (0x116, "BTN_BACK"),
-    (0x117, "BTN_TASK"),
-    (0x120, "BTN_JOYSTICK"),
-    (0x120, "BTN_TRIGGER"),
-    (0x121, "BTN_THUMB"),
-    (0x122, "BTN_THUMB2"),
-    (0x123, "BTN_TOP"),
-    (0x124, "BTN_TOP2"),
-    (0x125, "BTN_PINKIE"),
-    (0x126, "BTN_BASE"),
-    (0x127, "BTN_BASE2"),
-    (0x128, "BTN_BASE3"),
-    (0x129, "BTN_BASE4"),
-    (0x12a, "BTN_BASE5"),
-    (0x12b, "BTN_BASE6"),
-    (0x12f, "BTN_DEAD"),
-    (0x130, "BTN_GAMEPAD"),
-    (0x130, "BTN_SOUTH"),
-    (0x131, "BTN_EAST"),
-    (0x132, "BTN_C"),
-    (0x133, "BTN_NORTH"),
-    (0x134, "BTN_WEST"),
-    (0x135, "BTN_Z"),
-    (0x136, "BTN_TL"),
-    (0x137, "BTN_TR"),
-    (0x138, "BTN_TL2"),
-    (0x139, "BTN_TR2"),
-    (0x13a, "BTN_SELECT"),
-    (0x13b, "BTN_START"),
-    (0x13c, "BTN_MODE"),
-    (0x13d, "BTN_THUMBL"),
-    (0x13e, "BTN_THUMBR"),
-    (0x140, "BTN_DIGI"),
-    (0x140, "BTN_TOOL_PEN"),
-    (0x141, "BTN_TOOL_RUBBER"),
-    (0x142, "BTN_TOOL_BRUSH"),
-    (0x143, "BTN_TOOL_PENCIL"),
-    (0x144, "BTN_TOOL_AIRBRUSH"),
-    (0x145, "BTN_TOOL_FINGER"),
-    (0x146, "BTN_TOOL_MOUSE"),
-    (0x147, "BTN_TOOL_LENS"),
-    (0x148, "BTN_TOOL_QUINTTAP"),  # Five fingers on trackpad
-    (0x14a, "BTN_TOUCH"),
-    (0x14b, "BTN_STYLUS"),
-    (0x14c, "BTN_STYLUS2"),
-    (0x14d, "BTN_TOOL_DOUBLETAP"),
-    (0x14e, "BTN_TOOL_TRIPLETAP"),
-    (0x14f, "BTN_TOOL_QUADTAP"),  # Four fingers on trackpad
-    (0x150, "BTN_WHEEL"),
-    (0x150, "BTN_GEAR_DOWN"),
-    (0x151, "BTN_GEAR_UP"),
-    (0x160, "KEY_OK"),
-    (0x161, "KEY_SELECT"),
-    (0x162, "KEY_GOTO"),
-    (0x163, "KEY_CLEAR"),
-    (0x164, "KEY_POWER2"),
-    (0x165, "KEY_OPTION"),
-    (0x166, "KEY_INFO"),  # AL OEM Features/Tips/Tutorial
-    (0x167, "KEY_TIME"),
-    (0x168, "KEY_VENDOR"),
-    (0x169, "KEY_ARCHIVE"),
-    (0x16a, "KEY_PROGRAM"),  # Media Select Program Guide
-    (0x16b, "KEY_CHANNEL"),
-    (0x16c, "KEY_FAVORITES"),
-    (0x16d, "KEY_EPG"),
-    (0x16e, "KEY_PVR"),  # Media Select Home
-    (0x16f, "KEY_MHP"),
-    (0x170, "KEY_LANGUAGE"),
-    (0x171, "KEY_TITLE"),
-    (0x172, "KEY_SUBTITLE"),
-    (0x173, "KEY_ANGLE"),
-    (0x174, "KEY_ZOOM"),
-    (0x175, "KEY_MODE"),
-    (0x176, "KEY_KEYBOARD"),
-    (0x177, "KEY_SCREEN"),
-    (0x178, "KEY_PC"),  # Media Select Computer
-    (0x179, "KEY_TV"),  # Media Select TV
-    (0x17a, "KEY_TV2"),  # Media Select Cable
-    (0x17b, "KEY_VCR"),  # Media Select VCR
-    (0x17c, "KEY_VCR2"),  # VCR Plus
-    (0x17d, "KEY_SAT"),  # Media Select Satellite
-    (0x17e, "KEY_SAT2"),
-    (0x17f, "KEY_CD"),  # Media Select CD
-    (0x180, "KEY_TAPE"),  # Media Select Tape
-    (0x181, "KEY_RADIO"),
-    (0x182, "KEY_TUNER"),  # Media Select Tuner
-    (0x183, "KEY_PLAYER"),
-    (0x184, "KEY_TEXT"),
-    (0x185, "KEY_DVD"),  # Media Select DVD
-    (0x186, "KEY_AUX"),
-    (0x187, "KEY_MP3"),
-    (0x188, "KEY_AUDIO"),  # AL Audio Browser
-    (0x189, "KEY_VIDEO"),  # AL Movie Browser
-    (0x18a, "KEY_DIRECTORY"),
-    (0x18b, "KEY_LIST"),
-    (0x18c, "KEY_MEMO"),  # Media Select Messages
-    (0x18d, "KEY_CALENDAR"),
-    (0x18e, "KEY_RED"),
-    (0x18f, "KEY_GREEN"),
-    (0x190, "KEY_YELLOW"),
-    (0x191, "KEY_BLUE"),
-    (0x192, "KEY_CHANNELUP"),  # Channel Increment
-    (0x193, "KEY_CHANNELDOWN"),  # Channel Decrement
-    (0x194, "KEY_FIRST"),
-    (0x195, "KEY_LAST"),  # Recall Last
-    (0x196, "KEY_AB"),
-    (0x197, "KEY_NEXT"),
-    (0x198, "KEY_RESTART"),
-    (0x199, "KEY_SLOW"),
-    (0x19a, "KEY_SHUFFLE"),
-    (0x19b, "KEY_BREAK"),
-    (0x19c, "KEY_PREVIOUS"),
-    (0x19d, "KEY_DIGITS"),
-    (0x19e, "KEY_TEEN"),
-    (0x19f, "KEY_TWEN"),
-    (0x1a0, "KEY_VIDEOPHONE"),  # Media Select Video Phone
-    (0x1a1, "KEY_GAMES"),  # Media Select Games
-    (0x1a2, "KEY_ZOOMIN"),  # AC Zoom In
-    (0x1a3, "KEY_ZOOMOUT"),  # AC Zoom Out
-    (0x1a4, "KEY_ZOOMRESET"),  # AC Zoom
-    (0x1a5, "KEY_WORDPROCESSOR"),  # AL Word Processor
-    (0x1a6, "KEY_EDITOR"),  # AL Text Editor
-    (0x1a7, "KEY_SPREADSHEET"),  # AL Spreadsheet
-    (0x1a8, "KEY_GRAPHICSEDITOR"),  # AL Graphics Editor
-    (0x1a9, "KEY_PRESENTATION"),  # AL Presentation App
-    (0x1aa, "KEY_DATABASE"),  # AL Database App
-    (0x1ab, "KEY_NEWS"),  # AL Newsreader
-    (0x1ac, "KEY_VOICEMAIL"),  # AL Voicemail
-    (0x1ad, "KEY_ADDRESSBOOK"),  # AL Contacts/Address Book
-    (0x1ae, "KEY_MESSENGER"),  # AL Instant Messaging
-    (0x1af, "KEY_DISPLAYTOGGLE"),  # Turn display (LCD) on and off
-    (0x1b0, "KEY_SPELLCHECK"),  # AL Spell Check
-    (0x1b1, "KEY_LOGOFF"),  # AL Logoff
-    (0x1b2, "KEY_DOLLAR"),
-    (0x1b3, "KEY_EURO"),
-    (0x1b4, "KEY_FRAMEBACK"),  # Consumer - transport controls
-    (0x1b5, "KEY_FRAMEFORWARD"),
-    (0x1b6, "KEY_CONTEXT_MENU"),  # GenDesc - system context menu
-    (0x1b7, "KEY_MEDIA_REPEAT"),  # Consumer - transport control
-    (0x1b8, "KEY_10CHANNELSUP"),  # 10 channels up (10+)
-    (0x1b9, "KEY_10CHANNELSDOWN"),  # 10 channels down (10-)
-    (0x1ba, "KEY_IMAGES"),  # AL Image Browser
-    (0x1c0, "KEY_DEL_EOL"),
-    (0x1c1, "KEY_DEL_EOS"),
-    (0x1c2, "KEY_INS_LINE"),
-    (0x1c3, "KEY_DEL_LINE"),
-    (0x1d0, "KEY_FN"),
-    (0x1d1, "KEY_FN_ESC"),
-    (0x1d2, "KEY_FN_F1"),
-    (0x1d3, "KEY_FN_F2"),
-    (0x1d4, "KEY_FN_F3"),
-    (0x1d5, "KEY_FN_F4"),
-    (0x1d6, "KEY_FN_F5"),
-    (0x1d7, "KEY_FN_F6"),
-    (0x1d8, "KEY_FN_F7"),
-    (0x1d9, "KEY_FN_F8"),
-    (0x1da, "KEY_FN_F9"),
-    (0x1db, "KEY_FN_F10"),
-    (0x1dc, "KEY_FN_F11"),
-    (0x1dd, "KEY_FN_F12"),
-    (0x1de, "KEY_FN_1"),
-    (0x1df, "KEY_FN_2"),
-    (0x1e0, "KEY_FN_D"),
-    (0x1e1, "KEY_FN_E"),
-    (0x1e2, "KEY_FN_F"),
-    (0x1e3, "KEY_FN_S"),
-    (0x1e4, "KEY_FN_B"),
-    (0x1f1, "KEY_BRL_DOT1"),
-    (0x1f2, "KEY_BRL_DOT2"),
-    (0x1f3, "KEY_BRL_DOT3"),
-    (0x1f4, "KEY_BRL_DOT4"),
-    (0x1f5, "KEY_BRL_DOT5"),
-    (0x1f6, "KEY_BRL_DOT6"),
-    (0x1f7, "KEY_BRL_DOT7"),
-    (0x1f8, "KEY_BRL_DOT8"),
-    (0x1f9, "KEY_BRL_DOT9"),
-    (0x1fa, "KEY_BRL_DOT10"),
-    (0x200, "KEY_NUMERIC_0"),  # used by phones, remote controls,
-    (0x201, "KEY_NUMERIC_1"),  # and other keypads
-    (0x202, "KEY_NUMERIC_2"),
-    (0x203, "KEY_NUMERIC_3"),
-    (0x204, "KEY_NUMERIC_4"),
-    (0x205, "KEY_NUMERIC_5"),
-    (0x206, "KEY_NUMERIC_6"),
-    (0x207, "KEY_NUMERIC_7"),
-    (0x208, "KEY_NUMERIC_8"),
-    (0x209, "KEY_NUMERIC_9"),
-    (0x20a, "KEY_NUMERIC_STAR"),
-    (0x20b, "KEY_NUMERIC_POUND"),
-    (0x20c, "KEY_NUMERIC_A"),  # Phone key A - HUT Telephony 0xb9
-    (0x20d, "KEY_NUMERIC_B"),
-    (0x20e, "KEY_NUMERIC_C"),
-    (0x20f, "KEY_NUMERIC_D"),
-    (0x210, "KEY_CAMERA_FOCUS"),
-    (0x211, "KEY_WPS_BUTTON"),  # WiFi Protected Setup key
-    (0x212, "KEY_TOUCHPAD_TOGGLE"),  # Request switch touchpad on or off
-    (0x213, "KEY_TOUCHPAD_ON"),
-    (0x214, "KEY_TOUCHPAD_OFF"),
-    (0x215, "KEY_CAMERA_ZOOMIN"),
-    (0x216, "KEY_CAMERA_ZOOMOUT"),
-    (0x217, "KEY_CAMERA_UP"),
-    (0x218, "KEY_CAMERA_DOWN"),
-    (0x219, "KEY_CAMERA_LEFT"),
-    (0x21a, "KEY_CAMERA_RIGHT"),
-    (0x21b, "KEY_ATTENDANT_ON"),
-    (0x21c, "KEY_ATTENDANT_OFF"),
-    (0x21d, "KEY_ATTENDANT_TOGGLE"),  # Attendant call on or off
-    (0x21e, "KEY_LIGHTS_TOGGLE"),  # Reading light on or off
-    (0x220, "BTN_DPAD_UP"),
-    (0x221, "BTN_DPAD_DOWN"),
-    (0x222, "BTN_DPAD_LEFT"),
-    (0x223, "BTN_DPAD_RIGHT"),
-    (0x230, "KEY_ALS_TOGGLE"),  # Ambient light sensor
-    (0x240, "KEY_BUTTONCONFIG"),  # AL Button Configuration
-    (0x241, "KEY_TASKMANAGER"),  # AL Task/Project Manager
-    (0x242, "KEY_JOURNAL"),  # AL Log/Journal/Timecard
-    (0x243, "KEY_CONTROLPANEL"),  # AL Control Panel
-    (0x244, "KEY_APPSELECT"),  # AL Select Task/Application
-    (0x245, "KEY_SCREENSAVER"),  # AL Screen Saver
-    (0x246, "KEY_VOICECOMMAND"),  # Listening Voice Command
-    (0x250, "KEY_BRIGHTNESS_MIN"),  # Set Brightness to Minimum
-    (0x251, "KEY_BRIGHTNESS_MAX"),  # Set Brightness to Maximum
-    (0x260, "KEY_KBDINPUTASSIST_PREV"),
-    (0x261, "KEY_KBDINPUTASSIST_NEXT"),
-    (0x262, "KEY_KBDINPUTASSIST_PREVGROUP"),
-    (0x263, "KEY_KBDINPUTASSIST_NEXTGROUP"),
-    (0x264, "KEY_KBDINPUTASSIST_ACCEPT"),
-    (0x265, "KEY_KBDINPUTASSIST_CANCEL"),
-    (0x2c0, "BTN_TRIGGER_HAPPY"),
-    (0x2c0, "BTN_TRIGGER_HAPPY1"),
-    (0x2c1, "BTN_TRIGGER_HAPPY2"),
-    (0x2c2, "BTN_TRIGGER_HAPPY3"),
-    (0x2c3, "BTN_TRIGGER_HAPPY4"),
-    (0x2c4, "BTN_TRIGGER_HAPPY5"),
-    (0x2c5, "BTN_TRIGGER_HAPPY6"),
-    (0x2c6, "BTN_TRIGGER_HAPPY7"),
-    (0x2c7, "BTN_TRIGGER_HAPPY8"),
-    (0x2c8, "BTN_TRIGGER_HAPPY9"),
-    (0x2c9, "BTN_TRIGGER_HAPPY10"),
-    (0x2ca, "BTN_TRIGGER_HAPPY11"),
-    (0x2cb, "BTN_TRIGGER_HAPPY12"),
-    (0x2cc, "BTN_TRIGGER_HAPPY13"),
-    (0x2cd, "BTN_TRIGGER_HAPPY14"),
-    (0x2ce, "BTN_TRIGGER_HAPPY15"),
-    (0x2cf, "BTN_TRIGGER_HAPPY16"),
-    (0x2d0, "BTN_TRIGGER_HAPPY17"),
-    (0x2d1, "BTN_TRIGGER_HAPPY18"),
-    (0x2d2, "BTN_TRIGGER_HAPPY19"),
-    (0x2d3, "BTN_TRIGGER_HAPPY20"),
-    (0x2d4, "BTN_TRIGGER_HAPPY21"),
-    (0x2d5, "BTN_TRIGGER_HAPPY22"),
-    (0x2d6, "BTN_TRIGGER_HAPPY23"),
-    (0x2d7, "BTN_TRIGGER_HAPPY24"),
-    (0x2d8, "BTN_TRIGGER_HAPPY25"),
-    (0x2d9, "BTN_TRIGGER_HAPPY26"),
-    (0x2da, "BTN_TRIGGER_HAPPY27"),
-    (0x2db, "BTN_TRIGGER_HAPPY28"),
-    (0x2dc, "BTN_TRIGGER_HAPPY29"),
-    (0x2dd, "BTN_TRIGGER_HAPPY30"),
-    (0x2de, "BTN_TRIGGER_HAPPY31"),
-    (0x2df, "BTN_TRIGGER_HAPPY32"),
-    (0x2e0, "BTN_TRIGGER_HAPPY33"),
-    (0x2e1, "BTN_TRIGGER_HAPPY34"),
-    (0x2e2, "BTN_TRIGGER_HAPPY35"),
-    (0x2e3, "BTN_TRIGGER_HAPPY36"),
-    (0x2e4, "BTN_TRIGGER_HAPPY37"),
-    (0x2e5, "BTN_TRIGGER_HAPPY38"),
-    (0x2e6, "BTN_TRIGGER_HAPPY39"),
-    (0x2e7, "BTN_TRIGGER_HAPPY40"),
-    (0x2ff, "KEY_MAX"),
-    (0x2ff+1, "KEY_CNT"))
-
-RELATIVE_AXES = (
-    (0x00, "REL_X"),
-    (0x01, "REL_Y"),
-    (0x02, "REL_Z"),
-    (0x03, "REL_RX"),
-    (0x04, "REL_RY"),
-    (0x05, "REL_RZ"),
-    (0x06, "REL_HWHEEL"),
-    (0x07, "REL_DIAL"),
-    (0x08, "REL_WHEEL"),
-    (0x09, "REL_MISC"),
-    (0x0f, "REL_MAX"),
-    (0x0f+1, "REL_CNT"))
-
-ABSOLUTE_AXES = (
-    (0x00, "ABS_X"),
-    (0x01, "ABS_Y"),
-    (0x02, "ABS_Z"),
-    (0x03, "ABS_RX"),
-    (0x04, "ABS_RY"),
-    (0x05, "ABS_RZ"),
-    (0x06, "ABS_THROTTLE"),
-    (0x07, "ABS_RUDDER"),
-    (0x08, "ABS_WHEEL"),
-    (0x09, "ABS_GAS"),
-    (0x0a, "ABS_BRAKE"),
-    (0x10, "ABS_HAT0X"),
-    (0x11, "ABS_HAT0Y"),
-    (0x12, "ABS_HAT1X"),
-    (0x13, "ABS_HAT1Y"),
-    (0x14, "ABS_HAT2X"),
-    (0x15, "ABS_HAT2Y"),
-    (0x16, "ABS_HAT3X"),
-    (0x17, "ABS_HAT3Y"),
-    (0x18, "ABS_PRESSURE"),
-    (0x19, "ABS_DISTANCE"),
-    (0x1a, "ABS_TILT_X"),
-    (0x1b, "ABS_TILT_Y"),
-    (0x1c, "ABS_TOOL_WIDTH"),
-    (0x20, "ABS_VOLUME"),
-    (0x28, "ABS_MISC"),
-    (0x2f, "ABS_MT_SLOT"),  # MT slot being modified
-    (0x30, "ABS_MT_TOUCH_MAJOR"),  # Major axis of touching ellipse
-    (0x31, "ABS_MT_TOUCH_MINOR"),  # Minor axis (omit if circular)
-    (0x32, "ABS_MT_WIDTH_MAJOR"),  # Major axis of approaching ellipse
-    (0x33, "ABS_MT_WIDTH_MINOR"),  # Minor axis (omit if circular)
-    (0x34, "ABS_MT_ORIENTATION"),  # Ellipse orientation
-    (0x35, "ABS_MT_POSITION_X"),  # Center X touch position
-    (0x36, "ABS_MT_POSITION_Y"),  # Center Y touch position
-    (0x37, "ABS_MT_TOOL_TYPE"),  # Type of touching device
-    (0x38, "ABS_MT_BLOB_ID"),  # Group a set of packets as a blob
-    (0x39, "ABS_MT_TRACKING_ID"),  # Unique ID of initiated contact
-    (0x3a, "ABS_MT_PRESSURE"),  # Pressure on contact area
-    (0x3b, "ABS_MT_DISTANCE"),  # Contact hover distance
-    (0x3c, "ABS_MT_TOOL_X"),  # Center X tool position
-    (0x3d, "ABS_MT_TOOL_Y"),  # Center Y tool position
-    (0x3f, "ABS_MAX"),
-    (0x3f+1, "ABS_CNT"))
-
-SWITCH_EVENTS = (
-    (0x00, "SW_LID"),  # set = lid shut
-    (0x01, "SW_TABLET_MODE"),  # set = tablet mode
-    (0x02, "SW_HEADPHONE_INSERT"),  # set = inserted
-    (0x03, "SW_RFKILL_ALL"),  # rfkill master switch, type "any"
-    (0x04, "SW_MICROPHONE_INSERT"),  # set = inserted
-    (0x05, "SW_DOCK"),  # set = plugged into dock
-    (0x06, "SW_LINEOUT_INSERT"),  # set = inserted
-    (0x07, "SW_JACK_PHYSICAL_INSERT"),  # set = mechanical switch set
-    (0x08, "SW_VIDEOOUT_INSERT"),  # set = inserted
-    (0x09, "SW_CAMERA_LENS_COVER"),  # set = lens covered
-    (0x0a, "SW_KEYPAD_SLIDE"),  # set = keypad slide out
-    (0x0b, "SW_FRONT_PROXIMITY"),  # set = front proximity sensor active
-    (0x0c, "SW_ROTATE_LOCK"),  # set = rotate locked/disabled
-    (0x0d, "SW_LINEIN_INSERT"),  # set = inserted
-    (0x0e, "SW_MUTE_DEVICE"),  # set = device disabled
-    (0x0f, "SW_MAX"),
-    (0x0f+1, "SW_CNT"))
-
-MISC_EVENTS = (
-    (0x00, "MSC_SERIAL"),
-    (0x01, "MSC_PULSELED"),
-    (0x02, "MSC_GESTURE"),
-    (0x03, "MSC_RAW"),
-    (0x04, "MSC_SCAN"),
-    (0x05, "MSC_TIMESTAMP"),
-    (0x07, "MSC_MAX"),
-    (0x07+1, "MSC_CNT"))
-
-LEDS = (
-    (0x00, "LED_NUML"),
-    (0x01, "LED_CAPSL"),
-    (0x02, "LED_SCROLLL"),
-    (0x03, "LED_COMPOSE"),
-    (0x04, "LED_KANA"),
-    (0x05, "LED_SLEEP"),
-    (0x06, "LED_SUSPEND"),
-    (0x07, "LED_MUTE"),
-    (0x08, "LED_MISC"),
-    (0x09, "LED_MAIL"),
-    (0x0a, "LED_CHARGING"),
-    (0x0f, "LED_MAX"),
-    (0x0f+1, "LED_CNT"))
-
-LED_TYPE_CODES = (
-    ('numlock', 0x00),
-    ('capslock', 0x01),
-    ('scrolllock', 0x02),
-    ('compose', 0x03),
-    ('kana', 0x04),
-    ('sleep', 0x05),
-    ('suspend', 0x06),
-    ('mute', 0x07),
-    ('misc', 0x08),
-    ('mail', 0x09),
-    ('charging', 0x0a),
-    ('max', 0x0f),
-    ('cnt', 0x0f+1)
-)
+_EVENT_DTYPE = None
 
-AUTOREPEAT_VALUES = (
-    (0x00, "REP_DELAY"),
-    (0x01, "REP_PERIOD"),
-    (0x01, "REP_MAX"),
-    (0x01+1, "REP_CNT"))
-
-SOUNDS = (
-    (0x00, "SND_CLICK"),
-    (0x01, "SND_BELL"),
-    (0x02, "SND_TONE"),
-    (0x07, "SND_MAX"),
-    (0x07+1, "SND_CNT"))
-
-WIN_KEYBOARD_CODES = {
-    0x0100: 1,
-    0x0101: 0,
-    0x104: 1,
-    0x105: 0,
-}
 
-WIN_MOUSE_CODES = {
-    0x0201: (0x110, 1, 589825),   # WM_LBUTTONDOWN --> BTN_LEFT
-    0x0202: (0x110, 0, 589825),   # WM_LBUTTONUP   --> BTN_LEFT
-    0x0204: (0x111, 1, 589826),   # WM_RBUTTONDOWN --> BTN_RIGHT
-    0x0205: (0x111, 0, 589826),   # WM_RBUTTONUP   --> BTN_RIGHT
-    0x0207: (0x112, 1, 589827),   # WM_MBUTTONDOWN --> BTN_MIDDLE
-    0x0208: (0x112, 0, 589827),   # WM_MBUTTONU    --> BTN_MIDDLE
-    0x020B: (0x113, 1, 589828),   # WM_XBUTTONDOWN --> BTN_SIDE
-    0x020C: (0x113, 0, 589828),   # WM_XBUTTONUP   --> BTN_SIDE
-    0x020B2: (0x114, 1, 589829),  # WM_XBUTTONDOWN --> BTN_EXTRA
-    0x020C2: (0x114, 0, 589829),  # WM_XBUTTONUP   --> BTN_EXTRA
-}
+def event_dtype():
+    """Get the NumPy structured dtype matching EVENT_FORMAT.
 
-# THING SING That thing can sing!
-# SONG LONG A long, long song.
-# Good-bye, Thing. You sing too long.
-# pylint: disable=too-many-lines
-
-WINCODES = (
-    (0x01, 0x110),  # Left mouse button
-    (0x02, 0x111),  # Right mouse button
-    (0x03, 0),  # Control-break processing
-    (0x04, 0x112),  # Middle mouse button (three-button mouse)
-    (0x05, 0x113),  # X1 mouse button
-    (0x06, 0x114),  # X2 mouse button
-    (0x07, 0),  # Undefined
-    (0x08, 14),  # BACKSPACE key
-    (0x09, 15),  # TAB key
-    (0x0A, 0),  # Reserved
-    (0x0B, 0),  # Reserved
-    (0x0C, 0x163),  # CLEAR key
-    (0x0D, 28),  # ENTER key
-    (0x0E, 0),  # Undefined
-    (0x0F, 0),  # Undefined
-    (0x10, 42),  # SHIFT key
-    (0x11, 29),  # CTRL key
-    (0x12, 56),  # ALT key
-    (0x13, 119),  # PAUSE key
-    (0x14, 58),  # CAPS LOCK key
-    (0x15, 90),  # IME Kana mode
-    (0x15, 91),  # IME Hanguel mode (maintained for compatibility; use
-                 # VK_HANGUL)
-    (0x15, 91),  # IME Hangul mode
-    (0x16, 0),  # Undefined
-    (0x17, 92),  # IME Junja mode - These all need to be fixed
-    (0x18, 93),  # IME final mode - By someone who
-    (0x19, 94),  # IME Hanja mode - Knows how
-    (0x19, 95),  # IME Kanji mode - Japanese Keyboards work
-    (0x1A, 0),  # Undefined
-    (0x1B, 1),  # ESC key
-    (0x1C, 0),  # IME convert
-    (0x1D, 0),  # IME nonconvert
-    (0x1E, 0),  # IME accept
-    (0x1F, 0),  # IME mode change request
-    (0x20, 57),  # SPACEBAR
-    (0x21, 104),  # PAGE UP key
-    (0x22, 109),  # PAGE DOWN key
-    (0x23, 107),  # END key
-    (0x24, 102),  # HOME key
-    (0x25, 105),  # LEFT ARROW key
-    (0x26, 103),  # UP ARROW key
-    (0x27, 106),  # RIGHT ARROW key
-    (0x28, 108),  # DOWN ARROW key
-    (0x29, 0x161),  # SELECT key
-    (0x2A, 210),  # PRINT key
-    (0x2B, 28),  # EXECUTE key
-    (0x2C, 99),  # PRINT SCREEN key
-    (0x2D, 110),  # INS key
-    (0x2E, 111),  # DEL key
-    (0x2F, 138),  # HELP key
-    (0x30, 11),  # 0 key
-    (0x31, 2),  # 1 key
-    (0x32, 3),  # 2 key
-    (0x33, 4),  # 3 key
-    (0x34, 5),  # 4 key
-    (0x35, 6),  # 5 key
-    (0x36, 7),  # 6 key
-    (0x37, 8),  # 7 key
-    (0x38, 9),  # 8 key
-    (0x39, 10),  # 9 key
-    #  (0x3A-40, 0),  # Undefined
-    (0x41, 30),  # A key
-    (0x42, 48),  # B key
-    (0x43, 46),  # C key
-    (0x44, 32),  # D key
-    (0x45, 18),  # E key
-    (0x46, 33),  # F key
-    (0x47, 34),  # G key
-    (0x48, 35),  # H key
-    (0x49, 23),  # I key
-    (0x4A, 36),  # J key
-    (0x4B, 37),  # K key
-    (0x4C, 38),  # L key
-    (0x4D, 50),  # M key
-    (0x4E, 49),  # N key
-    (0x4F, 24),  # O key
-    (0x50, 25),  # P key
-    (0x51, 16),  # Q key
-    (0x52, 19),  # R key
-    (0x53, 31),  # S key
-    (0x54, 20),  # T key
-    (0x55, 22),  # U key
-    (0x56, 47),  # V key
-    (0x57, 17),  # W key
-    (0x58, 45),  # X key
-    (0x59, 21),  # Y key
-    (0x5A, 44),  # Z key
-    (0x5B, 125),  # Left Windows key (Natural keyboard)
-    (0x5C, 126),  # Right Windows key (Natural keyboard)
-    (0x5D, 139),  # Applications key (Natural keyboard)
-    (0x5E, 0),  # Reserved
-    (0x5F, 142),  # Computer Sleep key
-    (0x60, 82),  # Numeric keypad 0 key
-    (0x61, 79),  # Numeric keypad 1 key
-    (0x62, 80),  # Numeric keypad 2 key
-    (0x63, 81),  # Numeric keypad 3 key
-    (0x64, 75),  # Numeric keypad 4 key
-    (0x65, 76),  # Numeric keypad 5 key
-    (0x66, 77),  # Numeric keypad 6 key
-    (0x67, 71),  # Numeric keypad 7 key
-    (0x68, 72),  # Numeric keypad 8 key
-    (0x69, 73),  # Numeric keypad 9 key
-    (0x6A, 55),  # Multiply key
-    (0x6B, 78),  # Add key
-    (0x6C, 96),  # Separator key
-    (0x6D, 74),  # Subtract key
-    (0x6E, 83),  # Decimal key
-    (0x6F, 98),  # Divide key
-    (0x70, 59),  # F1 key
-    (0x71, 60),  # F2 key
-    (0x72, 61),  # F3 key
-    (0x73, 62),  # F4 key
-    (0x74, 63),  # F5 key
-    (0x75, 64),  # F6 key
-    (0x76, 65),  # F7 key
-    (0x77, 66),  # F8 key
-    (0x78, 67),  # F9 key
-    (0x79, 68),  # F10 key
-    (0x7A, 87),  # F11 key
-    (0x7B, 88),  # F12 key
-    (0x7C, 183),  # F13 key
-    (0x7D, 184),  # F14 key
-    (0x7E, 185),  # F15 key
-    (0x7F, 186),  # F16 key
-    (0x80, 187),  # F17 key
-    (0x81, 188),  # F18 key
-    (0x82, 189),  # F19 key
-    (0x83, 190),  # F20 key
-    (0x84, 191),  # F21 key
-    (0x85, 192),  # F22 key
-    (0x86, 192),  # F23 key
-    (0x87, 194),  # F24 key
-    #  (0x88-8F, 0),  # Unassigned
-    (0x90, 69),  # NUM LOCK key
-    (0x91, 70),  # SCROLL LOCK key
-    #  (0x92-96, 0),  # OEM specific
-    #  (0x97-9F, 0),  # Unassigned
-    (0xA0, 42),  # Left SHIFT key
-    (0xA1, 54),  # Right SHIFT key
-    (0xA2, 29),  # Left CONTROL key
-    (0xA3, 97),  # Right CONTROL key
-    (0xA4, 125),  # Left MENU key
-    (0xA5, 126),  # Right MENU key
-    (0xA6, 158),  # Browser Back key
-    (0xA7, 159),  # Browser Forward key
-    (0xA8, 173),  # Browser Refresh key
-    (0xA9, 128),  # Browser Stop key
-    (0xAA, 217),  # Browser Search key
-    (0xAB, 0x16c),  # Browser Favorites key
-    (0xAC, 150),  # Browser Start and Home key
-    (0xAD, 113),  # Volume Mute key
-    (0xAE, 114),  # Volume Down key
-    (0xAF, 115),  # Volume Up key
-    (0xB0, 163),  # Next Track key
-    (0xB1, 165),  # Previous Track key
-    (0xB2, 166),  # Stop Media key
-    (0xB3, 164),  # Play/Pause Media key
-    (0xB4, 155),  # Start Mail key
-    (0xB5, 0x161),  # Select Media key
-    (0xB6, 148),  # Start Application 1 key
-    (0xB7, 149),  # Start Application 2 key
-    #  (0xB8-B9, 0),  # Reserved
-    (0xBA, 39),  # Used for miscellaneous characters; it can vary by keyboard.
-    (0xBB, 13),  # For any country/region, the '+' key
-    (0xBC, 51),  # For any country/region, the ',' key
-    (0xBD, 12),  # For any country/region, the '-' key
-    (0xBE, 52),  # For any country/region, the '.' key
-    (0xBF, 53),  # Slash
-    (0xC0, 40),  # Apostrophe
-    #  (0xC1-D7, 0),  # Reserved
-    #  (0xD8-DA, 0),  # Unassigned
-    (0xDB, 26),  # [
-    (0xDC, 86),  # \
-    (0xDD, 27),  # ]
-    (0xDE, 43),  # '
-    (0xDF, 119),  # VK_OFF - What's that?
-    (0xE0, 0),  # Reserved
-    (0xE1, 0),  # OEM Specific
-    (0xE2, 43),  # Either the angle bracket key or the backslash key
-                 # on the RT 102-key keyboard (0xE3-E4, 0), # OEM
-                 # specific
-    (0xE5, 0),  # IME PROCESS key
-    (0xE6, 0),  # OEM specific
-    (0xE7, 0),  # Used to pass Unicode characters as if they were
-                # keystrokes. The VK_PACKET key is the low word of a
-                # 32-bit Virtual Key value used for non-keyboard input
-                # methods. For more information, see Remark in
-                # KEYBDINPUT, SendInput, WM_KEYDOWN, and WM_KEYUP
-    (0xE8, 0),  # Unassigned
-    #  (0xE9-F5, 0),  # OEM specific
-    (0xF6, 0),  # Attn key
-    (0xF7, 0),  # CrSel key
-    (0xF8, 0),  # ExSel key
-    (0xF9, 222),  # Erase EOF key
-    (0xFA, 207),  # Play key
-    (0xFB, 0x174),  # Zoom key
-    (0xFC, 0),  # Reserved
-    (0xFD, 0x19b),  # PA1 key
-    (0xFE, 0x163),   # Clear key
-    (0xFF, 185)
-)
+    NumPy is imported on first use only, an ImportError is raised when it
+    is not available.
+    """
+    global _EVENT_DTYPE  # pylint: disable=global-statement
+    if _EVENT_DTYPE is None:
+        import numpy  # pylint: disable=import-outside-toplevel
+        offsets = [struct.calcsize(EVENT_FORMAT[:index + 1]) -
+                   struct.calcsize(EVENT_FORMAT[index])
+                   for index in range(len(EVENT_FIELDS))]
+        _EVENT_DTYPE = numpy.dtype({
+            'names': list(EVENT_FIELDS),
+            'formats': list(EVENT_FORMAT),
+            'offsets': offsets,
+            'itemsize': EVENT_SIZE})
+    return _EVENT_DTYPE
+
+
+class EventBatch(object):  # pylint: disable=useless-object-inheritance
+    """Many raw evdev events decoded at once into a NumPy structured array.
+
+    The buffer is viewed in place, no Python object is created per event.
+    Trailing bytes that do not form a whole event are ignored.
+    """
 
-MAC_EVENT_CODES = (
-    # NSLeftMouseDown Quartz.kCGEventLeftMouseDown
-    (1, ("Key", 0x110, 1, 589825)),
-    # NSLeftMouseUp Quartz.kCGEventLeftMouseUp
-    (2, ("Key", 0x110, 0, 589825)),
-    # NSRightMouseDown Quartz.kCGEventRightMouseDown
-    (3, ("Key", 0x111, 1, 589826)),
-    # NSRightMouseUp Quartz.kCGEventRightMouseUp
-    (4, ("Key", 0x111, 0, 589826)),
-    (5, (None, 0, 0, 0)),    # NSMouseMoved Quartz.kCGEventMouseMoved
-    (6, (None, 0, 0, 0)),  # NSLeftMouseDragged Quartz.kCGEventLeftMouseDragged
-    # NSRightMouseDragged Quartz.kCGEventRightMouseDragged
-    (7, (None, 0, 0, 0)),
-    (8, (None, 0, 0, 0)),    # NSMouseEntered
-    (9, (None, 0, 0, 0)),    # NSMouseExited
-    (10, (None, 0, 0, 0)),   # NSKeyDown
-    (11, (None, 0, 0, 0)),   # NSKeyUp
-    (12, (None, 0, 0, 0)),   # NSFlagsChanged
-    (13, (None, 0, 0, 0)),   # NSAppKitDefined
-    (14, (None, 0, 0, 0)),   # NSSystemDefined
-    (15, (None, 0, 0, 0)),   # NSApplicationDefined
-    (16, (None, 0, 0, 0)),   # NSPeriodic
-    (17, (None, 0, 0, 0)),   # NSCursorUpdate
-    (22, (None, 0, 0, 0)),   # NSScrollWheel Quartz.kCGEventScrollWheel
-    (23, (None, 0, 0, 0)),   # NSTabletPoint Quartz.kCGEventTabletPointer
-    (24, (None, 0, 0, 0)),   # NSTabletProximity Quartz.kCGEventTabletProximity
-    (25, (None, 0, 0, 0)),   # NSOtherMouseDown Quartz.kCGEventOtherMouseDown
-    (25.2, ("Key", 0x112, 1, 589827)),   # BTN_MIDDLE
-    (25.3, ("Key", 0x113, 1, 589828)),   # BTN_SIDE
-    (25.4, ("Key", 0x114, 1, 589829)),   # BTN_EXTRA
-    (26, (None, 0, 0, 0)),   # NSOtherMouseUp Quartz.kCGEventOtherMouseUp
-    (26.2, ("Key", 0x112, 0, 589827)),   # BTN_MIDDLE
-    (26.3, ("Key", 0x113, 0, 589828)),   # BTN_SIDE
-    (26.4, ("Key", 0x114, 0, 589829)),   # BTN_EXTRA
-    (27, (None, 0, 0, 0)),   # NSOtherMouseDragged
-    (29, (None, 0, 0, 0)),   # NSEventTypeGesture
-    (30, (None, 0, 0, 0)),   # NSEventTypeMagnify
-    (31, (None, 0, 0, 0)),   # NSEventTypeSwipe
-    (18, (None, 0, 0, 0)),   # NSEventTypeRotate
-    (19, (None, 0, 0, 0)),   # NSEventTypeBeginGesture
-    (20, (None, 0, 0, 0)),   # NSEventTypeEndGesture
-    (27, (None, 0, 0, 0)),   # Quartz.kCGEventOtherMouseDragged
-    (32, (None, 0, 0, 0)),   # NSEventTypeSmartMagnify
-    (33, (None, 0, 0, 0)),   # NSEventTypeQuickLook
-    (34, (None, 0, 0, 0)),   # NSEventTypePressure
-)
+    def __init__(self, raw, device=None):
+        import numpy  # pylint: disable=import-outside-toplevel
+        self.device = device
+        self.records = numpy.frombuffer(
+            raw, dtype=event_dtype(), count=len(raw) // EVENT_SIZE)
 
-MAC_KEYS = (
-    (0x00, 30),  # kVK_ANSI_A
-    (0x01, 31),  # kVK_ANSI_S    (0x02, 32),  # kVK_ANSI_D
-    (0x03, 33),  # kVK_ANSI_F
-    (0x04, 35),  # kVK_ANSI_H
-    (0x05, 34),  # kVK_ANSI_G
-    (0x06, 44),  # kVK_ANSI_Z
-    (0x07, 45),  # kVK_ANSI_X
-    (0x08, 46),  # kVK_ANSI_C
-    (0x09, 47),  # kVK_ANSI_V
-    (0x0B, 48),  # kVK_ANSI_B
-    (0x0C, 16),  # kVK_ANSI_Q
-    (0x0D, 17),  # kVK_ANSI_W
-    (0x0E, 18),  # kVK_ANSI_E
-    (0x0F, 33),  # kVK_ANSI_R
-    (0x10, 21),  # kVK_ANSI_Y
-    (0x11, 20),  # kVK_ANSI_T
-    (0x12, 2),  # kVK_ANSI_1
-    (0x13, 3),  # kVK_ANSI_2
-    (0x14, 4),  # kVK_ANSI_3
-    (0x15, 5),  # kVK_ANSI_4
-    (0x16, 7),  # kVK_ANSI_6
-    (0x17, 6),  # kVK_ANSI_5
-    (0x18, 13),  # kVK_ANSI_Equal
-    (0x19, 10),  # kVK_ANSI_9
-    (0x1A, 8),  # kVK_ANSI_7
-    (0x1B, 12),  # kVK_ANSI_Minus
-    (0x1C, 9),  # kVK_ANSI_8
-    (0x1D, 11),  # kVK_ANSI_0
-    (0x1E, 27),  # kVK_ANSI_RightBracket
-    (0x1F, 24),  # kVK_ANSI_O
-    (0x20, 22),  # kVK_ANSI_U
-    (0x21, 26),  # kVK_ANSI_LeftBracket
-    (0x22, 23),  # kVK_ANSI_I
-    (0x23, 25),  # kVK_ANSI_P
-    (0x25, 38),  # kVK_ANSI_L
-    (0x26, 36),  # kVK_ANSI_J
-    (0x27, 40),  # kVK_ANSI_Quote
-    (0x28, 37),  # kVK_ANSI_K
-    (0x29, 39),  # kVK_ANSI_Semicolon
-    (0x2A, 43),  # kVK_ANSI_Backslash
-    (0x2B, 51),  # kVK_ANSI_Comma
-    (0x2C, 53),  # kVK_ANSI_Slash
-    (0x2D, 49),  # kVK_ANSI_N
-    (0x2E, 50),  # kVK_ANSI_M
-    (0x2F, 52),  # kVK_ANSI_Period
-    (0x32, 41),  # kVK_ANSI_Grave
-    (0x41, 83),  # kVK_ANSI_KeypadDecimal
-    (0x43, 55),  # kVK_ANSI_KeypadMultiply
-    (0x45, 78),  # kVK_ANSI_KeypadPlus
-    (0x47, 69),  # kVK_ANSI_KeypadClear
-    (0x4B, 98),  # kVK_ANSI_KeypadDivide
-    (0x4C, 96),  # kVK_ANSI_KeypadEnter
-    (0x4E, 74),  # kVK_ANSI_KeypadMinus
-    (0x51, 117),  # kVK_ANSI_KeypadEquals
-    (0x52, 82),  # kVK_ANSI_Keypad0
-    (0x53, 79),  # kVK_ANSI_Keypad1
-    (0x54, 80),  # kVK_ANSI_Keypad2
-    (0x55, 81),  # kVK_ANSI_Keypad3
-    (0x56, 75),  # kVK_ANSI_Keypad4
-    (0x57, 76),  # kVK_ANSI_Keypad5
-    (0x58, 77),  # kVK_ANSI_Keypad6
-    (0x59, 71),  # kVK_ANSI_Keypad7
-    (0x5B, 72),  # kVK_ANSI_Keypad8
-    (0x5C, 73),  # kVK_ANSI_Keypad9
-    (0x24, 28),  # kVK_Return
-    (0x30, 15),  # kVK_Tab
-    (0x31, 57),  # kVK_Space
-    (0x33, 111),  # kVK_Delete
-    (0x35, 1),  # kVK_Escape
-    (0x37, 125),  # kVK_Command
-    (0x38, 42),  # kVK_Shift
-    (0x39, 58),  # kVK_CapsLock
-    (0x3A, 56),  # kVK_Option
-    (0x3B, 29),  # kVK_Control
-    (0x3C, 54),  # kVK_RightShift
-    (0x3D, 100),  # kVK_RightOption
-    (0x3E, 126),  # kVK_RightControl
-    (0x36, 126),  # Right Meta
-    (0x3F, 0x1d0),  # kVK_Function
-    (0x40, 187),  # kVK_F17
-    (0x48, 115),  # kVK_VolumeUp
-    (0x49, 114),  # kVK_VolumeDown
-    (0x4A, 113),  # kVK_Mute
-    (0x4F, 188),  # kVK_F18
-    (0x50, 189),  # kVK_F19
-    (0x5A, 190),  # kVK_F20
-    (0x60, 63),  # kVK_F5
-    (0x61, 64),  # kVK_F6
-    (0x62, 65),  # kVK_F7
-    (0x63, 61),  # kVK_F3
-    (0x64, 66),  # kVK_F8
-    (0x65, 67),  # kVK_F9
-    (0x67, 87),  # kVK_F11
-    (0x69, 183),  # kVK_F13
-    (0x6A, 186),  # kVK_F16
-    (0x6B, 184),  # kVK_F14
-    (0x6D, 68),  # kVK_F10
-    (0x6F, 88),  # kVK_F12
-    (0x71, 185),  # kVK_F15
-    (0x72, 138),  # kVK_Help
-    (0x73, 102),  # kVK_Home
-    (0x74, 104),  # kVK_PageUp
-    (0x75, 111),  # kVK_ForwardDelete
-    (0x76, 62),  # kVK_F4
-    (0x77, 107),  # kVK_End
-    (0x78, 60),  # kVK_F2
-    (0x79, 109),  # kVK_PageDown
-    (0x7A, 59),  # kVK_F1
-    (0x7B, 105),  # kVK_LeftArrow
-    (0x7C, 106),  # kVK_RightArrow
-    (0x7D, 108),  # kVK_DownArrow
-    (0x7E, 103),  # kVK_UpArrow
-    (0x0A, 170),  # kVK_ISO_Section
-    (0x5D, 124),  # kVK_JIS_Yen
-    (0x5E, 92),  # kVK_JIS_Underscore
-    (0x5F, 95),  # kVK_JIS_KeypadComma
-    (0x66, 94),  # kVK_JIS_Eisu
-    (0x68, 90)   # kVK_JIS_Kana
-)
+    def __len__(self):
+        return len(self.records)
 
+    def __getitem__(self, index):
+        """Get a slice of the batch as another EventBatch, without
+        copying the events."""
+        batch = EventBatch(b'', self.device)
+        batch.records = self.records[index]
+        return batch
+
+    def report_end(self):
+        """Get the number of events up to the last SYN_REPORT included,
+        0 when the batch holds no complete report."""
+        import numpy  # pylint: disable=import-outside-toplevel
+        ends = numpy.flatnonzero(self.mask(EV_SYN, [SYN_REPORT]))
+        return int(ends[-1]) + 1 if len(ends) else 0
+
+    def mask(self, ev_type, codes=None):
+        """Get a boolean mask of the events of a type, and optionally
+        restricted to some codes."""
+        import numpy  # pylint: disable=import-outside-toplevel
+        selected = self.records['type'] == ev_type
+        if codes is not None:
+            selected &= numpy.isin(self.records['code'], codes)
+        return selected
+
+    def last_values(self, ev_type, codes=None):
+        """Get the last value of each code of a type, as a dict.
+
+        This is the state left by the batch, intermediate values are
+        skipped.
+        """
+        import numpy  # pylint: disable=import-outside-toplevel
+        selected = self.records[self.mask(ev_type, codes)]
+        if not len(selected):  # pylint: disable=len-as-condition
+            return {}
+        # The first occurrence in the reversed batch is the last one.
+        reversed_codes = selected['code'][::-1]
+        unique_codes, indices = numpy.unique(reversed_codes, return_index=True)
+        values = selected['value'][::-1][indices]
+        return dict(zip(unique_codes.tolist(), values.tolist()))
 
-# We have yet to support force feedback but probably should
-# eventually:
+    def timestamps(self):
+        """Get the timestamps of the events in seconds."""
+        return self.records['tv_sec'] + self.records['tv_usec'] / 1000000
 
-FORCE_FEEDBACK = ()  # Motor in gamepad
-FORCE_FEEDBACK_STATUS = ()  # Status of motor
+    def timestamps_ns(self):
+        """Get the timestamps of the events in integer nanoseconds."""
+        import numpy  # pylint: disable=import-outside-toplevel
+        return (self.records['tv_sec'].astype(numpy.int64) * 1000000000 +
+                self.records['tv_usec'].astype(numpy.int64) * 1000)
 
-POWER = ()  # Power switch
 
-# These two are internal workings of evdev we probably will never care
-# about.
+def timeval_ns(tv_sec, tv_usec):
+    """Convert a timeval into integer nanoseconds."""
+    return tv_sec * 1000000000 + tv_usec * 1000
 
-MAX = ()
-CURRENT = ()
 
+def convert_timeval(seconds_since_epoch):
+    """Convert time into C style timeval."""
+    frac, whole = math.modf(seconds_since_epoch)
+    microseconds = math.floor(frac * 1000000)
+    seconds = math.floor(whole)
+    return seconds, microseconds
 
-EVENT_MAP = (
-    ('types', EVENT_TYPES),
-    ('type_codes', ((value, key) for key, value in EVENT_TYPES)),
-    ('wincodes', WINCODES),
-    ('specials', SPECIAL_DEVICES),
-    ('xpad', XINPUT_MAPPING),
-    ('Sync', SYNCHRONIZATION_EVENTS),
-    ('Key', KEYS_AND_BUTTONS),
-    ('Relative', RELATIVE_AXES),
-    ('Absolute', ABSOLUTE_AXES),
-    ('Misc', MISC_EVENTS),
-    ('Switch', SWITCH_EVENTS),
-    ('LED', LEDS),
-    ('LED_type_codes', LED_TYPE_CODES),
-    ('Sound', SOUNDS),
-    ('Repeat', AUTOREPEAT_VALUES),
-    ('ForceFeedback', FORCE_FEEDBACK),
-    ('Power', POWER),
-    ('ForceFeedbackStatus', FORCE_FEEDBACK_STATUS),
-    ('Max', MAX),
-    ('Current', CURRENT))
 
 # Evdev style paths for the Mac
 
@@ -1326,95 +257,6 @@ QUARTZ_MOUSE_PATH = "/dev/input/by-id/usb-Quartz_Mouse-event-mouse"
 APPKIT_MOUSE_PATH = "/dev/input/by-id/usb-AppKit_Mouse-event-mouse"
 
 
-# Now comes all the structs we need to parse the infomation coming
-# from Windows.
-
-
-class KBDLLHookStruct(ctypes.Structure):
-    """Contains information about a low-level keyboard input event.
-
-    For full details see Microsoft's documentation:
-
-    https://msdn.microsoft.com/en-us/library/windows/desktop/
-    ms644967%28v=vs.85%29.aspx
-    """
-    # pylint: disable=too-few-public-methods
-    _fields_ = [("vk_code", DWORD),
-                ("scan_code", DWORD),
-                ("flags", DWORD),
-                ("time", ctypes.c_int)]
-
-
-class MSLLHookStruct(ctypes.Structure):
-    """Contains information about a low-level mouse input event.
-
-    For full details see Microsoft's documentation:
-
-    https://msdn.microsoft.com/en-us/library/windows/desktop/
-    ms644970%28v=vs.85%29.aspx
-    """
-    # pylint: disable=too-few-public-methods
-    _fields_ = [("x_pos", ctypes.c_long),
-                ("y_pos", ctypes.c_long),
-                ('reserved', ctypes.c_short),
-                ('mousedata', ctypes.c_short),
-                ("flags", DWORD),
-                ("time", DWORD),
-                ("extrainfo", ctypes.c_ulong)]
-
-
-class XinputGamepad(ctypes.Structure):
-    """Describes the current state of the Xbox 360 Controller.
-
-    For full details see Microsoft's documentation:
-
-    https://msdn.microsoft.com/en-us/library/windows/desktop/
-    microsoft.directx_sdk.reference.xinput_gamepad%28v=vs.85%29.aspx
-
-    """
-    # pylint: disable=too-few-public-methods
-    _fields_ = [
-        ('buttons', ctypes.c_ushort),  # wButtons
-        ('left_trigger', ctypes.c_ubyte),  # bLeftTrigger
-        ('right_trigger', ctypes.c_ubyte),  # bLeftTrigger
-        ('l_thumb_x', ctypes.c_short),  # sThumbLX
-        ('l_thumb_y', ctypes.c_short),  # sThumbLY
-        ('r_thumb_x', ctypes.c_short),  # sThumbRx
-        ('r_thumb_y', ctypes.c_short),  # sThumbRy
-    ]
-
-
-class XinputState(ctypes.Structure):
-    """Represents the state of a controller.
-
-    For full details see Microsoft's documentation:
-
-    https://msdn.microsoft.com/en-us/library/windows/desktop/
-    microsoft.directx_sdk.reference.xinput_state%28v=vs.85%29.aspx
-
-    """
-    # pylint: disable=too-few-public-methods
-    _fields_ = [
-        ('packet_number', ctypes.c_ulong),  # dwPacketNumber
-        ('gamepad', XinputGamepad),  # Gamepad
-    ]
-
-
-class XinputVibration(ctypes.Structure):
-    """Specifies motor speed levels for the vibration function of a
-    controller.
-
-    For full details see Microsoft's documentation:
-
-    https://msdn.microsoft.com/en-us/library/windows/desktop/
-    microsoft.directx_sdk.reference.xinput_vibration%28v=vs.85%29.aspx
-
-    """
-    # pylint: disable=too-few-public-methods
-    _fields_ = [("wLeftMotorSpeed", ctypes.c_ushort),
-                ("wRightMotorSpeed", ctypes.c_ushort)]
-
-
 if sys.version_info.major == 2:
     # pylint: disable=redefined-builtin
     class PermissionError(IOError):
@@ -1444,16 +286,54 @@ class UnknownEventCode(IndexError):
 
 
 class InputEvent(object):  # pylint: disable=useless-object-inheritance
-    """A user event."""
-    # pylint: disable=too-few-public-methods
-    def __init__(self,
-                 device,
-                 event_info):
+    """A user event.
+
+    Only the raw integers of the evdev event are stored. The type and code
+    names and the float timestamp are resolved when read, so dropped
+    events cost nothing more than their allocation.
+    """
+    __slots__ = ('device', 'tv_sec', 'tv_usec', 'type_code', 'raw_code',
+                 'state')
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, device, tv_sec, tv_usec, type_code, raw_code, state):
         self.device = device
-        self.timestamp = event_info["timestamp"]
-        self.code = event_info["code"]
-        self.state = event_info["state"]
-        self.ev_type = event_info["ev_type"]
+        self.tv_sec = tv_sec
+        self.tv_usec = tv_usec
+        self.type_code = type_code
+        self.raw_code = raw_code
+        self.state = state
+
+    @property
+    def key(self):
+        """The event_key of the event."""
+        return (self.type_code << 16) | self.raw_code
+
+    @property
+    def timestamp(self):
+        """The time of the event in seconds."""
+        return self.tv_sec + (self.tv_usec / 1000000)
+
+    @property
+    def timestamp_ns(self):
+        """The time of the event in integer nanoseconds."""
+        return timeval_ns(self.tv_sec, self.tv_usec)
+
+    @property
+    def ev_type(self):
+        """The string name of the event type, e.g. 'Key'."""
+        return self.device.manager.get_event_type(self.type_code)
+
+    @property
+    def code(self):
+        """The string name of the event code, e.g. 'BTN_SOUTH'."""
+        return self.device.manager.get_event_string(
+            self.ev_type, self.raw_code)
+
+    def __repr__(self):
+        return 'InputEvent(%d, %d, %d, %d, %d)' % (
+            self.tv_sec, self.tv_usec, self.type_code, self.raw_code,
+            self.state)
 
 
 class BaseListener(object):  # pylint: disable=useless-object-inheritance
@@ -1468,6 +348,8 @@ class BaseListener(object):  # pylint: disable=useless-object-inheritance
         self.codes = codes if codes else None
         self.app = None
         self.timeval = None
+        # pylint: disable=import-outside-toplevel
+        from ._inputs_codes import EVENT_TYPES
         self.type_codes = dict((
             (value, key)
             for key, value in EVENT_TYPES))
@@ -1622,751 +504,10 @@ class BaseListener(object):  # pylint: disable=useless-object-inheritance
         return x_event, y_event
 
 
-class WindowsKeyboardListener(BaseListener):
-    """Loosely emulate Evdev keyboard behaviour on Windows.  Listen (hook
-    in Windows terminology) for key events then buffer them in a pipe.
-    """
-    def __init__(self, pipe, codes=None):
-        self.pipe = pipe
-        self.hooked = None
-        self.pointer = None
-        super(WindowsKeyboardListener, self).__init__(pipe, codes)
-
-    @staticmethod
-    def listen():
-        """Listen for keyboard input."""
-        msg = MSG()
-        ctypes.windll.user32.GetMessageA(ctypes.byref(msg), 0, 0, 0)
-
-    def get_fptr(self):
-        """Get the function pointer."""
-        cmpfunc = ctypes.CFUNCTYPE(ctypes.c_int,
-                                   WPARAM,
-                                   LPARAM,
-                                   ctypes.POINTER(KBDLLHookStruct))
-        return cmpfunc(self.handle_input)
-
-    def install_handle_input(self):
-        """Install the hook."""
-        self.pointer = self.get_fptr()
-
-        self.hooked = ctypes.windll.user32.SetWindowsHookExA(
-            13,
-            self.pointer,
-            ctypes.windll.kernel32.GetModuleHandleW(None),
-            0
-        )
-        if not self.hooked:
-            return False
-        return True
-
-    def uninstall_handle_input(self):
-        """Remove the hook."""
-        if self.hooked is None:
-            return
-        ctypes.windll.user32.UnhookWindowsHookEx(self.hooked)
-        self.hooked = None
-
-    def handle_input(self, ncode, wparam, lparam):
-        """Process the key input."""
-        value = WIN_KEYBOARD_CODES[wparam]
-        scan_code = lparam.contents.scan_code
-        vk_code = lparam.contents.vk_code
-        self.update_timeval()
-
-        events = []
-        # Add key event
-        scan_key, key_event = self.emulate_press(
-            vk_code, scan_code, value, self.timeval)
-        events.append(scan_key)
-        events.append(key_event)
-
-        # End with a sync marker
-        events.append(self.sync_marker(self.timeval))
-
-        # We are done
-        self.write_to_pipe(events)
-
-        return ctypes.windll.user32.CallNextHookEx(
-            self.hooked, ncode, wparam, lparam)
-
-
-def keyboard_process(pipe):
-    """Single subprocess for reading keyboard events on Windows."""
-    keyboard = WindowsKeyboardListener(pipe)
-    keyboard.listen()
-
-
-class WindowsMouseListener(BaseListener):
-    """Loosely emulate Evdev mouse behaviour on Windows.  Listen (hook
-    in Windows terminology) for key events then buffer them in a pipe.
-    """
-    def __init__(self, pipe):
-        self.pipe = pipe
-        self.hooked = None
-        self.pointer = None
-        self.mouse_codes = WIN_MOUSE_CODES
-        super(WindowsMouseListener, self).__init__(pipe)
-
-    @staticmethod
-    def listen():
-        """Listen for mouse input."""
-        msg = MSG()
-        ctypes.windll.user32.GetMessageA(ctypes.byref(msg), 0, 0, 0)
-
-    def get_fptr(self):
-        """Get the function pointer."""
-        cmpfunc = ctypes.CFUNCTYPE(ctypes.c_int,
-                                   WPARAM,
-                                   LPARAM,
-                                   ctypes.POINTER(MSLLHookStruct))
-        return cmpfunc(self.handle_input)
-
-    def install_handle_input(self):
-        """Install the hook."""
-        self.pointer = self.get_fptr()
-
-        self.hooked = ctypes.windll.user32.SetWindowsHookExA(
-            14,
-            self.pointer,
-            ctypes.windll.kernel32.GetModuleHandleW(None),
-            0
-        )
-        if not self.hooked:
-            return False
-        return True
-
-    def uninstall_handle_input(self):
-        """Remove the hook."""
-        if self.hooked is None:
-            return
-        ctypes.windll.user32.UnhookWindowsHookEx(self.hooked)
-        self.hooked = None
-
-    def handle_input(self, ncode, wparam, lparam):
-        """Process the key input."""
-        x_pos = lparam.contents.x_pos
-        y_pos = lparam.contents.y_pos
-        data = lparam.contents.mousedata
-
-        # This is how we can distinguish mouse 1 from mouse 2
-        # extrainfo = lparam.contents.extrainfo
-        # The way windows seems to do it is there is primary mouse
-        # and all other mouses report as mouse 2
-
-        # Also useful later will be to support the flags field
-        # flags = lparam.contents.flags
-        # This shows if the event was from a real device or whether it
-        # was injected somehow via software
-
-        self.emulate_mouse(wparam, x_pos, y_pos, data)
-
-        # Give back control to Windows to wait for and process the
-        # next event
-        return ctypes.windll.user32.CallNextHookEx(
-            self.hooked, ncode, wparam, lparam)
-
-    def emulate_mouse(self, key_code, x_val, y_val, data):
-        """Emulate the ev codes using the data Windows has given us.
-
-        Note that by default in Windows, to recognise a double click,
-        you just notice two clicks in a row within a reasonablely
-        short time period.
-
-        However, if the application developer sets the application
-        window's class style to CS_DBLCLKS, the operating system will
-        notice the four button events (down, up, down, up), intercept
-        them and then send a single key code instead.
-
-        There are no such special double click codes on other
-        platforms, so not obvious what to do with them. It might be
-        best to just convert them back to four events.
-
-        Currently we do nothing.
-
-        ((0x0203, 'WM_LBUTTONDBLCLK'),
-         (0x0206, 'WM_RBUTTONDBLCLK'),
-         (0x0209, 'WM_MBUTTONDBLCLK'),
-         (0x020D, 'WM_XBUTTONDBLCLK'))
-
-        """
-        # Once again ignore Windows' relative time (since system
-        # startup) and use the absolute time (since epoch i.e. 1st Jan
-        # 1970).
-        self.update_timeval()
-
-        events = []
-
-        if key_code == 0x0200:
-            # We have a mouse move alone.
-            # So just pass through to below
-            pass
-        elif key_code == 0x020A:
-            # We have a vertical mouse wheel turn
-            events.append(self.emulate_wheel(data, 'y', self.timeval))
-        elif key_code == 0x020E:
-            # We have a horizontal mouse wheel turn
-            # https://msdn.microsoft.com/en-us/library/windows/desktop/
-            # ms645614%28v=vs.85%29.aspx
-            events.append(self.emulate_wheel(data, 'x', self.timeval))
-        else:
-            # We have a button press.
-
-            # Distinguish the second extra button
-            if key_code == 0x020B and data == 2:
-                key_code = 0x020B2
-            elif key_code == 0x020C and data == 2:
-                key_code = 0x020C2
-
-            # Get the mouse codes
-            code, value, scan_code = self.mouse_codes[key_code]
-            # Add in the press events
-            scan_event, key_event = self.emulate_press(
-                code, scan_code, value, self.timeval)
-            events.append(scan_event)
-            events.append(key_event)
-
-        # Add in the absolute position of the mouse cursor
-        x_event, y_event = self.emulate_abs(x_val, y_val, self.timeval)
-        events.append(x_event)
-        events.append(y_event)
-
-        # End with a sync marker
-        events.append(self.sync_marker(self.timeval))
-
-        # We are done
-        self.write_to_pipe(events)
-
-
-def mouse_process(pipe):
-    """Single subprocess for reading mouse events on Windows."""
-    mouse = WindowsMouseListener(pipe)
-    mouse.listen()
-
-
-class QuartzMouseBaseListener(BaseListener):
-    """Emulate evdev mouse behaviour on mac."""
-    def __init__(self, pipe):
-        super(QuartzMouseBaseListener, self).__init__(
-            pipe,
-            codes=dict(MAC_EVENT_CODES))
-        self.active = True
-        self.events = []
-
-    def _get_mouse_button_number(self, event):
-        """Get the mouse button number from an event."""
-        raise NotImplementedError
-
-    def _get_click_state(self, event):
-        """The click state from an event."""
-        raise NotImplementedError
-
-    def _get_scroll(self, event):
-        """The scroll values from an event."""
-        raise NotImplementedError
-
-    def _get_absolute(self, event):
-        """Get abolute cursor location."""
-        raise NotImplementedError
-
-    def _get_relative(self, event):
-        """Get the relative mouse movement."""
-        raise NotImplementedError
-
-    def handle_button(self, event, event_type):
-        """Convert the button information from quartz into evdev format."""
-        # 0 for left
-        # 1 for right
-        # 2 for middle/center
-        # 3 for side
-        mouse_button_number = self._get_mouse_button_number(event)
-
-        # Identify buttons 3,4,5
-        if event_type in (25, 26):
-            event_type = event_type + (mouse_button_number * 0.1)
-
-        # Add buttons to events
-        event_type_string, event_code, value, scan = self.codes[event_type]
-        if event_type_string == "Key":
-            scan_event, key_event = self.emulate_press(
-                event_code, scan, value, self.timeval)
-            self.events.append(scan_event)
-            self.events.append(key_event)
-
-        # doubleclick/n-click of button
-        click_state = self._get_click_state(event)
-
-        repeat = self.emulate_repeat(click_state, self.timeval)
-        self.events.append(repeat)
-
-    def handle_scrollwheel(self, event):
-        """Handle the scrollwheel (it is a ball on the mighty mouse)."""
-        # relative Scrollwheel
-        scroll_x, scroll_y = self._get_scroll(event)
-
-        if scroll_x:
-            self.events.append(
-                self.emulate_wheel(scroll_x, 'x', self.timeval))
-
-        if scroll_y:
-            self.events.append(
-                self.emulate_wheel(scroll_y, 'y', self.timeval))
-
-    def handle_absolute(self, event):
-        """Absolute mouse position on the screen."""
-        (x_val, y_val) = self._get_absolute(event)
-        x_event, y_event = self.emulate_abs(
-            int(x_val),
-            int(y_val),
-            self.timeval)
-        self.events.append(x_event)
-        self.events.append(y_event)
-
-    def handle_relative(self, event):
-        """Relative mouse movement."""
-        delta_x, delta_y = self._get_relative(event)
-        if delta_x:
-            self.events.append(
-                self.emulate_rel(0x00,
-                                 delta_x,
-                                 self.timeval))
-        if delta_y:
-            self.events.append(
-                self.emulate_rel(0x01,
-                                 delta_y,
-                                 self.timeval))
-
-    # pylint: disable=unused-argument
-    def handle_input(self, proxy, event_type, event, refcon):
-        """Handle an input event."""
-        self.update_timeval()
-        self.events = []
-
-        if event_type in (1, 2, 3, 4, 25, 26, 27):
-            self.handle_button(event, event_type)
-
-        if event_type == 22:
-            self.handle_scrollwheel(event)
-
-        # Add in the absolute position of the mouse cursor
-        self.handle_absolute(event)
-
-        # Add in the relative position of the mouse cursor
-        self.handle_relative(event)
-
-        # End with a sync marker
-        self.events.append(self.sync_marker(self.timeval))
-
-        # We are done
-        self.write_to_pipe(self.events)
-
-
-def quartz_mouse_process(pipe):
-    """Single subprocess for reading mouse events on Mac using newer Quartz."""
-    # Quartz only on the mac, so don't warn about Quartz
-    # pylint: disable=import-error
-    import Quartz
-    # pylint: disable=no-member
-
-    class QuartzMouseListener(QuartzMouseBaseListener):
-        """Loosely emulate Evdev mouse behaviour on the Macs.
-        Listen for key events then buffer them in a pipe.
-        """
-        def install_handle_input(self):
-            """Constants below listed at:
-            https://developer.apple.com/documentation/coregraphics/
-            cgeventtype?language=objc#topics
-            """
-            # Keep Mac Names to make it easy to find the documentation
-            # pylint: disable=invalid-name
-
-            NSMachPort = Quartz.CGEventTapCreate(
-                Quartz.kCGSessionEventTap,
-                Quartz.kCGHeadInsertEventTap,
-                Quartz.kCGEventTapOptionDefault,
-                Quartz.CGEventMaskBit(Quartz.kCGEventLeftMouseDown) |
-                Quartz.CGEventMaskBit(Quartz.kCGEventLeftMouseUp) |
-                Quartz.CGEventMaskBit(Quartz.kCGEventRightMouseDown) |
-                Quartz.CGEventMaskBit(Quartz.kCGEventRightMouseUp) |
-                Quartz.CGEventMaskBit(Quartz.kCGEventMouseMoved) |
-                Quartz.CGEventMaskBit(Quartz.kCGEventLeftMouseDragged) |
-                Quartz.CGEventMaskBit(Quartz.kCGEventRightMouseDragged) |
-                Quartz.CGEventMaskBit(Quartz.kCGEventScrollWheel) |
-                Quartz.CGEventMaskBit(Quartz.kCGEventTabletPointer) |
-                Quartz.CGEventMaskBit(Quartz.kCGEventTabletProximity) |
-                Quartz.CGEventMaskBit(Quartz.kCGEventOtherMouseDown) |
-                Quartz.CGEventMaskBit(Quartz.kCGEventOtherMouseUp) |
-                Quartz.CGEventMaskBit(Quartz.kCGEventOtherMouseDragged),
-                self.handle_input,
-                None)
-
-            CFRunLoopSourceRef = Quartz.CFMachPortCreateRunLoopSource(
-                None,
-                NSMachPort,
-                0)
-            CFRunLoopRef = Quartz.CFRunLoopGetCurrent()
-            Quartz.CFRunLoopAddSource(
-                CFRunLoopRef,
-                CFRunLoopSourceRef,
-                Quartz.kCFRunLoopDefaultMode)
-            Quartz.CGEventTapEnable(
-                NSMachPort,
-                True)
-
-        def listen(self):
-            """Listen for quartz events."""
-            while self.active:
-                Quartz.CFRunLoopRunInMode(
-                    Quartz.kCFRunLoopDefaultMode, 5, False)
-
-        def uninstall_handle_input(self):
-            self.active = False
-
-        def _get_mouse_button_number(self, event):
-            """Get the mouse button number from an event."""
-            return Quartz.CGEventGetIntegerValueField(
-                event, Quartz.kCGMouseEventButtonNumber)
-
-        def _get_click_state(self, event):
-            """The click state from an event."""
-            return Quartz.CGEventGetIntegerValueField(
-                event, Quartz.kCGMouseEventClickState)
-
-        def _get_scroll(self, event):
-            """The scroll values from an event."""
-            scroll_y = Quartz.CGEventGetIntegerValueField(
-                event, Quartz.kCGScrollWheelEventDeltaAxis1)
-            scroll_x = Quartz.CGEventGetIntegerValueField(
-                event, Quartz.kCGScrollWheelEventDeltaAxis2)
-            return scroll_x, scroll_y
-
-        def _get_absolute(self, event):
-            """Get abolute cursor location."""
-            return Quartz.CGEventGetLocation(event)
-
-        def _get_relative(self, event):
-            """Get the relative mouse movement."""
-            delta_x = Quartz.CGEventGetIntegerValueField(
-                event, Quartz.kCGMouseEventDeltaX)
-            delta_y = Quartz.CGEventGetIntegerValueField(
-                event, Quartz.kCGMouseEventDeltaY)
-            return delta_x, delta_y
-
-    mouse = QuartzMouseListener(pipe)
-    mouse.listen()
-
-
-class AppKitMouseBaseListener(BaseListener):
-    """Emulate evdev behaviour on the the Mac."""
-    def __init__(self, pipe, events=None):
-        super(AppKitMouseBaseListener, self).__init__(
-            pipe, events, codes=dict(MAC_EVENT_CODES))
-
-    @staticmethod
-    def _get_mouse_button_number(event):
-        """Get the button number."""
-        return event.buttonNumber()
-
-    @staticmethod
-    def _get_absolute(event):
-        """Get the absolute (pixel) location of the mouse cursor."""
-        return event.locationInWindow()
-
-    @staticmethod
-    def _get_event_type(event):
-        """Get the appkit event type of the event."""
-        return event.type()
-
-    @staticmethod
-    def _get_deltas(event):
-        """Get the changes from the appkit event."""
-        delta_x = round(event.deltaX())
-        delta_y = round(event.deltaY())
-        delta_z = round(event.deltaZ())
-        return delta_x, delta_y, delta_z
-
-    def handle_button(self, event, event_type):
-        """Handle mouse click."""
-        mouse_button_number = self._get_mouse_button_number(event)
-        # Identify buttons 3,4,5
-        if event_type in (25, 26):
-            event_type = event_type + (mouse_button_number * 0.1)
-        # Add buttons to events
-        event_type_name, event_code, value, scan = self.codes[event_type]
-        if event_type_name == "Key":
-            scan_event, key_event = self.emulate_press(
-                event_code, scan, value, self.timeval)
-            self.events.append(scan_event)
-            self.events.append(key_event)
-
-    def handle_absolute(self, event):
-        """Absolute mouse position on the screen."""
-        point = self._get_absolute(event)
-        x_pos = round(point.x)
-        y_pos = round(point.y)
-        x_event, y_event = self.emulate_abs(x_pos, y_pos, self.timeval)
-        self.events.append(x_event)
-        self.events.append(y_event)
-
-    def handle_scrollwheel(self, event):
-        """Make endev from appkit scroll wheel event."""
-        delta_x, delta_y, delta_z = self._get_deltas(event)
-        if delta_x:
-            self.events.append(
-                self.emulate_wheel(delta_x, 'x', self.timeval))
-        if delta_y:
-            self.events.append(
-                self.emulate_wheel(delta_y, 'y', self.timeval))
-        if delta_z:
-            self.events.append(
-                self.emulate_wheel(delta_z, 'z', self.timeval))
-
-    def handle_relative(self, event):
-        """Get the position of the mouse on the screen."""
-        delta_x, delta_y, delta_z = self._get_deltas(event)
-        if delta_x:
-            self.events.append(
-                self.emulate_rel(0x00,
-                                 delta_x,
-                                 self.timeval))
-        if delta_y:
-            self.events.append(
-                self.emulate_rel(0x01,
-                                 delta_y,
-                                 self.timeval))
-        if delta_z:
-            self.events.append(
-                self.emulate_rel(0x02,
-                                 delta_z,
-                                 self.timeval))
-
-    def handle_input(self, event):
-        """Process the mouse event."""
-        self.update_timeval()
-        self.events = []
-        code = self._get_event_type(event)
-
-        # Deal with buttons
-        self.handle_button(event, code)
-
-        # Mouse wheel
-        if code == 22:
-            self.handle_scrollwheel(event)
-        # Other relative mouse movements
-        else:
-            self.handle_relative(event)
-
-        # Add in the absolute position of the mouse cursor
-        self.handle_absolute(event)
-
-        # End with a sync marker
-        self.events.append(self.sync_marker(self.timeval))
-
-        # We are done
-        self.write_to_pipe(self.events)
-
-
-def appkit_mouse_process(pipe):
-    """Single subprocess for reading mouse events on Mac using older AppKit."""
-    # pylint: disable=import-error,too-many-locals
-
-    # Note Objective C does not support a Unix style fork.
-    # So these imports have to be inside the child subprocess since
-    # otherwise the child process cannot use them.
-
-    # pylint: disable=no-member, no-name-in-module
-    from Foundation import NSObject
-    from AppKit import NSApplication, NSApp
-    from Cocoa import (NSEvent, NSLeftMouseDownMask,
-                       NSLeftMouseUpMask, NSRightMouseDownMask,
-                       NSRightMouseUpMask, NSMouseMovedMask,
-                       NSLeftMouseDraggedMask,
-                       NSRightMouseDraggedMask, NSMouseEnteredMask,
-                       NSMouseExitedMask, NSScrollWheelMask,
-                       NSOtherMouseDownMask, NSOtherMouseUpMask)
-    from PyObjCTools import AppHelper
-    import objc
-
-    class MacMouseSetup(NSObject):
-        """Setup the handler."""
-        @objc.python_method
-        def init_with_handler(self, handler):
-            """
-            Init method that receives the write end of the pipe.
-            """
-            # ALWAYS call the super's designated initializer.
-            # Also, make sure to re-bind "self" just in case it
-            # returns something else!
-            # pylint: disable=self-cls-assignment
-            self = super(MacMouseSetup, self).init()
-            self.handler = handler
-            # Unlike Python's __init__, initializers MUST return self,
-            # because they are allowed to return any object!
-            return self
-
-        # pylint: disable=invalid-name, unused-argument
-        def applicationDidFinishLaunching_(self, notification):
-            """Bind the listen method as the handler for mouse events."""
-
-            mask = (NSLeftMouseDownMask | NSLeftMouseUpMask |
-                    NSRightMouseDownMask | NSRightMouseUpMask |
-                    NSMouseMovedMask | NSLeftMouseDraggedMask |
-                    NSRightMouseDraggedMask | NSScrollWheelMask |
-                    NSMouseEnteredMask | NSMouseExitedMask |
-                    NSOtherMouseDownMask | NSOtherMouseUpMask)
-            NSEvent.addGlobalMonitorForEventsMatchingMask_handler_(
-                mask, self.handler)
-
-    class MacMouseListener(AppKitMouseBaseListener):
-        """Loosely emulate Evdev mouse behaviour on the Macs.
-        Listen for key events then buffer them in a pipe.
-        """
-        def install_handle_input(self):
-            """Install the hook."""
-            self.app = NSApplication.sharedApplication()
-            # pylint: disable=no-member
-            delegate = MacMouseSetup.alloc().init_with_handler(
-                self.handle_input)
-            NSApp().setDelegate_(delegate)
-            AppHelper.runEventLoop()
-
-        def __del__(self):
-            """Stop the listener on deletion."""
-            AppHelper.stopEventLoop()
-
-    # pylint: disable=unused-variable
-    mouse = MacMouseListener(pipe, events=[])
-
-
-class AppKitKeyboardListener(BaseListener):
-    """Emulate an evdev keyboard on the Mac."""
-    def __init__(self, pipe):
-        super(AppKitKeyboardListener, self).__init__(
-            pipe, codes=dict(MAC_KEYS))
-
-    @staticmethod
-    def _get_event_key_code(event):
-        """Get the key code."""
-        return event.keyCode()
-
-    @staticmethod
-    def _get_event_type(event):
-        """Get the event type."""
-        return event.type()
-
-    @staticmethod
-    def _get_flag_value(event):
-        """Note, this may be able to be made more accurate,
-            i.e. handle two modifier keys at once."""
-        flags = event.modifierFlags()
-        if flags == 0x100:
-            value = 0
-        else:
-            value = 1
-        return value
-
-    def _get_key_value(self, event, event_type):
-        """Get the key value."""
-        if event_type == 10:
-            value = 1
-        elif event_type == 11:
-            value = 0
-        elif event_type == 12:
-            value = self._get_flag_value(event)
-        else:
-            value = -1
-        return value
-
-    def handle_input(self, event):
-        """Process they keyboard input."""
-        self.update_timeval()
-        self.events = []
-        code = self._get_event_key_code(event)
-
-        if code in self.codes:
-            new_code = self.codes[code]
-        else:
-            new_code = 0
-        event_type = self._get_event_type(event)
-        value = self._get_key_value(event, event_type)
-        scan_event, key_event = self.emulate_press(
-            new_code, code, value, self.timeval)
-
-        self.events.append(scan_event)
-        self.events.append(key_event)
-        # End with a sync marker
-        self.events.append(self.sync_marker(self.timeval))
-        # We are done
-        self.write_to_pipe(self.events)
-
-
-def mac_keyboard_process(pipe):
-    """Single subprocesses for reading keyboard on Mac."""
-    # pylint: disable=import-error,too-many-locals
-    # Note Objective C does not support a Unix style fork.
-    # So these imports have to be inside the child subprocess since
-    # otherwise the child process cannot use them.
-
-    # pylint: disable=no-member, no-name-in-module
-    from AppKit import NSApplication, NSApp
-    from Foundation import NSObject
-    from Cocoa import (NSEvent, NSKeyDownMask, NSKeyUpMask,
-                       NSFlagsChangedMask)
-    from PyObjCTools import AppHelper
-    import objc
-
-    class MacKeyboardSetup(NSObject):
-        """Setup the handler."""
-
-        @objc.python_method
-        def init_with_handler(self, handler):
-            """
-            Init method that receives the write end of the pipe.
-            """
-            # ALWAYS call the super's designated initializer.
-            # Also, make sure to re-bind "self" just in case it
-            # returns something else!
-
-            # pylint: disable=self-cls-assignment
-            self = super(MacKeyboardSetup, self).init()
-
-            self.handler = handler
-
-            # Unlike Python's __init__, initializers MUST return self,
-            # because they are allowed to return any object!
-            return self
-
-        # pylint: disable=invalid-name, unused-argument
-        def applicationDidFinishLaunching_(self, notification):
-            """Bind the handler to listen to keyboard events."""
-            mask = NSKeyDownMask | NSKeyUpMask | NSFlagsChangedMask
-            NSEvent.addGlobalMonitorForEventsMatchingMask_handler_(
-                mask, self.handler)
-
-    class MacKeyboardListener(AppKitKeyboardListener):
-        """Loosely emulate Evdev keyboard behaviour on the Mac.
-        Listen for key events then buffer them in a pipe.
-        """
-        def install_handle_input(self):
-            """Install the hook."""
-            self.app = NSApplication.sharedApplication()
-            # pylint: disable=no-member
-            delegate = MacKeyboardSetup.alloc().init_with_handler(
-                self.handle_input)
-            NSApp().setDelegate_(delegate)
-            AppHelper.runEventLoop()
-
-        def __del__(self):
-            """Stop the listener on deletion."""
-            AppHelper.stopEventLoop()
-
-    # pylint: disable=unused-variable
-    keyboard = MacKeyboardListener(pipe)
-
-
 class InputDevice(object):  # pylint: disable=useless-object-inheritance
     """A user input device."""
     # pylint: disable=too-many-instance-attributes
+
     def __init__(self, manager,
                  device_path=None,
                  char_path_override=None,
@@ -2376,6 +517,11 @@ class InputDevice(object):  # pylint: disable=useless-object-inheritance
         self.__pipe = None
         self._listener = None
         self.leds = None
+        # Set when the manager forgot the device, e.g. it was unplugged.
+        self.stale = False
+        # Set when found from the capabilities of its node, without a
+        # symlink: its device path is then the node.
+        self.by_capabilities = False
         if device_path:
             self._device_path = device_path
         else:
@@ -2413,14 +559,23 @@ class InputDevice(object):  # pylint: disable=useless-object-inheritance
 
     def _set_name(self):
         if NIX:
-            with open("/sys/class/input/%s/device/name" %
-                      self.get_char_name()) as name_file:
-                self.name = name_file.read().strip()
+            known_name = self.manager.get_known_name(
+                self._character_device_path)
+            if known_name is not None:
+                self.name = known_name
+            else:
+                with open(os.path.join(self.manager.sys_input_dir,
+                                       self.get_char_name(),
+                                       'device', 'name')) as name_file:
+                    self.name = name_file.read().strip()
             self.leds = []
 
     def _get_path_infomation(self):
         """Get useful infomation from the device path."""
-        long_identifier = self._device_path.split('/')[4]
+        long_identifier = os.path.basename(self._device_path)
+        if '-' not in long_identifier:
+            # A node without a symlink, e.g. event5.
+            return ('node', long_identifier, None)
         protocol, remainder = long_identifier.split('-', 1)
         identifier, _, device_type = remainder.rsplit('-', 2)
         return (protocol, identifier, device_type)
@@ -2466,6 +621,12 @@ class InputDevice(object):  # pylint: disable=useless-object-inheritance
 
         return self._character_file
 
+    def close(self):
+        """Close the files opened to read the device."""
+        if self._character_file:
+            self._character_file.close()
+            self._character_file = None
+
     def __iter__(self):
         while True:
             event = self._do_iter()
@@ -2476,6 +637,25 @@ class InputDevice(object):  # pylint: disable=useless-object-inheritance
         """Get data from the character device."""
         return self._character_device.read(read_size)
 
+    def open_nonblocking(self):
+        """Open a new non-blocking raw descriptor on the character device.
+
+        The caller owns the returned descriptor and must close it.
+        """
+        return _open_nonblocking(self._character_device_path)
+
+    def events(self, batch=False):
+        """Asynchronously iterate over the events of the device, Linux-only.
+
+        async for event in gamepad.events():
+            ...
+
+        The device is opened right away with its own non-blocking
+        descriptor, closed when the iteration ends. See read_events_async.
+        """
+        return read_events_async(self.open_nonblocking(), self._make_event,
+                                 batch=batch, close=True)
+
     @staticmethod
     def _get_target_function():
         """Get the correct target function. This is only used by Windows
@@ -2502,15 +682,7 @@ class InputDevice(object):  # pylint: disable=useless-object-inheritance
     # pylint: disable=too-many-arguments
     def _make_event(self, tv_sec, tv_usec, ev_type, code, value):
         """Create a friendly Python object from an evdev style event."""
-        event_type = self.manager.get_event_type(ev_type)
-        eventinfo = {
-            "ev_type": event_type,
-            "state": value,
-            "timestamp": tv_sec + (tv_usec / 1000000),
-            "code": self.manager.get_event_string(event_type, code)
-        }
-
-        return InputEvent(self, eventinfo)
+        return InputEvent(self, tv_sec, tv_usec, ev_type, code, value)
 
     def read(self):
         """Read the next input event."""
@@ -2528,6 +700,8 @@ class InputDevice(object):  # pylint: disable=useless-object-inheritance
             if not target_function:
                 return None
 
+            # pylint: disable=import-outside-toplevel
+            from multiprocessing import Process, Pipe
             self.__pipe, child_conn = Pipe(duplex=False)
             self._listener = Process(target=target_function,
                                      args=(child_conn,), daemon=True)
@@ -2624,19 +798,6 @@ class MightyMouse(Mouse):
         return quartz_mouse_process
 
 
-def delay_and_stop(duration, dll, device_number):
-    """Stop vibration aka force feedback aka rumble on
-    Windows after duration miliseconds."""
-    xinput = getattr(ctypes.windll, dll)
-    time.sleep(duration/1000)
-    xinput_set_state = xinput.XInputSetState
-    xinput_set_state.argtypes = [
-        ctypes.c_uint, ctypes.POINTER(XinputVibration)]
-    xinput_set_state.restype = ctypes.c_uint
-    vibration = XinputVibration(0, 0)
-    xinput_set_state(device_number, ctypes.byref(vibration))
-
-
 # I made this GamePad class before Mouse and Keyboard above, and have
 # learned a lot about Windows in the process.  This can probably be
 # simplified massively and made to match Mouse and Keyboard more.
@@ -2650,6 +811,14 @@ class GamePad(InputDevice):
                                       device_path,
                                       char_path_override)
         self._write_file = None
+        # Held while the motors are controlled or the device is closed,
+        # the rumble may be played from another thread than the one
+        # publishing the devices.
+        self._write_lock = threading.RLock()
+        # Uploaded rumble effect ids, least recently used first.
+        self._effects = OrderedDict()
+        self._max_effects = None
+        self._playing_effect = None
         self.__device_number = None
         if WIN:
             if "Microsoft_Corporation_Controller" in self._device_path:
@@ -2667,7 +836,7 @@ class GamePad(InputDevice):
         js_path = self._device_path.replace('-event', '')
         js_chardev = os.path.realpath(js_path)
         try:
-            number_text = js_chardev.split('js')[1]
+            number_text = os.path.basename(js_chardev).split('js')[1]
         except IndexError:
             return
         try:
@@ -2680,6 +849,14 @@ class GamePad(InputDevice):
         """Return the joystick number of the gamepad."""
         return self.__device_number
 
+    def get_joystick_path(self):
+        """Return the joystick API node of the gamepad, jsN in the
+        manager's dev_input_dir, or None when it has none, Linux-only."""
+        if not NIX or self.__device_number is None:
+            return None
+        return os.path.join(self.manager.dev_input_dir,
+                            'js%d' % self.__device_number)
+
     def __iter__(self):
         while True:
             if WIN:
@@ -2943,6 +1120,8 @@ class GamePad(InputDevice):
 
     def _set_vibration_win(self, left_motor, right_motor, duration):
         """Control the motors on Windows."""
+        # pylint: disable=import-outside-toplevel
+        from multiprocessing import Process
         self._start_vibration_win(left_motor, right_motor)
         stop_process = Process(target=delay_and_stop,
                                args=(duration,
@@ -2950,27 +1129,120 @@ class GamePad(InputDevice):
                                      self.__device_number))
         stop_process.start()
 
+    def _get_max_effects(self):
+        """Get how many effects the device can hold at once."""
+        if self._max_effects is None:
+            buf = bytearray(4)
+            try:
+                ioctl(self._write_device,
+                      evdev_ioctl(IOC_READ, 0x84, 4), buf, True)
+                self._max_effects = struct.unpack('i', buf)[0]
+            except (IOError, OSError):
+                self._max_effects = 0
+            if self._max_effects <= 0:
+                self._max_effects = FF_DEFAULT_EFFECTS
+        return self._max_effects
+
+    def __upload_effect(self, strong, weak, duration):
+        """Upload a new rumble effect and get its id."""
+        effect = bytearray(FF_RUMBLE_EFFECT.pack(
+            0x50, -1, duration, 0, strong, weak))
+        # The kernel writes the id of the new effect in the structure.
+        ioctl(self._write_device,
+              evdev_ioctl(IOC_WRITE, 0x80, FF_RUMBLE_EFFECT.size),
+              effect, True)
+        return struct.unpack_from('h', effect, 2)[0]
+
+    def __erase_oldest_effect(self):
+        """Free the slot of the least recently played effect."""
+        _, effect_id = self._effects.popitem(last=False)
+        ioctl(self._write_device, evdev_ioctl(IOC_WRITE, 0x81, 4), effect_id)
+
     def __get_vibration_code(self, left_motor, right_motor, duration):
-        """This is some crazy voodoo, if you can simplify it, please do."""
-        inner_event = struct.pack(
-            '2h6x2h2x2H28x',
-            0x50,
-            -1,
-            duration,
-            0,
-            int(left_motor * 65535),
-            int(right_motor * 65535))
-        buf_conts = ioctl(self._write_device, 1076905344, inner_event)
-        return int(codecs.encode(buf_conts[1:3], 'hex'), 16)
+        """Get the id of a rumble effect, only uploaded the first time
+        it is used."""
+        key = (int(left_motor * 65535), int(right_motor * 65535), duration)
+        effect_id = self._effects.get(key)
+        if effect_id is not None:
+            self._effects.move_to_end(key)
+            return effect_id
+        while len(self._effects) >= self._get_max_effects():
+            self.__erase_oldest_effect()
+        try:
+            effect_id = self.__upload_effect(*key)
+        except (IOError, OSError) as err:
+            # The other clients of the device may hold the slots.
+            if err.errno != errno.ENOSPC or not self._effects:
+                raise
+            self.__erase_oldest_effect()
+            effect_id = self.__upload_effect(*key)
+        self._effects[key] = effect_id
+        return effect_id
 
-    def _set_vibration_nix(self, left_motor, right_motor, duration):
-        """Control the motors on Linux.
-        Duration is in miliseconds."""
+    def __play_effect(self, left_motor, right_motor, duration):
+        """Upload the effect when needed and play it."""
         code = self.__get_vibration_code(left_motor, right_motor, duration)
         secs, msecs = convert_timeval(time.time())
-        outer_event = struct.pack(EVENT_FORMAT, secs, msecs, 0x15, code, 1)
+        outer_event = struct.pack(EVENT_FORMAT, secs, msecs, EV_FF, code, 1)
         self._write_device.write(outer_event)
         self._write_device.flush()
+        self._playing_effect = code
+
+    def __stop_effect(self):
+        """Stop the last played effect."""
+        if self._playing_effect is None:
+            return
+        secs, msecs = convert_timeval(time.time())
+        outer_event = struct.pack(
+            EVENT_FORMAT, secs, msecs, EV_FF, self._playing_effect, 0)
+        self._write_device.write(outer_event)
+        self._write_device.flush()
+        self._playing_effect = None
+
+    def _set_vibration_nix(self, left_motor, right_motor, duration):
+        """Control the motors on Linux.
+        Duration is in miliseconds."""
+        try:
+            self.__play_effect(left_motor, right_motor, duration)
+        except (IOError, OSError) as err:
+            if err.errno == errno.ENODEV:
+                self.close()
+                raise UnpluggedError("Gamepad %s was unplugged" % self.name)
+            raise
+
+    def _stop_vibration_nix(self):
+        """Stop the motors on Linux."""
+        try:
+            self.__stop_effect()
+        except (IOError, OSError) as err:
+            if err.errno == errno.ENODEV:
+                self.close()
+                raise UnpluggedError("Gamepad %s was unplugged" % self.name)
+            raise
+
+    def close(self):
+        """Close the files opened to read and control the device.
+
+        The kernel frees the uploaded effects.
+        """
+        with self._write_lock:
+            super(GamePad, self).close()
+            self._effects.clear()
+            self._max_effects = None
+            self._playing_effect = None
+            if self._write_file:
+                try:
+                    self._write_file.close()
+                except (IOError, OSError):
+                    # Unplugged, the buffered play event can not be flushed.
+                    pass
+                self._write_file = None
+
+    def __check_plugged(self):
+        """Raise UnpluggedError when the manager forgot the device, so
+        its node is not opened again. Call with the write lock held."""
+        if self.stale:
+            raise UnpluggedError("Gamepad %s was unplugged" % self.name)
 
     def set_vibration(self, left_motor, right_motor, duration):
         """Control the speed of both motors seperately or together.
@@ -2980,10 +1252,36 @@ class GamePad(InputDevice):
         if WIN:
             self._set_vibration_win(left_motor, right_motor, duration)
         elif NIX:
-            self._set_vibration_nix(left_motor, right_motor, duration)
+            with self._write_lock:
+                self.__check_plugged()
+                self._set_vibration_nix(left_motor, right_motor, duration)
         else:
             raise NotImplementedError
 
+    def stop_vibration(self):
+        """Stop the motors before the end of the vibration."""
+        if WIN:
+            self._stop_vibration_win()
+        elif NIX:
+            with self._write_lock:
+                self.__check_plugged()
+                self._stop_vibration_nix()
+        else:
+            raise NotImplementedError
+
+
+class MotionSensor(InputDevice):
+    """The accelerometer and gyroscope of a gamepad, see
+    DeviceManager.get_motion_sensor."""
+    pass
+
+
+class Touchpad(InputDevice):
+    """The multi-touch surface of a gamepad, see
+    DeviceManager.get_touchpad. It has no symlink, its device path is its
+    node."""
+    pass
+
 
 class OtherDevice(InputDevice):
     """A device of which its is type is either undetectable or has not
@@ -3095,7 +1393,8 @@ class SystemLED(LED):
                 print("Failed with", self.name)
                 raise
             else:
-                self._character_device_path = '/dev/input/event' + event_number
+                self._character_device_path = os.path.join(
+                    self.manager.dev_input_dir, 'event' + event_number)
                 self._match_device()
 
     def on(self):  # pylint: disable=invalid-name
@@ -3145,37 +1444,532 @@ class GamepadLED(LED):
                 break
 
 
-class RawInputDeviceList(ctypes.Structure):
+# inotify flags, see inotify(7).
+IN_ATTRIB = 0x00000004
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_ISDIR = 0x40000000
+
+# struct inotify_event without its variable length name.
+INOTIFY_EVENT = struct.Struct('iIII')
+
+
+class DeviceWatcher(object):  # pylint: disable=useless-object-inheritance
+    """Watch directories of /dev/input for device nodes and symlinks
+    being created or removed, Linux-only.
+
+    Directories that do not exist yet, like /dev/input/by-id when no
+    device is plugged in, are watched as soon as they are created in
+    their parent directory.
+
+    The nodes are also reported when their attributes change: devtmpfs
+    creates them readable by root only, udev changes their mode after.
+    """
+
+    WATCH_MASK = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO
+    ROOT_WATCH_MASK = WATCH_MASK | IN_ATTRIB
+
+    def __init__(self, root='/dev/input', subdirectories=('by-id', 'by-path')):
+        self._libc = ctypes.CDLL(None, use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self._root = root
+        self._subdirectories = subdirectories
+        self._watches = {}
+        if not self._add_watch(root, self.ROOT_WATCH_MASK):
+            err = ctypes.get_errno()
+            self.close()
+            raise OSError(err, os.strerror(err), root)
+        for subdirectory in subdirectories:
+            self._add_watch(os.path.join(root, subdirectory))
+
+    def _add_watch(self, path, mask=WATCH_MASK):
+        """Watch a directory, ignored if it does not exist."""
+        descriptor = self._libc.inotify_add_watch(
+            self._fd, path.encode(), mask)
+        if descriptor >= 0:
+            self._watches[descriptor] = path
+        return descriptor >= 0
+
+    def fileno(self):
+        """The inotify descriptor, readable when something changed."""
+        return self._fd
+
+    def read(self):
+        """Get the changes since the last call, without blocking.
+
+        Returns a list of (path, created) pairs in the order they
+        happened, created is also true for a node whose attributes
+        changed. A watched subdirectory created in the meantime is
+        reported with all the entries it already contains.
+        """
+        changes = []
+        while True:
+            try:
+                data = os.read(self._fd, 4096)
+            except OSError as err:
+                if err.errno == errno.EAGAIN:
+                    break
+                raise
+            offset = 0
+            while offset < len(data):
+                descriptor, mask, _, length = INOTIFY_EVENT.unpack_from(
+                    data, offset)
+                offset += INOTIFY_EVENT.size
+                name = data[offset:offset + length].rstrip(b'\0').decode()
+                offset += length
+                directory = self._watches.get(descriptor)
+                if directory is None or not name:
+                    continue
+                path = os.path.join(directory, name)
+                created = bool(mask & (IN_CREATE | IN_MOVED_TO))
+                if (mask & IN_ISDIR and directory == self._root and
+                        name in self._subdirectories):
+                    if created and self._add_watch(path):
+                        changes.extend((os.path.join(path, entry), True)
+                                       for entry in sorted(os.listdir(path)))
+                    continue
+                changes.append((path, created or bool(mask & IN_ATTRIB)))
+        return changes
+
+    def close(self):
+        """Stop watching."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class DiscoveryCache(object):  # pylint: disable=useless-object-inheritance
+    """Results of the Linux device discovery persisted in a JSON file.
+
+    Each device path is mapped to its character device, name and type.
+    The entries are only trusted while the mtime and inode of the watched
+    directories are unchanged. Any device plugged or unplugged adds or
+    removes a node in /dev/input, so this is cheap to check and does not
+    touch sysfs.
+    """
+
+    VERSION = 4
+
+    def __init__(self, path,
+                 directories=('/dev/input',
+                              '/dev/input/by-id',
+                              '/dev/input/by-path')):
+        self.path = path
+        self.directories = directories
+        self.entries = {}
+        self.fresh = False
+        # What was looked for, entries of another scope are not trusted.
+        self.scope = None
+        self._stamps = None
+
+    def _get_stamps(self):
+        """Get the mtime and inode of each watched directory."""
+        stamps = {}
+        for directory in self.directories:
+            try:
+                stat = os.stat(directory)
+            except OSError:
+                stamps[directory] = None
+            else:
+                stamps[directory] = [stat.st_mtime_ns, stat.st_ino]
+        return stamps
+
+    def begin(self):
+        """Stamp the directories, before looking at their content."""
+        self._stamps = self._get_stamps()
+
+    def load(self):
+        """Stamp the directories and load the file.
+
+        fresh tells whether the loaded entries can be trusted.
+        """
+        self.begin()
+        self.entries = {}
+        self.fresh = False
+        import json  # pylint: disable=import-outside-toplevel
+        try:
+            with open(self.path) as cache_file:
+                data = json.load(cache_file)
+        except (IOError, OSError, ValueError):
+            return
+        if (not isinstance(data, dict) or
+                data.get('version') != self.VERSION or
+                data.get('scope') != self.scope or
+                data.get('stamps') != self._stamps):
+            return
+        self.entries = data['devices']
+        self.fresh = True
+
+    def record(self, device_path, char_path, name, device_type,
+               char_path_override=None, capabilities=None):
+        """Remember a discovered device."""
+        # pylint: disable=too-many-arguments
+        self.entries[device_path] = {
+            'char_path': char_path,
+            'name': name,
+            'type': device_type,
+            'override': char_path_override,
+            'capabilities': (
+                list(capabilities) if capabilities is not None else None)}
+
+    def forget(self, device_path):
+        """Forget a removed device."""
+        self.entries.pop(device_path, None)
+
+    def save(self):
+        """Write the entries with the stamps taken by begin()."""
+        import json  # pylint: disable=import-outside-toplevel
+        data = {
+            'version': self.VERSION,
+            'scope': self.scope,
+            'stamps': self._stamps,
+            'devices': self.entries}
+        directory = os.path.dirname(self.path)
+        temporary_path = self.path + '.tmp'
+        try:
+            if directory and not os.path.isdir(directory):
+                os.makedirs(directory)
+            with open(temporary_path, 'w') as cache_file:
+                json.dump(data, cache_file)
+            os.replace(temporary_path, self.path)
+        except (IOError, OSError) as err:
+            warn("Could not save the device discovery cache: %s" % err,
+                 RuntimeWarning)
+
+
+def resolve_link(path):
+    """Get the target of a /dev/input symlink.
+
+    A single readlink is enough for the udev by-id and by-path links
+    (e.g. ../event3). That is much cheaper than os.path.realpath, which
+    is used for anything else.
+    """
+    try:
+        target = os.readlink(path)
+    except OSError:
+        return os.path.realpath(path)
+    resolved = os.path.normpath(os.path.join(os.path.dirname(path), target))
+    if os.path.islink(resolved):
+        return os.path.realpath(resolved)
+    return resolved
+
+
+# ioctl numbers of the evdev interface, see linux/input.h.
+IOC_WRITE = 1
+IOC_READ = 2
+
+# Sizes of the capability bitmaps, in bytes.
+EV_CNT = 0x20
+KEY_CNT = 0x300
+ABS_CNT = 0x40
+INPUT_PROP_CNT = 0x20
+
+ABS_X = 0x00
+ABS_Y = 0x01
+
+# Set on the motion sensor nodes of gamepads, see linux/input.h.
+INPUT_PROP_ACCELEROMETER = 0x06
+
+# Multi-touch axes (protocol B).
+ABS_MT_SLOT = 0x2f
+ABS_MT_POSITION_X = 0x35
+ABS_MT_POSITION_Y = 0x36
+ABS_MT_TRACKING_ID = 0x39
+
+# Button ranges of joysticks and gamepads.
+BTN_JOYSTICK_RANGE = range(0x120, 0x130)
+BTN_GAMEPAD_RANGE = range(0x130, 0x140)
+
+
+def evdev_ioctl(direction, number, size):
+    """Build the number of an evdev ioctl request ('E' type)."""
+    return (direction << 30) | (size << 16) | (ord('E') << 8) | number
+
+
+def _get_bits(fd, number, size):
+    """Read a capability bitmap as an integer."""
+    buf = bytearray(size)
+    ioctl(fd, evdev_ioctl(IOC_READ, number, size), buf, True)
+    return int.from_bytes(bytes(buf), 'little')
+
+
+class Capabilities(namedtuple(
+        'Capabilities', ('events', 'keys', 'axes', 'properties'))):
+    """What an evdev node reports, as integer bitmaps."""
+    __slots__ = ()
+
+    def has_event(self, ev_type):
+        """Whether the node sends events of this type."""
+        return bool(self.events >> ev_type & 1)
+
+    def has_key(self, code):
+        """Whether the node has this key or button."""
+        return bool(self.keys >> code & 1)
+
+    def has_axis(self, code):
+        """Whether the node has this absolute axis."""
+        return bool(self.axes >> code & 1)
+
+    def has_property(self, prop):
+        """Whether the node has this INPUT_PROP_* property."""
+        return bool(self.properties >> prop & 1)
+
+    def is_motion_sensor(self):
+        """Whether the node is the accelerometer and gyroscope of a
+        gamepad, a separate node of the same device on Linux."""
+        return (self.has_property(INPUT_PROP_ACCELEROMETER) and
+                self.has_event(EV_ABS))
+
+    def is_touchpad(self):
+        """Whether the node reports the contacts of a multi-touch surface
+        by slots."""
+        return (self.has_axis(ABS_MT_SLOT) and
+                self.has_axis(ABS_MT_POSITION_X) and
+                self.has_axis(ABS_MT_POSITION_Y))
+
+    def is_gamepad(self):
+        """Whether the node has a stick and gamepad or joystick buttons."""
+        if not (self.has_event(EV_KEY) and self.has_event(EV_ABS)):
+            return False
+        if not (self.has_axis(ABS_X) and self.has_axis(ABS_Y)):
+            return False
+        return any(self.has_key(code) for code in BTN_GAMEPAD_RANGE) or any(
+            self.has_key(code) for code in BTN_JOYSTICK_RANGE)
+
+
+def query_capabilities(fd):
+    """Ask the kernel what an open evdev node can do."""
+    return Capabilities(
+        _get_bits(fd, 0x20, EV_CNT // 8),
+        _get_bits(fd, 0x20 + EV_KEY, KEY_CNT // 8),
+        _get_bits(fd, 0x20 + EV_ABS, ABS_CNT // 8),
+        _get_bits(fd, 0x09, INPUT_PROP_CNT // 8))
+
+
+# struct input_absinfo.
+ABS_INFO = struct.Struct('6i')
+
+AbsInfo = namedtuple(
+    'AbsInfo', ('value', 'minimum', 'maximum', 'fuzz', 'flat', 'resolution'))
+
+
+def query_abs_info(fd, code):
+    """Get the AbsInfo of an absolute axis of an open evdev node."""
+    buf = bytearray(ABS_INFO.size)
+    ioctl(fd, evdev_ioctl(IOC_READ, 0x40 + code, ABS_INFO.size), buf, True)
+    return AbsInfo(*ABS_INFO.unpack(buf))
+
+
+def query_state(fd, keys):
+    """Get the current value of the keys and absolute axes of an open
+    evdev node, e.g. to resync after a SYN_DROPPED.
+
+    Returns a dict mapping each event key (see event_key) of keys the
+    node has to its value, the other keys are skipped.
     """
-    Contains information about a raw input device.
+    capabilities = query_capabilities(fd)
+    pressed = _get_bits(fd, 0x18, KEY_CNT // 8)
+    state = {}
+    for key in keys:
+        ev_type, code = key >> 16, key & 0xffff
+        if ev_type == EV_KEY and capabilities.has_key(code):
+            state[key] = pressed >> code & 1
+        elif ev_type == EV_ABS and capabilities.has_axis(code):
+            state[key] = query_abs_info(fd, code).value
+    return state
+
+
+def query_mt_slots(fd, code, slots):
+    """Get the values of a multi-touch axis (ABS_MT_*) in the first slots
+    of an open evdev node, with EVIOCGMTSLOTS."""
+    # struct input_mt_request_layout: the code, then a value per slot.
+    buf = bytearray(4 * (slots + 1))
+    struct.pack_into('I', buf, 0, code)
+    ioctl(fd, evdev_ioctl(IOC_READ, 0x0a, len(buf)), buf, True)
+    return struct.unpack_from('%di' % slots, buf, 4)
+
+
+# Clocks of the event timestamps, see EVIOCSCLOCKID.
+CLOCK_REALTIME = 0
+CLOCK_MONOTONIC = 1
+
+
+def set_clock(fd, clock_id=CLOCK_MONOTONIC):
+    """Choose the clock of the event timestamps of an open evdev node.
+
+    Returns False when the node does not support it, its timestamps then
+    stay on CLOCK_REALTIME.
+    """
+    try:
+        ioctl(fd, evdev_ioctl(IOC_WRITE, 0xa0, 4), struct.pack('i', clock_id))
+    except (IOError, OSError) as err:
+        if err.errno in (errno.EINVAL, errno.ENOTTY):
+            return False
+        raise
+    return True
+
+
+# Number of codes of the event types EVIOCSMASK accepts. The EV_SYN mask
+# selects whole event types.
+MASK_CODE_COUNTS = {
+    EV_SYN: EV_CNT,
+    EV_KEY: KEY_CNT,
+    0x02: 0x10,  # EV_REL
+    EV_ABS: ABS_CNT,
+    EV_MSC: 0x08,
+    0x05: 0x11,  # EV_SW
+    0x11: 0x10,  # EV_LED
+    0x12: 0x08,  # EV_SND
+    EV_FF: 0x80,
+}
 
-    For full details see Microsoft's documentation:
+# struct input_mask: type, codes_size, codes_ptr.
+INPUT_MASK = struct.Struct('IIQ')
 
-    http://msdn.microsoft.com/en-us/library/windows/desktop/
-    ms645568(v=vs.85).aspx
+
+def _set_mask(fd, ev_type, codes):
+    """Only let the given codes of an event type through."""
+    size = MASK_CODE_COUNTS[ev_type] // 8
+    bits = bytearray(size)
+    for code in codes:
+        bits[code // 8] |= 1 << code % 8
+    address = ctypes.addressof((ctypes.c_char * size).from_buffer(bits))
+    ioctl(fd, evdev_ioctl(IOC_WRITE, 0x93, INPUT_MASK.size),
+          INPUT_MASK.pack(ev_type, size, address))
+
+
+def set_event_mask(fd, keys):
+    """Ask the kernel to only queue the events of an open evdev node
+    whose key (see event_key) is in keys, and the EV_SYN events.
+
+    Returns False when the kernel can not mask events (before Linux
+    4.4), the events then have to be filtered with filter_events.
     """
-    # pylint: disable=too-few-public-methods
-    _fields_ = [
-        ("hDevice", HANDLE),
-        ("dwType", DWORD)
-    ]
+    codes = {EV_SYN: {EV_SYN}}
+    for key in keys:
+        ev_type, code = key >> 16, key & 0xffff
+        if ev_type not in MASK_CODE_COUNTS:
+            return False
+        codes.setdefault(ev_type, set()).add(code)
+        codes[EV_SYN].add(ev_type)
+    try:
+        for ev_type, type_codes in codes.items():
+            _set_mask(fd, ev_type, type_codes)
+    except (IOError, OSError) as err:
+        if err.errno in (errno.EINVAL, errno.ENOTTY):
+            return False
+        raise
+    return True
+
+
+def filter_events(data, keys):
+    """Keep the events of raw data whose key is in keys, and the EV_SYN
+    events, like set_event_mask does in the kernel."""
+    view = memoryview(data)
+    return b''.join(
+        view[offset:offset + EVENT_SIZE]
+        for offset, (_, _, ev_type, code, _) in zip(
+            count(0, EVENT_SIZE), iter_unpack(data))
+        if ev_type == EV_SYN or event_key(ev_type, code) in keys)
+
+
+class DeviceRegistry(namedtuple('DeviceRegistry', (
+        'generation', 'keyboards', 'mice', 'gamepads', 'other_devices',
+        'all_devices', 'leds', 'microbits', 'motion_sensors'))):
+    """The devices of a DeviceManager at a given time, as tuples.
+
+    A registry is never modified, each change publishes a new one with the
+    next generation. Readers never lock, they can keep a registry as long
+    as they want and compare its generation with the manager's to know
+    whether it is still current.
+    """
+    __slots__ = ()
+
+
+EMPTY_REGISTRY = DeviceRegistry(0, (), (), (), (), (), (), (), ())
+
+
+def _discovered_list(name, settable=True):
+    """A DeviceManager tuple of devices, from its current registry, which
+    triggers device discovery when first accessed."""
+
+    def getter(self):
+        # pylint: disable=protected-access
+        self._discover()
+        return getattr(self._registry, name)
+
+    def setter(self, value):
+        # pylint: disable=protected-access
+        with self._discovery_lock:
+            setattr(self, '_' + name, list(value))
+            self._publish()
+
+    return property(getter, setter if settable else None)
 
 
 class DeviceManager(object):  # pylint: disable=useless-object-inheritance
     """Provides access to all connected and detectible user input
-    devices."""
+    devices.
+
+    Devices are only discovered on first access to one of the device
+    lists, so creating the manager (and importing this module) costs
+    nothing.
+
+    The device lists are tuples of the current DeviceRegistry. They are
+    replaced, never modified, so other threads can iterate them without
+    locking.
+    """
     # pylint: disable=too-many-instance-attributes
 
-    def __init__(self):
-        self.codes = {key: dict(value) for key, value in EVENT_MAP}
-        self._raw = []
-        self.keyboards = []
-        self.mice = []
-        self.gamepads = []
-        self.other_devices = []
-        self.all_devices = []
-        self.leds = []
-        self.microbits = []
+    keyboards = _discovered_list('keyboards')
+    mice = _discovered_list('mice')
+    gamepads = _discovered_list('gamepads')
+    other_devices = _discovered_list('other_devices')
+    all_devices = _discovered_list('all_devices', settable=False)
+    leds = _discovered_list('leds')
+    microbits = _discovered_list('microbits')
+    motion_sensors = _discovered_list('motion_sensors')
+
+    def __init__(self, dev_input_dir='/dev/input', sys_class_dir='/sys/class'):
+        self.dev_input_dir = dev_input_dir
+        self.sys_input_dir = os.path.join(sys_class_dir, 'input')
+        self.sys_leds_dir = os.path.join(sys_class_dir, 'leds')
+        self._codes = None
+        self._event_names = None
+        self._event_keys = None
+        self._discovered = False
+        self._discovering = False
+        self._discovery_lock = threading.RLock()
+        self._raw = set()
+        # The lists of the devices, only used by the discovering thread,
+        # readers get the tuples of the published registry.
+        self._keyboards = []
+        self._mice = []
+        self._gamepads = []
+        self._other_devices = []
+        self._leds = []
+        self._microbits = []
+        self._motion_sensors = []
+        self._registry = EMPTY_REGISTRY
+        self._watcher = None
+        # Path of the DiscoveryCache file, no cache when None.
+        self.discovery_cache_path = None
+        self._discovery_cache = None
+        self._known_names = {}
+        # Only keep the nodes that are gamepads (and their motion
+        # sensors), on Linux. The other devices are then never opened nor
+        # read.
+        self.gamepads_only = False
+        self._capabilities = {}
+        # Physical device of each node, see get_motion_sensor.
+        self._physical_devices = {}
+        # Touchpads found next to the gamepads, by node.
+        self._touchpads = {}
         self.xinput = None
         self.xinput_dll = None
         if WIN:
@@ -3185,7 +1979,221 @@ class DeviceManager(object):  # pylint: disable=useless-object-inheritance
                 'otherhid': 0,
                 'unknown': 0
             }
-        self._post_init()
+
+    @property
+    def codes(self):
+        """The code tables of _inputs_codes.EVENT_MAP as dicts, only
+        loaded and built when first needed."""
+        if self._codes is None:
+            # pylint: disable=import-outside-toplevel
+            from ._inputs_codes import EVENT_MAP
+            self._codes = {key: dict(value) for key, value in EVENT_MAP}
+        return self._codes
+
+    def _discover(self):
+        """Discover the devices, once."""
+        if self._discovered:
+            return
+        # Other threads wait for the discovery to finish, the discovering
+        # thread itself goes through when filling the lists.
+        with self._discovery_lock:
+            if self._discovered or self._discovering:
+                return
+            self._discovering = True
+            try:
+                self._post_init()
+            finally:
+                self._discovering = False
+                self._discovered = True
+
+    def rescan(self):
+        """Forget all the devices and discover them again.
+
+        Readers keep the previous devices until the new ones are
+        published.
+        """
+        self._discover()
+        with self._discovery_lock:
+            self._raw = set()
+            self._capabilities = {}
+            # The cached touchpads are closed when published.
+            self._physical_devices = {}
+            self._keyboards = []
+            self._mice = []
+            self._gamepads = []
+            self._other_devices = []
+            self._leds = []
+            self._microbits = []
+            self._motion_sensors = []
+            self._discovering = True
+            try:
+                self._post_init()
+            finally:
+                self._discovering = False
+
+    @property
+    def registry(self):
+        """The current DeviceRegistry."""
+        self._discover()
+        return self._registry
+
+    @property
+    def generation(self):
+        """The generation of the current DeviceRegistry, increased each
+        time devices are added or removed."""
+        self._discover()
+        return self._registry.generation
+
+    def _publish(self):
+        """Publish the device lists in a new registry.
+
+        The devices which are not in it anymore are closed and marked
+        stale.
+        """
+        previous = self._registry
+        all_devices = tuple(self._keyboards + self._mice + self._gamepads +
+                            self._other_devices + self._motion_sensors)
+        # A single assignment, readers see the old or the new registry.
+        self._registry = DeviceRegistry(
+            previous.generation + 1, tuple(self._keyboards),
+            tuple(self._mice), tuple(self._gamepads),
+            tuple(self._other_devices), all_devices, tuple(self._leds),
+            tuple(self._microbits), tuple(self._motion_sensors))
+        current = set(all_devices)
+        current.update(self._microbits)
+        for device in previous.all_devices + previous.microbits:
+            if device not in current and not device.stale:
+                device.stale = True
+                device.close()
+        self._evict_touchpads()
+
+    def _evict_touchpads(self):
+        """Close and mark stale the cached touchpads whose gamepad is not
+        a published one anymore, or whose node was removed."""
+        if not self._touchpads:
+            return
+        physicals = set(self._get_physical_device(
+            gamepad.get_char_device_path()) for gamepad in self._gamepads)
+        for path, touchpad in list(self._touchpads.items()):
+            # Forgotten when the node is removed or on a rescan.
+            physical = self._physical_devices.get(path)
+            if physical is None or physical not in physicals:
+                del self._touchpads[path]
+                touchpad.stale = True
+                touchpad.close()
+
+    def _start_watcher(self):
+        """Start tracking plugged and unplugged devices, before scanning
+        so nothing happening during the scan is missed."""
+        if self._watcher is not None:
+            return
+        try:
+            self._watcher = DeviceWatcher(self.dev_input_dir)
+        except (OSError, AttributeError):
+            # No inotify, refresh() falls back to full rescans.
+            self._watcher = None
+
+    def close(self):
+        """Stop tracking plugged and unplugged devices, the devices
+        already found stay usable."""
+        with self._discovery_lock:
+            if self._watcher is not None:
+                self._watcher.close()
+                self._watcher = None
+
+    def hotplug_fileno(self):
+        """Get a descriptor that becomes readable when devices are plugged
+        or unplugged, or None when hot-plug tracking is not available.
+
+        Call refresh() when it is readable.
+        """
+        self._discover()
+        if self._watcher is None:
+            return None
+        return self._watcher.fileno()
+
+    def refresh(self):
+        """Apply the devices plugged and unplugged since the last call.
+
+        Cheap when nothing changed. Without hot-plug tracking, this is a
+        full rescan.
+        """
+        self._discover()
+        with self._discovery_lock:
+            if self._watcher is None:
+                self.rescan()
+                return
+            cache = self._discovery_cache
+            if cache is not None:
+                cache.begin()
+            changes = self._watcher.read()
+            changed = False
+            nodes = []
+            for path, created in changes:
+                if not created:
+                    self._remove_device_path(path)
+                    changed = True
+                elif os.path.dirname(path) == self.dev_input_dir:
+                    # Created, or its mode changed. The devices already
+                    # added are left alone.
+                    if path not in self._raw:
+                        nodes.append(path)
+                else:
+                    self._add_device_path(path)
+                    changed = True
+            # After the symlinks, like rescan() does.
+            for path in nodes:
+                self._add_device_node(path)
+            if changed or nodes:
+                self._publish()
+                if cache is not None:
+                    cache.save()
+
+    def _add_device_path(self, path):
+        """Add the device of a symlink created in /dev/input/by-*."""
+        directory, name = os.path.split(path)
+        if not os.path.basename(directory).startswith('by-'):
+            # Device nodes, see _add_device_node.
+            return
+        if '-event-' not in name:
+            return
+        try:
+            self._parse_device_path(path)
+        except (IOError, OSError):
+            # The device was unplugged right away.
+            self._raw.discard(os.path.realpath(path))
+
+    def _add_device_node(self, char_path):
+        """Add a node created in /dev/input without a symlink, when its
+        capabilities tell it is a gamepad or a motion sensor."""
+        if not os.path.basename(char_path).startswith('event'):
+            return
+        try:
+            self._add_by_capabilities(char_path)
+        except (IOError, OSError):
+            # The device was unplugged right away.
+            self._raw.discard(char_path)
+        if self._capabilities.get(char_path) is None:
+            # Maybe not readable yet, asked again when udev changes its
+            # mode, see DeviceWatcher.
+            self._capabilities.pop(char_path, None)
+
+    def _remove_device_path(self, path):
+        """Remove the devices of a removed node or symlink."""
+        # The node number can be reused by the next device plugged.
+        self._capabilities.pop(path, None)
+        self._physical_devices.pop(path, None)
+        for device_list in (self._keyboards, self._mice, self._gamepads,
+                            self._other_devices, self._microbits,
+                            self._motion_sensors):
+            for device in list(device_list):
+                # pylint: disable=protected-access
+                char_path = device.get_char_device_path()
+                if path in (device._device_path, char_path):
+                    device_list.remove(device)
+                    self._raw.discard(char_path)
+                    if self._discovery_cache is not None:
+                        self._discovery_cache.forget(device._device_path)
 
     def _post_init(self):
         """Call the find devices method for the relevant platform."""
@@ -3194,51 +2202,184 @@ class DeviceManager(object):  # pylint: disable=useless-object-inheritance
         elif MAC:
             self._find_devices_mac()
         else:
+            self._start_watcher()
             self._find_devices()
-        self._update_all_devices()
+        self._publish()
         if NIX:
+            # LEDs are matched with the published devices.
             self._find_leds()
+            self._publish()
 
-    def _update_all_devices(self):
-        """Update the all_devices list."""
-        self.all_devices = []
-        self.all_devices.extend(self.keyboards)
-        self.all_devices.extend(self.mice)
-        self.all_devices.extend(self.gamepads)
-        self.all_devices.extend(self.other_devices)
-
-    def _parse_device_path(self, device_path, char_path_override=None):
+    def _parse_device_path(self, device_path, char_path_override=None,
+                           realpath=None):
         """Parse each device and add to the approriate list."""
 
-        # 1. Make sure that we can parse the device path.
-        try:
-            device_type = device_path.rsplit('-', 1)[1]
-        except IndexError:
-            warn("The following device path was skipped as it could "
-                 "not be parsed: %s" % device_path, RuntimeWarning)
-            return
+        # 1. Make sure that we can parse the device path. A node without
+        # a symlink has no type in it, see _add_by_capabilities.
+        by_capabilities = (
+            os.path.dirname(device_path) == self.dev_input_dir)
+        if by_capabilities:
+            device_type = None
+        else:
+            try:
+                device_type = device_path.rsplit('-', 1)[1]
+            except IndexError:
+                warn("The following device path was skipped as it could "
+                     "not be parsed: %s" % device_path, RuntimeWarning)
+                return
 
         # 2. Make sure each device is only added once.
-        realpath = os.path.realpath(device_path)
+        if realpath is None:
+            realpath = os.path.realpath(device_path)
         if realpath in self._raw:
             return
-        self._raw.append(realpath)
 
-        # 3. All seems good, append the device to the relevant list.
+        # 3. Trust the capabilities of the node over the path suffix.
+        char_path = char_path_override or realpath
+        device_type = self._classify(device_type, char_path)
+        if device_type is None:
+            return
+        self._raw.add(realpath)
+
+        # 4. All seems good, append the device to the relevant list.
         if device_type == 'kbd':
-            self.keyboards.append(Keyboard(self, device_path,
-                                           char_path_override))
+            device = Keyboard(self, device_path, char_path)
+            self._keyboards.append(device)
         elif device_type == 'mouse':
-            self.mice.append(Mouse(self, device_path,
-                                   char_path_override))
+            device = Mouse(self, device_path, char_path)
+            self._mice.append(device)
         elif device_type == 'joystick':
-            self.gamepads.append(GamePad(self,
-                                         device_path,
-                                         char_path_override))
+            device = GamePad(self, device_path, char_path)
+            self._gamepads.append(device)
+        elif device_type == 'motion':
+            device = MotionSensor(self, device_path, char_path)
+            self._motion_sensors.append(device)
+        else:
+            device = OtherDevice(self, device_path, char_path)
+            self._other_devices.append(device)
+        device.by_capabilities = by_capabilities
+
+        if self._discovery_cache is not None:
+            self._discovery_cache.record(
+                device_path, realpath, device.name, device_type,
+                char_path_override, self._capabilities.get(char_path))
+
+    def get_capabilities(self, char_path):
+        """Get the Capabilities of a node, or None when they can not be
+        read. The node is only queried once."""
+        if not NIX:
+            return None
+        try:
+            return self._capabilities[char_path]
+        except KeyError:
+            pass
+        capabilities = None
+        try:
+            fd = os.open(char_path, os.O_RDONLY | os.O_NONBLOCK)
+        except OSError:
+            # Not allowed to open it, or gone.
+            pass
         else:
-            self.other_devices.append(OtherDevice(self,
-                                                  device_path,
-                                                  char_path_override))
+            try:
+                capabilities = query_capabilities(fd)
+            except (IOError, OSError):
+                # Not an evdev node.
+                pass
+            finally:
+                os.close(fd)
+        self._capabilities[char_path] = capabilities
+        return capabilities
+
+    def _classify(self, device_type, char_path):
+        """Get the type of a node from its capabilities, the type found
+        in its path (None for a node) is kept when they can not be read.
+
+        Returns None when the node is not wanted, see gamepads_only.
+        """
+        capabilities = self.get_capabilities(char_path)
+        if capabilities is not None:
+            if capabilities.is_gamepad():
+                device_type = 'joystick'
+            elif capabilities.is_motion_sensor():
+                device_type = 'motion'
+            elif device_type in ('joystick', 'motion'):
+                device_type = 'other'
+        if self.gamepads_only and device_type not in ('joystick', 'motion'):
+            return None
+        return device_type
+
+    def _get_physical_device(self, char_path):
+        """Get what identifies the physical device of a node: the sysfs
+        path of its parent (e.g. the HID device), or its unique id."""
+        try:
+            return self._physical_devices[char_path]
+        except KeyError:
+            pass
+        device_dir = os.path.join(
+            self.sys_input_dir, os.path.basename(char_path), 'device')
+        physical = None
+        parent = os.path.join(device_dir, 'device')
+        if os.path.exists(parent):
+            physical = os.path.realpath(parent)
+        else:
+            try:
+                with open(os.path.join(device_dir, 'uniq')) as uniq_file:
+                    physical = uniq_file.read().strip() or None
+            except (IOError, OSError):
+                pass
+        self._physical_devices[char_path] = physical
+        return physical
+
+    def get_motion_sensor(self, gamepad):
+        """Get the MotionSensor of the same physical device as a gamepad,
+        or None when it has none, Linux-only."""
+        physical = self._get_physical_device(gamepad.get_char_device_path())
+        if physical is None:
+            return None
+        for sensor in self.motion_sensors:
+            if self._get_physical_device(
+                    sensor.get_char_device_path()) == physical:
+                return sensor
+        return None
+
+    def get_touchpad(self, gamepad):
+        """Get the Touchpad of the same physical device as a gamepad, or
+        None when it has none, Linux-only.
+
+        Touchpads are not discovered with the other devices (laptop ones
+        are not wanted), only the nodes next to the gamepad's are looked
+        at, through sysfs.
+        """
+        char_path = gamepad.get_char_device_path()
+        with self._discovery_lock:
+            if gamepad.stale:
+                # Its touchpad would never be evicted.
+                return None
+            physical = self._get_physical_device(char_path)
+            if physical is None or not os.path.isdir(physical):
+                return None
+            import glob  # pylint: disable=import-outside-toplevel
+            for sibling in sorted(glob.glob(
+                    os.path.join(physical, 'input', 'input*', 'event*'))):
+                sibling_path = os.path.join(
+                    self.dev_input_dir, os.path.basename(sibling))
+                if sibling_path == char_path:
+                    continue
+                touchpad = self._touchpads.get(sibling_path)
+                if touchpad is None:
+                    capabilities = self.get_capabilities(sibling_path)
+                    if capabilities is None or not capabilities.is_touchpad():
+                        continue
+                    try:
+                        touchpad = Touchpad(self, sibling_path, sibling_path)
+                    except (IOError, OSError):
+                        # Unplugged in between.
+                        continue
+                    # Evicted with its gamepad, see _evict_touchpads.
+                    self._physical_devices[sibling_path] = physical
+                    self._touchpads[sibling_path] = touchpad
+                return touchpad
+        return None
 
     def _find_xinput(self):
         """Find most recent xinput library."""
@@ -3263,20 +2404,20 @@ class DeviceManager(object):  # pylint: disable=useless-object-inheritance
         self._detect_gamepads()
         self._count_devices()
         if self._raw_device_counts['keyboards'] > 0:
-            self.keyboards.append(Keyboard(
+            self._keyboards.append(Keyboard(
                 self,
                 "/dev/input/by-id/usb-A_Nice_Keyboard-event-kbd"))
 
         if self._raw_device_counts['mice'] > 0:
-            self.mice.append(Mouse(
+            self._mice.append(Mouse(
                 self,
                 "/dev/input/by-id/usb-A_Nice_Mouse_called_Arthur-event-mouse"))
 
     def _find_devices_mac(self):
         """Find devices on Mac."""
-        self.keyboards.append(Keyboard(self))
-        self.mice.append(MightyMouse(self))
-        self.mice.append(Mouse(self))
+        self._keyboards.append(Keyboard(self))
+        self._mice.append(MightyMouse(self))
+        self._mice.append(Mouse(self))
 
     def _detect_gamepads(self):
         """Find gamepads."""
@@ -3291,7 +2432,7 @@ class DeviceManager(object):  # pylint: disable=useless-object-inheritance
                     "/dev/input/by_id/" +
                     "usb-Microsoft_Corporation_Controller_%s-event-joystick"
                     % device_number)
-                self.gamepads.append(GamePad(self, device_path))
+                self._gamepads.append(GamePad(self, device_path))
                 continue
             if res != XINPUT_ERROR_DEVICE_NOT_CONNECTED:
                 raise RuntimeError(
@@ -3343,49 +2484,160 @@ class DeviceManager(object):  # pylint: disable=useless-object-inheritance
 
     def _find_devices(self):
         """Find available devices."""
-        self._find_by('id')
-        self._find_by('path')
-        self._find_special()
+        cache = self._load_discovery_cache()
+        try:
+            if cache is not None and cache.fresh:
+                # Nothing changed since the cache was written, replay it.
+                entries = list(cache.entries.items())
+                self._known_names = {
+                    entry['override'] or entry['char_path']: entry['name']
+                    for _, entry in entries}
+                for _, entry in entries:
+                    if entry['capabilities'] is not None:
+                        self._capabilities[
+                            entry['override'] or entry['char_path']] = (
+                                Capabilities(*entry['capabilities']))
+                for device_path, entry in entries:
+                    self._parse_device_path(device_path, entry['override'],
+                                            entry['char_path'])
+                return
+
+            self._find_by('id')
+            self._find_by('path')
+            self._find_by_capabilities()
+            self._find_special()
+            if cache is not None:
+                cache.save()
+        finally:
+            self._known_names = {}
+
+    def _load_discovery_cache(self):
+        """Load the discovery cache, if a path was given for it."""
+        if not self.discovery_cache_path:
+            self._discovery_cache = None
+        elif (self._discovery_cache is None or
+              self._discovery_cache.path != self.discovery_cache_path):
+            self._discovery_cache = DiscoveryCache(
+                self.discovery_cache_path,
+                (self.dev_input_dir,
+                 os.path.join(self.dev_input_dir, 'by-id'),
+                 os.path.join(self.dev_input_dir, 'by-path')))
+        if self._discovery_cache is not None:
+            self._discovery_cache.scope = (
+                'gamepads' if self.gamepads_only else 'all')
+            self._discovery_cache.load()
+        return self._discovery_cache
+
+    def get_known_name(self, char_path):
+        """Get the name of a device being discovered, when it is already
+        known from the cache or a batched sysfs read, or None."""
+        return self._known_names.get(char_path)
+
+    @staticmethod
+    def _read_files(paths):
+        """Read small text files, concurrently when there are many.
+
+        Returns the stripped contents in the same order, None for the files
+        that could not be read.
+        """
+        def read(path):
+            try:
+                with open(path) as text_file:
+                    return text_file.read().strip()
+            except (IOError, OSError):
+                return None
+
+        if len(paths) <= DISCOVERY_WORKERS:
+            return [read(path) for path in paths]
+        # pylint: disable=import-outside-toplevel
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=DISCOVERY_WORKERS) as executor:
+            return list(executor.map(read, paths))
+
+    def _read_names(self, char_paths):
+        """Read the sysfs names of character devices at once."""
+        char_paths = [char_path for char_path in char_paths
+                      if char_path not in self._known_names]
+        names = self._read_files([
+            os.path.join(self.sys_input_dir, os.path.basename(char_path),
+                         'device', 'name')
+            for char_path in char_paths])
+        for char_path, name in zip(char_paths, names):
+            if name is not None:
+                self._known_names[char_path] = name
 
     def _find_by(self, key):
         """Find devices."""
-        by_path = glob.glob('/dev/input/by-{key}/*-event-*'.format(key=key))
-        for device_path in by_path:
-            self._parse_device_path(device_path)
+        import glob  # pylint: disable=import-outside-toplevel
+        by_path = glob.glob(os.path.join(
+            self.dev_input_dir, 'by-{key}'.format(key=key), '*-event-*'))
+        realpaths = [resolve_link(device_path) for device_path in by_path]
+        # Only read the names of the devices that will be kept.
+        self._read_names({
+            realpath for device_path, realpath in zip(by_path, realpaths)
+            if realpath not in self._raw and self._classify(
+                device_path.rsplit('-', 1)[1], realpath) is not None})
+        for device_path, realpath in zip(by_path, realpaths):
+            self._parse_device_path(device_path, realpath=realpath)
+
+    def _find_by_capabilities(self):
+        """Find the gamepads and motion sensors without a symlink in by-id
+        or by-path."""
+        if not NIX:
+            return
+        import glob  # pylint: disable=import-outside-toplevel
+        for char_path in glob.glob(os.path.join(self.dev_input_dir,
+                                                'event*')):
+            self._add_by_capabilities(char_path)
+
+    def _add_by_capabilities(self, char_path):
+        """Add a node not found through a symlink when it is a gamepad or
+        a motion sensor."""
+        if char_path in self._raw:
+            return
+        capabilities = self.get_capabilities(char_path)
+        if capabilities is None:
+            return
+        if capabilities.is_gamepad() or capabilities.is_motion_sensor():
+            # The node is the device path, typed by its capabilities.
+            self._parse_device_path(char_path, char_path, char_path)
 
     def _find_leds(self):
         """Find LED devices, Linux-only so far."""
-        for path in glob.glob('/sys/class/leds/*'):
+        import glob  # pylint: disable=import-outside-toplevel
+        for path in glob.glob(os.path.join(self.sys_leds_dir, '*')):
             self._parse_led_path(path)
 
     def _parse_led_path(self, path):
         name = path.rsplit('/', 1)[1]
         if name.startswith('xpad'):
-            self.leds.append(GamepadLED(self, path, name))
+            self._leds.append(GamepadLED(self, path, name))
         elif name.startswith('input'):
-            self.leds.append(SystemLED(self, path, name))
+            self._leds.append(SystemLED(self, path, name))
         else:
-            self.leds.append(LED(self, path, name))
+            self._leds.append(LED(self, path, name))
 
     def _get_char_names(self):
-        """Get a list of already found devices."""
-        return [device.get_char_name() for
-                device in self.all_devices]
+        """Get the set of the char names of already found devices."""
+        return {os.path.basename(realpath) for realpath in self._raw}
 
     def _find_special(self):
         """Look for special devices."""
+        import glob  # pylint: disable=import-outside-toplevel
         charnames = self._get_char_names()
-        for eventdir in glob.glob('/sys/class/input/event*'):
-            char_name = os.path.split(eventdir)[1]
-            if char_name in charnames:
-                continue
-            name_file = os.path.join(eventdir, 'device', 'name')
-            with open(name_file) as name_file:
-                device_name = name_file.read().strip()
-                if device_name in self.codes['specials']:
-                    self._parse_device_path(
-                        self.codes['specials'][device_name],
-                        os.path.join('/dev/input', char_name))
+        eventdirs = [
+            eventdir for eventdir in
+            glob.glob(os.path.join(self.sys_input_dir, 'event*'))
+            if os.path.basename(eventdir) not in charnames]
+        device_names = self._read_files([
+            os.path.join(eventdir, 'device', 'name')
+            for eventdir in eventdirs])
+        for eventdir, device_name in zip(eventdirs, device_names):
+            if device_name in self.codes['specials']:
+                self._parse_device_path(
+                    self.codes['specials'][device_name],
+                    os.path.join(self.dev_input_dir,
+                                 os.path.basename(eventdir)))
 
     def __iter__(self):
         return iter(self.all_devices)
@@ -3420,6 +2672,30 @@ class DeviceManager(object):  # pylint: disable=useless-object-inheritance
         """Returns type code for `name`."""
         return self.codes['type_codes'][name]
 
+    def _build_event_tables(self):
+        """Flatten the per type code tables into tables keyed by event_key."""
+        names = {}
+        for type_code, type_name in self.codes['types'].items():
+            for code, name in self.codes.get(type_name, {}).items():
+                names[event_key(type_code, code)] = name
+        self._event_names = names
+        self._event_keys = {name: key for key, name in names.items()}
+
+    def get_event_name(self, key):
+        """Get the string name of an event from its event_key, or None."""
+        if self._event_names is None:
+            self._build_event_tables()
+        return self._event_names.get(key)
+
+    def get_event_key(self, name):
+        """Get the event_key of a string event name, e.g. 'ABS_X'."""
+        if self._event_keys is None:
+            self._build_event_tables()
+        try:
+            return self._event_keys[name]
+        except KeyError:
+            raise UnknownEventCode("We don't know this event.", name)
+
     def detect_microbit(self):
         """Detect a microbit."""
         try:
@@ -3431,8 +2707,497 @@ class DeviceManager(object):  # pylint: disable=useless-object-inheritance
                 "https://inputs.readthedocs.io/en/latest/user/microbit.html",
                 RuntimeWarning)
         else:
-            self.microbits.append(gpad)
-            self.gamepads.append(gpad)
+            with self._discovery_lock:
+                self._microbits.append(gpad)
+                self._gamepads.append(gpad)
+                self._publish()
+
+
+class EventBufferRing(object):  # pylint: disable=useless-object-inheritance
+    """Preallocated read buffers handed out in turn.
+
+    Each buffer holds events_per_buffer events, a memoryview handed out by
+    next() stays valid until the ring wraps around to it again.
+    """
+
+    def __init__(self, size=4, events_per_buffer=READ_BATCH):
+        self._views = [memoryview(bytearray(EVENT_SIZE * events_per_buffer))
+                       for _ in range(size)]
+        self._index = 0
+
+    def next(self):
+        """Get the next buffer of the ring."""
+        view = self._views[self._index]
+        self._index = (self._index + 1) % len(self._views)
+        return view
+
+
+def _read_into(fd, ring):
+    """Read everything queued on a non-blocking descriptor.
+
+    Yields memoryviews of the ring's buffers, each one holding whole
+    events. A view is only valid until the ring wraps around.
+    """
+    while True:
+        view = ring.next()
+        try:
+            size = os.readv(fd, [view])
+        except OSError as err:
+            if err.errno == errno.EAGAIN:
+                return
+            if err.errno == errno.ENODEV:
+                raise UnpluggedError("The device was unplugged.")
+            raise
+        if not size:
+            # End of file, e.g. a pipe standing in for a device was closed.
+            raise UnpluggedError("The device was closed.")
+        yield view[:size]
+        if size < len(view):
+            return
+
+
+async def read_events_async(fd, make_event=None, batch=False, close=False):
+    """Asynchronously iterate over the events of a non-blocking descriptor.
+
+    The descriptor is watched with loop.add_reader, so many devices,
+    sockets and timers can share one event loop. Each wakeup drains
+    everything queued; with batch=True the events read in one wakeup are
+    yielded together as a list.
+
+    make_event turns the raw (tv_sec, tv_usec, ev_type, code, value)
+    tuples into events, the tuples are yielded when it is None. When
+    close is True the descriptor is closed once the iteration ends,
+    including on cancellation. UnpluggedError is raised when the device
+    goes away or the descriptor reaches end of file.
+    """
+    import asyncio  # pylint: disable=import-outside-toplevel
+    loop = asyncio.get_event_loop()
+    ready = asyncio.Event()
+    ring = EventBufferRing(size=1)
+    loop.add_reader(fd, ready.set)
+    try:
+        while True:
+            await ready.wait()
+            ready.clear()
+            events = []
+            for view in _read_into(fd, ring):
+                if make_event is None:
+                    events.extend(iter_unpack(view))
+                else:
+                    events.extend(make_event(*event)
+                                  for event in iter_unpack(view))
+            if not events:
+                continue
+            if batch:
+                yield events
+            else:
+                for event in events:
+                    yield event
+    finally:
+        loop.remove_reader(fd)
+        if close:
+            os.close(fd)
+
+
+class DeviceReactor(object):  # pylint: disable=useless-object-inheritance
+    """Wait on many evdev character devices at once, Linux-only.
+
+    Each registered device gets its own non-blocking descriptor owned by
+    the reactor. A single epoll wakeup then drains everything queued by
+    every ready device, READ_BATCH events per read call, instead of one
+    blocking read per event and per device.
+
+    Reads go straight into a ring of preallocated buffers, see poll_into,
+    so the steady state reading loop does not allocate per report.
+
+    When event_keys is given (see event_key), only those events and the
+    EV_SYN ones are read. The kernel drops the others before they are
+    queued when it supports EVIOCSMASK, they are filtered after each read
+    otherwise.
+
+    The events are stamped with CLOCK_MONOTONIC, comparable with
+    time.monotonic_ns(), unless the device does not support it, see
+    is_monotonic.
+    """
+
+    def __init__(self, input_devices=None, event_keys=None):
+        self._ring = EventBufferRing()
+        self._epoll = select.epoll()
+        self._devices = {}
+        self._fds = {}
+        self._callbacks = {}
+        self._event_keys = (
+            frozenset(event_keys) if event_keys is not None else None)
+        # Descriptors whose events are filtered after each read.
+        self._unmasked = set()
+        # Descriptors whose events are stamped with CLOCK_REALTIME.
+        self._realtime = set()
+        for device in input_devices or ():
+            self.register(device)
+
+    def __len__(self):
+        return len(self._devices)
+
+    def __contains__(self, device):
+        return device in self._fds
+
+    def register(self, device):
+        """Start watching a device."""
+        if device in self._fds:
+            return
+        fd = device.open_nonblocking()
+        if (self._event_keys is not None and
+                not set_event_mask(fd, self._event_keys)):
+            self._unmasked.add(fd)
+        if not set_clock(fd, CLOCK_MONOTONIC):
+            self._realtime.add(fd)
+        self._epoll.register(fd, select.EPOLLIN)
+        self._devices[fd] = device
+        self._fds[device] = fd
+
+    def unregister(self, device):
+        """Stop watching a device and close its descriptor."""
+        fd = self._fds.pop(device, None)
+        if fd is None:
+            return
+        del self._devices[fd]
+        self._unmasked.discard(fd)
+        self._realtime.discard(fd)
+        try:
+            self._epoll.unregister(fd)
+        except (OSError, ValueError):
+            pass
+        os.close(fd)
+
+    def sync(self, input_devices):
+        """Watch exactly the given devices.
+
+        Devices that cannot be opened (unplugged in between, missing
+        permissions) are skipped so the caller can simply retry later.
+        """
+        wanted = set(input_devices)
+        for device in list(self._fds):
+            if device not in wanted:
+                self.unregister(device)
+        for device in wanted:
+            if device in self._fds:
+                continue
+            try:
+                self.register(device)
+            except (UnpluggedError, PermissionError):
+                pass
+
+    def fileno(self, device):
+        """Get the reactor's descriptor for a device."""
+        return self._fds[device]
+
+    def get_abs_info(self, device, code):
+        """Get the AbsInfo of an absolute axis of a device, None when it
+        can not be read."""
+        try:
+            return query_abs_info(self._fds[device], code)
+        except (IOError, OSError):
+            return None
+
+    def get_state(self, device, keys):
+        """Read the current state of a device from the kernel, see
+        query_state, None when it can not be read."""
+        try:
+            return query_state(self._fds[device], keys)
+        except (IOError, OSError):
+            return None
+
+    def get_mt_slots(self, device, codes, slots):
+        """Read the contacts of a multi-touch device from the kernel.
+
+        Returns its current slot and a dict mapping each ABS_MT_* code of
+        codes to its values in the first slots, fewer when the device has
+        less slots. None when it can not be read.
+        """
+        try:
+            fd = self._fds[device]
+            slot_info = query_abs_info(fd, ABS_MT_SLOT)
+            slots = min(slots, slot_info.maximum + 1)
+            return slot_info.value, {
+                code: query_mt_slots(fd, code, slots) for code in codes}
+        except (IOError, OSError):
+            return None
+
+    def add_watch(self, fd, callback):
+        """Also wait on another descriptor, e.g. hotplug_fileno(), and call
+        callback() from the polling thread when it is readable."""
+        self._epoll.register(fd, select.EPOLLIN)
+        self._callbacks[fd] = callback
+
+    def is_masked(self, device):
+        """Whether the kernel filters the events of a device."""
+        return (self._event_keys is not None and
+                self._fds[device] not in self._unmasked)
+
+    def is_monotonic(self, device):
+        """Whether the events of a device are stamped with
+        CLOCK_MONOTONIC."""
+        return self._fds[device] not in self._realtime
+
+    def _read(self, fd):
+        """Read the pending events of a descriptor, filtered when the
+        kernel does not do it."""
+        if fd not in self._unmasked:
+            return _read_into(fd, self._ring)
+        return (filter_events(view, self._event_keys)
+                for view in _read_into(fd, self._ring))
+
+    def _ready(self, timeout):
+        """Wait for devices with queued events and yield their (fd, device).
+
+        Devices that went away are unregistered, once the events they
+        still have queued are read.
+        """
+        for fd, mask in self._epoll.poll(-1 if timeout is None else timeout):
+            if fd in self._callbacks:
+                self._callbacks[fd]()
+                continue
+            device = self._devices.get(fd)
+            if device is None:
+                continue
+            if (mask & (select.EPOLLERR | select.EPOLLHUP) and
+                    not mask & select.EPOLLIN):
+                self.unregister(device)
+                continue
+            yield fd, device
+
+    def poll_into(self, sink, timeout=None):
+        """Wait up to timeout seconds and call sink(device, view) for each
+        chunk of events read.
+
+        The views point into the reactor's preallocated buffers, nothing is
+        copied (except when filtering the events without EVIOCSMASK). They
+        must be decoded within the call, e.g. with iter_unpack or
+        EventBatch, and not kept.
+        """
+        for fd, device in self._ready(timeout):
+            try:
+                for view in self._read(fd):
+                    if view:
+                        sink(device, view)
+            except UnpluggedError:
+                self.unregister(device)
+
+    def poll_raw(self, timeout=None):
+        """Wait up to timeout seconds and return the pending raw data.
+
+        Returns a list of (device, data) pairs, data holding whole events
+        in the order the kernel queued them.
+        """
+        ready = []
+        for fd, device in self._ready(timeout):
+            try:
+                data = b''.join(bytes(view) for view in self._read(fd))
+            except UnpluggedError:
+                self.unregister(device)
+                continue
+            if data:
+                ready.append((device, data))
+        return ready
+
+    def poll(self, timeout=None):
+        """Wait up to timeout seconds and return the pending events."""
+        # pylint: disable=protected-access
+        return [device._make_event(*event)
+                for device, data in self.poll_raw(timeout)
+                for event in iter_unpack(data)]
+
+    def poll_batches(self, timeout=None):
+        """Wait up to timeout seconds and return one EventBatch per
+        ready device."""
+        return [EventBatch(data, device)
+                for device, data in self.poll_raw(timeout)]
+
+    def close(self):
+        """Close every descriptor and the epoll instance."""
+        for device in list(self._fds):
+            self.unregister(device)
+        self._epoll.close()
+
+
+# struct js_event of the joystick API: time in milliseconds, value, type
+# and number of the axis or button.
+JS_EVENT = struct.Struct('IhBB')
+
+JS_EVENT_BUTTON = 0x01
+JS_EVENT_AXIS = 0x02
+# Set on the events describing the initial state, sent after opening.
+JS_EVENT_INIT = 0x80
+
+# The joystick API numbers the buttons from BTN_JOYSTICK up, then from
+# BTN_MISC up to it, see joydev_connect. The codes below BTN_MISC are not
+# sent.
+BTN_MISC = 0x100
+BTN_JOYSTICK = 0x120
+
+# Range of the axes of the joystick API.
+JS_AXIS_MAX = 32767
+
+_EVENT_STRUCT = struct.Struct(EVENT_FORMAT)
+
+
+def joystick_map(capabilities, abs_infos):
+    """Map the (type, number) of the js_events of a device to evdev
+    (type, code, correction) triples.
+
+    The numbers are given the way joydev does by default: axes in the
+    order of their codes, buttons from BTN_JOYSTICK up and then from
+    BTN_MISC up to BTN_JOYSTICK, the codes below BTN_MISC have no number.
+    abs_infos maps the axis codes to their AbsInfo, used to undo
+    the correction joydev applies to the axes; the axes missing from it
+    keep the joystick API range.
+    """
+    mapping = {}
+    axes = [code for code in range(ABS_CNT) if capabilities.has_axis(code)]
+    for number, code in enumerate(axes):
+        correction = None
+        abs_info = abs_infos.get(code)
+        if abs_info is not None and abs_info.maximum != abs_info.minimum:
+            # Same integer maths as joydev_init_corr.
+            center = int((abs_info.maximum + abs_info.minimum) / 2)
+            half_range = int((abs_info.maximum - abs_info.minimum) / 2) - 2 * abs_info.flat
+            if half_range > 0:
+                correction = (abs_info.minimum, center - abs_info.flat,
+                              center + abs_info.flat, abs_info.maximum,
+                              (1 << 29) // half_range)
+        mapping[JS_EVENT_AXIS, number] = (EV_ABS, code, correction)
+
+    buttons = [code for code in chain(range(BTN_JOYSTICK, KEY_CNT),
+                                       range(BTN_MISC, BTN_JOYSTICK))
+               if capabilities.has_key(code)]
+    for number, code in enumerate(buttons):
+        mapping[JS_EVENT_BUTTON, number] = (EV_KEY, code, None)
+    return mapping
+
+
+def _uncorrect_axis(value, correction):
+    """Get back the evdev value of a joystick API axis value."""
+    minimum, low, high, maximum, coefficient = correction
+    # joydev clamps the values a bit before the ends of the axis.
+    if value >= JS_AXIS_MAX:
+        return maximum
+    if value <= -JS_AXIS_MAX:
+        return minimum
+    if value > 0:
+        return high + round((value << 14) / coefficient)
+    if value < 0:
+        return low + round((value << 14) / coefficient)
+    # Within the flat zone.
+    return (low + high) // 2
+
+
+def convert_js_events(data, mapping, timestamp_ns):
+    """Convert js_event records to evdev records ending with a SYN_REPORT.
+
+    The js_event times are not on a known clock, all the records are
+    stamped with timestamp_ns.
+    """
+    tv_sec, tv_usec = divmod(timestamp_ns // 1000, 1000000)
+    pack = _EVENT_STRUCT.pack
+    records = []
+    for _, value, js_type, number in JS_EVENT.iter_unpack(data):
+        target = mapping.get((js_type & ~JS_EVENT_INIT, number))
+        if target is None:
+            continue
+        ev_type, code, correction = target
+        if correction is not None:
+            value = _uncorrect_axis(value, correction)
+        records.append(pack(tv_sec, tv_usec, ev_type, code, value))
+    records.append(pack(tv_sec, tv_usec, EV_SYN, SYN_REPORT, 0))
+    return b''.join(records)
+
+
+class JoystickReactor(DeviceReactor):
+    """DeviceReactor reading gamepads from their joystick API nodes,
+    /dev/input/jsN, Linux-only.
+
+    A js_event is 8 bytes against 24 for an evdev event. The kernel starts
+    each new reader (and a reader whose queue overflowed) with a
+    JS_EVENT_INIT event per axis and button, the whole state, so nothing
+    has to be queried after opening or after a stall.
+
+    The events are handed to the sink as evdev records, stamped with
+    time.monotonic_ns() when read, see convert_js_events. The joystick API
+    has no reports, each read ends with a SYN_REPORT. The joydev default
+    numbering of the axes and buttons is assumed, see joystick_map.
+
+    The js nodes get no ioctl: the axes are described by the AbsInfo read
+    from the evdev node on registration, the data of joydev's correction,
+    and the state is never queried.
+    """
+
+    def __init__(self, input_devices=None):
+        self._maps = {}
+        self._abs_infos = {}
+        super(JoystickReactor, self).__init__(input_devices)
+
+    def register(self, device):
+        """Start watching a gamepad."""
+        if device in self._fds:
+            return
+        path = device.get_joystick_path()
+        if path is None:
+            raise UnpluggedError("%s has no joystick node" % device.name)
+        mapping, abs_infos = self._map(device)
+        fd = _open_nonblocking(path)
+        self._epoll.register(fd, select.EPOLLIN)
+        self._maps[fd] = mapping
+        self._abs_infos[fd] = abs_infos
+        self._devices[fd] = device
+        self._fds[device] = fd
+
+    def unregister(self, device):
+        """Stop watching a gamepad and close its descriptor."""
+        fd = self._fds.get(device)
+        self._maps.pop(fd, None)
+        self._abs_infos.pop(fd, None)
+        super(JoystickReactor, self).unregister(device)
+
+    def get_abs_info(self, device, code):
+        """Get the AbsInfo of an axis read on registration, None when it
+        could not be read."""
+        return self._abs_infos[self._fds[device]].get(code)
+
+    def get_state(self, device, keys):
+        """The state is not queried, joydev sends it again with
+        JS_EVENT_INIT events after an overflow. Always None."""
+        return None
+
+    def get_mt_slots(self, device, codes, slots):
+        """jsN nodes have no multi-touch axes. Always None."""
+        return None
+
+    @staticmethod
+    def _map(device):
+        """Get the joystick_map of a gamepad and the AbsInfo of its axes
+        from its evdev node."""
+        capabilities = device.manager.get_capabilities(
+            device.get_char_device_path())
+        if capabilities is None:
+            raise UnpluggedError(
+                "Can not read the capabilities of %s" % device.name)
+        abs_infos = {}
+        fd = device.open_nonblocking()
+        try:
+            for code in range(ABS_CNT):
+                if capabilities.has_axis(code):
+                    abs_infos[code] = query_abs_info(fd, code)
+        except (IOError, OSError):
+            # Left in the joystick API range.
+            pass
+        finally:
+            os.close(fd)
+        return joystick_map(capabilities, abs_infos), abs_infos
+
+    def _read(self, fd):
+        mapping = self._maps[fd]
+        for view in _read_into(fd, self._ring):
+            yield convert_js_events(view, mapping, time.monotonic_ns())
 
 
 SPIN_UP_MOTOR = (
@@ -3677,3 +3442,55 @@ def get_gamepad():
     except IndexError:
         raise UnpluggedError("No gamepad found.")
     return gamepad.read()
+
+
+# The platform backends and the code tables are separate modules, only
+# the one of the running platform is imported, the others are loaded on
+# first access through __getattr__ below. On Linux, only the evdev path is
+# imported.
+# pylint: disable=wrong-import-position
+if WIN:
+    from ._inputs_win import (
+        XINPUT_DLL_NAMES, XINPUT_ERROR_DEVICE_NOT_CONNECTED,
+        XINPUT_ERROR_SUCCESS, XinputGamepad, XinputState, XinputVibration,
+        RawInputDeviceList, delay_and_stop, keyboard_process, mouse_process)
+elif MAC:
+    from ._inputs_mac import (
+        mac_keyboard_process, appkit_mouse_process, quartz_mouse_process)
+
+_LAZY_NAMES = {
+    '_inputs_codes': (
+        'SPECIAL_DEVICES', 'XINPUT_MAPPING', 'XBOX_STYLE_LED_CONTROL',
+        'DEVICE_PROPERTIES', 'EVENT_TYPES', 'SYNCHRONIZATION_EVENTS',
+        'KEYS_AND_BUTTONS', 'RELATIVE_AXES', 'ABSOLUTE_AXES', 'SWITCH_EVENTS',
+        'MISC_EVENTS', 'LEDS', 'LED_TYPE_CODES', 'AUTOREPEAT_VALUES',
+        'SOUNDS', 'WIN_KEYBOARD_CODES', 'WIN_MOUSE_CODES', 'WINCODES',
+        'MAC_EVENT_CODES', 'MAC_KEYS', 'FORCE_FEEDBACK',
+        'FORCE_FEEDBACK_STATUS', 'POWER', 'MAX', 'CURRENT', 'EVENT_MAP'),
+    '_inputs_win': (
+        'DWORD', 'HANDLE', 'WPARAM', 'LPARAM', 'MSG', 'XINPUT_DLL_NAMES',
+        'XINPUT_ERROR_DEVICE_NOT_CONNECTED', 'XINPUT_ERROR_SUCCESS',
+        'KBDLLHookStruct', 'MSLLHookStruct', 'XinputGamepad', 'XinputState',
+        'XinputVibration', 'WindowsKeyboardListener', 'keyboard_process',
+        'WindowsMouseListener', 'mouse_process', 'delay_and_stop',
+        'RawInputDeviceList'),
+    '_inputs_mac': (
+        'QuartzMouseBaseListener', 'quartz_mouse_process',
+        'AppKitMouseBaseListener', 'appkit_mouse_process',
+        'AppKitKeyboardListener', 'mac_keyboard_process'),
+    '_inputs_hidraw': (
+        'SONY_VENDOR_ID', 'PadReport', 'HidLayout', 'DUALSHOCK4', 'DUALSENSE',
+        'HID_LAYOUTS', 'report_values', 'find_hidraw', 'HidrawReactor'),
+}
+
+
+def __getattr__(name):
+    """Import the names of the backends and code tables when accessed."""
+    for module_name, names in _LAZY_NAMES.items():
+        if name in names:
+            # pylint: disable=import-outside-toplevel
+            import importlib
+            module = importlib.import_module('.' + module_name, __package__)
+            return getattr(module, name)
+    raise AttributeError(
+        "module %r has no attribute %r" % (__name__, name))
@@ -1,22 +1,28 @@
 """Utils functions for Inputs.
 """
 
+import os
+
+import bpy
+
 from ..thirdparties.inputs import devices
 
+# Remember the discovered devices between Blender sessions.
+devices.discovery_cache_path = os.path.join(
+    bpy.utils.user_resource('CONFIG'), 'gamepad_controls', 'devices.json')
+# Keyboards and mice are left to Blender.
+devices.gamepads_only = True
+
 def reset_device_manager():
     """Reset to get the actual list of plugged-in devices."""
 
-    devices.gamepads = []
-    devices.keyboards = []
-    devices.mice = []
-    devices.microbits = []
-
-    devices._post_init()
+    devices.rescan()
 
 def is_gamepad_plugged():
     """Check if the gamepad is plugged"""
 
     # Make sure a new plugged-in gamepad is detected.
-    reset_device_manager()
+    # Only the changes since the last check are applied.
+    devices.refresh()
 
     return len(devices.gamepads) > 0
\ No newline at end of file